@@ -10,6 +10,17 @@ until PGPASSWORD=password psql -h db -U user -d star_competency -c '\q'; do
 done
 echo "✅ PostgreSQL started"
 
+# Background AI job worker; the app container applies the migrations
+if [ "$1" = "worker" ]; then
+  echo "Starting job worker..."
+  exec python -m star_competency_app.worker
+fi
+
+# Create tables, then apply schema migrations (indexes etc.) on top of them
+python -c "from star_competency_app.database.db_manager import get_db_manager; get_db_manager().create_tables()"
+alembic upgrade head
+echo "✅ Database migrations applied"
+
 # Ensure upload directory exists
 mkdir -p /app/data/uploads
 chmod -R 777 /app/data/uploads
@@ -20,5 +31,6 @@ if [ "$DEBUG" = "True" ]; then
   exec flask --app star_competency_app.interfaces.web.app run --host=0.0.0.0 --port=5000 --debug
 else
   echo "Starting in production mode..."
-  exec gunicorn -b 0.0.0.0:5000 star_competency_app.interfaces.web.app:app --workers 4 --timeout 120
+  # Threaded workers: a streaming AI response holds a thread, not a whole worker
+  exec gunicorn -b 0.0.0.0:5000 star_competency_app.interfaces.web.app:app --workers 4 --worker-class gthread --threads 8 --timeout 120
 fi
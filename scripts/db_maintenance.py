@@ -0,0 +1,253 @@
+# scripts/db_maintenance.py
+
+#!/usr/bin/env python3
+"""
+Routine database maintenance tasks.
+
+    python scripts/db_maintenance.py ensure-partitions
+    python scripts/db_maintenance.py list-partitions
+    python scripts/db_maintenance.py archive-audit-logs --retention-months 12
+    python scripts/db_maintenance.py import-entities --user-id 7 stories.csv
+    python scripts/db_maintenance.py export-entities --user-id 7 -o stories.jsonl
+    python scripts/db_maintenance.py repair-user-stats [--user-id 7 ...]
+    python scripts/db_maintenance.py refresh-coverage [--full]
+    python scripts/db_maintenance.py purge-jobs [--retention-days 7]
+    python scripts/db_maintenance.py purge-ai-cache [--max-rows 10000]
+
+Intended to run from cron (e.g. daily) alongside scripts/backup.py;
+refresh-coverage is cheap and can run more often, e.g. every 15 minutes.
+"""
+import argparse
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from star_competency_app.database.audit_partitions import (  # noqa: E402
+    is_partitioned,
+    list_partitions,
+)
+from star_competency_app.database.bulk_io import (  # noqa: E402
+    BULK_ENTITIES,
+    FORMATS,
+    detect_format,
+)
+from star_competency_app.database.db_manager import get_db_manager  # noqa: E402
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("db_maintenance")
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Database maintenance tasks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser(
+        "ensure-partitions", help="Create upcoming monthly audit_logs partitions"
+    )
+    subparsers.add_parser("list-partitions", help="List audit_logs partitions")
+
+    archive = subparsers.add_parser(
+        "archive-audit-logs",
+        help="Export and drop audit_logs partitions past the retention window",
+    )
+    archive.add_argument(
+        "--retention-months",
+        type=int,
+        default=None,
+        help="Whole months to keep (default: AUDIT_RETENTION_MONTHS)",
+    )
+    archive.add_argument(
+        "--archive-dir",
+        default=None,
+        help="Directory for .jsonl.gz exports (default: AUDIT_ARCHIVE_DIR)",
+    )
+    archive.add_argument(
+        "--dry-run", action="store_true", help="Only show what would be archived"
+    )
+
+    import_parser = subparsers.add_parser(
+        "import-entities", help="Bulk import STAR stories or case studies"
+    )
+    import_parser.add_argument("file", help="CSV or JSONL file to import")
+    _add_entity_arguments(import_parser)
+
+    export_parser = subparsers.add_parser(
+        "export-entities", help="Export a user's STAR stories or case studies"
+    )
+    export_parser.add_argument(
+        "-o", "--output", default=None, help="Output file (default: stdout)"
+    )
+    _add_entity_arguments(export_parser)
+
+    repair = subparsers.add_parser(
+        "repair-user-stats", help="Recompute the per-user counters in user_stats"
+    )
+    repair.add_argument(
+        "--user-id",
+        type=int,
+        action="append",
+        dest="user_ids",
+        help="Only repair this user (repeatable; default: all users)",
+    )
+
+    refresh = subparsers.add_parser(
+        "refresh-coverage",
+        help="Update the organisation-wide competency coverage summary",
+    )
+    refresh.add_argument(
+        "--full",
+        action="store_true",
+        help="Recompute every user, not only those changed since the last refresh",
+    )
+
+    purge = subparsers.add_parser(
+        "purge-jobs", help="Delete finished background jobs past their retention"
+    )
+    purge.add_argument(
+        "--retention-days",
+        type=int,
+        default=None,
+        help="Days to keep finished jobs (default: JOB_RETENTION_DAYS)",
+    )
+
+    purge_cache = subparsers.add_parser(
+        "purge-ai-cache",
+        help="Delete expired and least recently used cached AI responses",
+    )
+    purge_cache.add_argument(
+        "--max-rows",
+        type=int,
+        default=None,
+        help="Entries to keep (default: AI_CACHE_MAX_ROWS)",
+    )
+    return parser.parse_args()
+
+
+def _add_entity_arguments(subparser):
+    subparser.add_argument("--user-id", type=int, required=True, help="Owner user ID")
+    subparser.add_argument(
+        "--kind", choices=sorted(BULK_ENTITIES), default="star_story"
+    )
+    subparser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default=None,
+        help="File format (default: from the file extension, else csv)",
+    )
+
+
+def cmd_ensure_partitions(db_manager, args):
+    names = db_manager.ensure_audit_partitions()
+    if not names:
+        logger.info("audit_logs is not partitioned; nothing to do")
+
+
+def cmd_list_partitions(db_manager, args):
+    with db_manager.engine.connect() as conn:
+        if not is_partitioned(conn):
+            logger.info("audit_logs is not partitioned")
+            return
+        for name, month, attached in list_partitions(conn):
+            print(
+                f"{name:<28}{month.isoformat():<14}{'attached' if attached else 'DETACHED'}"
+            )
+
+
+def cmd_archive_audit_logs(db_manager, args):
+    archived = db_manager.archive_audit_logs(
+        retention_months=args.retention_months,
+        archive_dir=args.archive_dir,
+        dry_run=args.dry_run,
+    )
+    if not archived:
+        logger.info("No audit log partitions past the retention window")
+    for entry in archived:
+        if entry.get("dry_run"):
+            logger.info(f"Would archive {entry['partition']}")
+        else:
+            logger.info(
+                f"Archived {entry['partition']}: {entry['rows']} rows -> {entry['path']}"
+            )
+
+
+def cmd_import_entities(db_manager, args):
+    fmt = args.format or detect_format(args.file)
+    with open(args.file, encoding="utf-8-sig", newline="") as stream:
+        result = db_manager.import_entities(args.user_id, args.kind, stream, fmt)
+    logger.info(f"Imported {result.inserted} rows, skipped {result.failed}")
+    for error in result.errors:
+        logger.warning(f"Line {error['line']}: {error['errors']}")
+
+
+def cmd_export_entities(db_manager, args):
+    fmt = args.format or detect_format(args.output)
+    output = (
+        open(args.output, "w", encoding="utf-8", newline="")
+        if args.output
+        else sys.stdout
+    )
+    try:
+        for chunk in db_manager.export_entities(args.user_id, args.kind, fmt):
+            output.write(chunk)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def cmd_repair_user_stats(db_manager, args):
+    count = db_manager.repair_user_stats(user_ids=args.user_ids)
+    logger.info(f"Recomputed counters for {count} users")
+
+
+def cmd_refresh_coverage(db_manager, args):
+    result = db_manager.refresh_coverage_summary(full=args.full)
+    scope = "all users" if result["full"] else f"{result['users']} changed users"
+    logger.info(f"Refreshed coverage for {scope} in {result['duration_ms']} ms")
+
+
+def cmd_purge_jobs(db_manager, args):
+    count = db_manager.purge_jobs(retention_days=args.retention_days)
+    logger.info(f"Deleted {count} finished jobs")
+
+
+def cmd_purge_ai_cache(db_manager, args):
+    result = db_manager.purge_ai_responses(max_rows=args.max_rows)
+    logger.info(
+        f"Deleted {result['expired']} expired and {result['evicted']} "
+        "least recently used AI responses"
+    )
+    stats = db_manager.get_ai_response_store_stats()
+    logger.info(
+        f"{stats['entries']} cached AI responses; {stats['hits']} hits have "
+        f"saved {stats['tokens_saved']} tokens"
+    )
+
+
+COMMANDS = {
+    "ensure-partitions": cmd_ensure_partitions,
+    "list-partitions": cmd_list_partitions,
+    "archive-audit-logs": cmd_archive_audit_logs,
+    "import-entities": cmd_import_entities,
+    "export-entities": cmd_export_entities,
+    "repair-user-stats": cmd_repair_user_stats,
+    "refresh-coverage": cmd_refresh_coverage,
+    "purge-jobs": cmd_purge_jobs,
+    "purge-ai-cache": cmd_purge_ai_cache,
+}
+
+
+def main():
+    args = parse_args()
+    db_manager = get_db_manager()
+    COMMANDS[args.command](db_manager, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# scripts/rescore_stories.py
+
+#!/usr/bin/env python3
+"""
+Re-score every STAR story through a provider batch API.
+
+    python scripts/rescore_stories.py [--run NAME] [--provider anthropic]
+    python scripts/rescore_stories.py --run NAME --no-wait
+    python scripts/rescore_stories.py --run NAME --status
+
+Without --run the run is named after today's UTC date, so a nightly cron
+job starts a fresh run each night and a restart the same night resumes
+it. With --no-wait each invocation applies finished batches, submits more
+and exits, so a frequent cron job can advance a run instead of one
+process polling for up to 24 hours. See star_competency_app/ai/batch_rescore.py.
+"""
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from star_competency_app.ai.batch_rescore import (  # noqa: E402
+    PROVIDERS,
+    BatchRescorer,
+)
+from star_competency_app.config.settings import get_settings  # noqa: E402
+from star_competency_app.database.db_manager import get_db_manager  # noqa: E402
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("rescore_stories")
+
+
+def parse_args():
+    """Parse command line arguments."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        description="Re-score all STAR stories with a provider batch API"
+    )
+    parser.add_argument(
+        "--run",
+        default=f"rescore-{datetime.utcnow():%Y-%m-%d}",
+        help="Run name to start or resume (default: rescore-<UTC date>)",
+    )
+    parser.add_argument(
+        "--provider",
+        choices=PROVIDERS,
+        default=settings.RESCORE_PROVIDER,
+        help="Batch API to use (default: RESCORE_PROVIDER)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=settings.RESCORE_CHUNK_SIZE,
+        help="Stories per batch (default: RESCORE_CHUNK_SIZE)",
+    )
+    parser.add_argument(
+        "--max-open-batches",
+        type=int,
+        default=settings.RESCORE_MAX_OPEN_BATCHES,
+        help="Batches awaiting results at a time (default: RESCORE_MAX_OPEN_BATCHES)",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=settings.RESCORE_POLL_INTERVAL,
+        help="Seconds between status checks (default: RESCORE_POLL_INTERVAL)",
+    )
+    parser.add_argument(
+        "--no-wait",
+        action="store_true",
+        help="Make one pass and exit instead of polling until the run completes",
+    )
+    parser.add_argument(
+        "--status", action="store_true", help="Show the run's batches and exit"
+    )
+    return parser.parse_args()
+
+
+def show_status(db_manager, run):
+    batches = db_manager.get_rescore_batches(run)
+    if not batches:
+        logger.info(f"No batches recorded for run {run}")
+        return
+    for batch in batches:
+        print(
+            f"{batch.first_story_id:>8}-{batch.last_story_id:<8}"
+            f"{batch.provider:<11}{batch.status:<11}{batch.batch_id or '':<40}"
+            f"{batch.succeeded:>6} ok {batch.failed:>5} failed "
+            f"{batch.skipped:>5} skipped"
+        )
+
+
+def main():
+    args = parse_args()
+    db_manager = get_db_manager()
+    if args.status:
+        show_status(db_manager, args.run)
+        return
+
+    summary = BatchRescorer(
+        db_manager,
+        args.run,
+        provider=args.provider,
+        chunk_size=args.chunk_size,
+        max_open_batches=args.max_open_batches,
+        poll_interval=args.poll_interval,
+    ).run(wait=not args.no_wait)
+    logger.info(
+        f"Run {summary['run']}: {summary['succeeded']} of {summary['stories']} "
+        f"stories scored ({summary['failed']} failed, {summary['skipped']} skipped) "
+        f"in {summary['batches']} batches, {summary['open']} still open"
+        + ("; complete" if summary["complete"] else "")
+    )
+    if summary["failed_batches"]:
+        logger.warning(f"{summary['failed_batches']} batches failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+#!/bin/bash
+# scripts/start.sh
+# Run the app locally: create and migrate the database, start the
+# background job worker, then the Flask development server. AI requests
+# only queue jobs, so without the worker they would stay pending.
+set -e
+cd "$(dirname "$0")/.."
+
+python -c "from star_competency_app.database.db_manager import get_db_manager; get_db_manager().create_tables()"
+alembic upgrade head
+
+python -m star_competency_app.worker &
+WORKER_PID=$!
+# Let the worker finish its current jobs when the server stops
+trap 'kill -TERM $WORKER_PID 2>/dev/null; wait $WORKER_PID' EXIT
+
+flask --app star_competency_app.interfaces.web.app run --debug
@@ -0,0 +1,235 @@
+# star_competency_app/ai/batch_rescore.py
+"""
+Bulk re-scoring of every STAR story through provider batch APIs.
+
+After a prompt or model change the whole corpus needs new evaluations.
+Going through the interactive path would pay full price and compete with
+users for rate limits; the OpenAI Batch API and Anthropic Message Batches
+cost half and have limits of their own, in exchange for results within
+24 hours.
+
+A run walks the stories in ID order, submitting each chunk as one batch
+while keeping at most max_open_batches awaiting results, polls them, and
+writes each finished batch's evaluations in one transaction. Every chunk
+is checkpointed in rescore_batches (database/rescore_checkpoint.py), so
+starting a run again by name resumes it; run one runner per run at a time.
+
+The SDKs read OPENAI_BASE_URL and ANTHROPIC_BASE_URL, so a run can be
+pointed at a local fake batch server.
+"""
+import logging
+import time
+
+from star_competency_app.ai.claude_client import ClaudeClient
+from star_competency_app.ai.openai_client import OpenAIClient
+from star_competency_app.ai.scoring import overall_score
+from star_competency_app.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("openai", "anthropic")
+
+
+def _make_client(provider: str):
+    if provider == "anthropic":
+        return ClaudeClient()
+    return OpenAIClient(api_key=get_settings().OPENAI_API_KEY)
+
+
+def _custom_id(story_id: int) -> str:
+    return f"story-{story_id}"
+
+
+def _story_id(custom_id: str):
+    prefix, _, story_id = custom_id.partition("-")
+    return int(story_id) if prefix == "story" and story_id.isdigit() else None
+
+
+class BatchRescorer:
+    """Runs, or resumes, one named bulk re-scoring run."""
+
+    def __init__(
+        self,
+        db_manager,
+        run: str,
+        provider: str = "openai",
+        client=None,
+        chunk_size: int = 1000,
+        max_open_batches: int = 5,
+        poll_interval: float = 60.0,
+    ):
+        """
+        Args:
+            db_manager: DatabaseManager holding the stories and checkpoint
+            run: Run name; the checkpoint is kept under it
+            provider: "openai" or "anthropic"
+            client: OpenAIClient or ClaudeClient (default: built from settings)
+            chunk_size: Stories per batch
+            max_open_batches: Submitted batches awaiting results at a time
+            poll_interval: Seconds between status checks
+        """
+        if provider not in PROVIDERS:
+            raise ValueError(f"Unknown provider: {provider}")
+        self.db_manager = db_manager
+        self.run_name = run
+        self.provider = provider
+        self.client = client or _make_client(provider)
+        self.chunk_size = chunk_size
+        self.max_open_batches = max_open_batches
+        self.poll_interval = poll_interval
+        self._exhausted = False
+
+    def run(self, wait: bool = True):
+        """
+        Submit, poll and apply until every story has been scored.
+
+        Args:
+            wait: Poll until all batches finish; False makes a single pass
+                (apply what has finished, submit what fits), for runs
+                advanced by a frequent cron job
+
+        Returns:
+            The run's summary()
+        """
+        for batch in self.db_manager.get_rescore_batches(self.run_name):
+            if batch.status == "pending":
+                # Recorded, but the runner stopped before the provider took it
+                stories = self.db_manager.get_star_stories_for_rescore(
+                    batch.first_story_id - 1,
+                    batch.request_count,
+                    up_to=batch.last_story_id,
+                )
+                self._submit(batch.id, stories)
+
+        while True:
+            batches = self.db_manager.get_rescore_batches(self.run_name)
+            open_batches = self._collect(batches)
+            self._submit_more(batches, open_batches)
+            summary = self.summary()
+            if not wait or summary["complete"]:
+                return summary
+            logger.info(
+                f"Re-scoring run {self.run_name}: {summary['open']} batches open, "
+                f"{summary['succeeded']} stories scored"
+            )
+            time.sleep(self.poll_interval)
+
+    def summary(self):
+        """Totals of the run's checkpoint."""
+        batches = self.db_manager.get_rescore_batches(self.run_name)
+        statuses = [batch.status for batch in batches]
+        open_batches = statuses.count("pending") + statuses.count("submitted")
+        return {
+            "run": self.run_name,
+            "provider": self.provider,
+            "batches": len(batches),
+            "open": open_batches,
+            "applied": statuses.count("applied"),
+            "failed_batches": statuses.count("failed"),
+            "stories": sum(batch.request_count for batch in batches),
+            "succeeded": sum(batch.succeeded for batch in batches),
+            "failed": sum(batch.failed for batch in batches),
+            "skipped": sum(batch.skipped for batch in batches),
+            "complete": self._exhausted and not open_batches,
+        }
+
+    def _submit_more(self, batches, open_batches):
+        after_id = max((batch.last_story_id for batch in batches), default=0)
+        while not self._exhausted and open_batches < self.max_open_batches:
+            stories = self.db_manager.get_star_stories_for_rescore(
+                after_id, self.chunk_size
+            )
+            if not stories:
+                self._exhausted = True
+                break
+            first_id, last_id = stories[0][0].id, stories[-1][0].id
+            rescore_batch_id = self.db_manager.record_rescore_batch(
+                self.run_name, self.provider, first_id, last_id, len(stories)
+            )
+            if rescore_batch_id is None:
+                logger.warning(
+                    f"Stories {first_id}-{last_id} of run {self.run_name} were "
+                    "recorded by another runner; not submitting more"
+                )
+                self._exhausted = True
+                break
+            self._submit(rescore_batch_id, stories)
+            open_batches += 1
+            after_id = last_id
+
+    def _submit(self, rescore_batch_id, stories):
+        if not stories:
+            self.db_manager.mark_rescore_batch_failed(
+                rescore_batch_id, "All stories in the range were deleted"
+            )
+            return
+        items = [
+            (
+                _custom_id(story.id),
+                {
+                    "title": story.title,
+                    "situation": story.situation,
+                    "task": story.task,
+                    "action": story.action,
+                    "result": story.result,
+                },
+                # ClaudeClient takes competencies as dicts
+                competency._asdict() if self.provider == "anthropic" else competency,
+            )
+            for story, competency in stories
+        ]
+        # A failure here leaves the batch pending, to be resubmitted on resume
+        batch_id = self.client.submit_evaluation_batch(items)
+        self.db_manager.mark_rescore_batch_submitted(rescore_batch_id, batch_id)
+        logger.info(
+            f"Submitted stories {stories[0][0].id}-{stories[-1][0].id} "
+            f"({len(items)}) as {self.provider} batch {batch_id}"
+        )
+
+    def _collect(self, batches) -> int:
+        """Apply every finished batch; returns the number still open."""
+        open_batches = 0
+        for batch in batches:
+            if batch.status == "pending":
+                open_batches += 1
+            if batch.status != "submitted":
+                continue
+            try:
+                status = self.client.get_batch_status(batch.batch_id)
+                if status == "running":
+                    open_batches += 1
+                elif status == "failed":
+                    self.db_manager.mark_rescore_batch_failed(
+                        batch.id, f"{self.provider} batch {batch.batch_id} failed"
+                    )
+                else:
+                    self._apply(batch)
+            except Exception as e:
+                # e.g. a network error; the next poll tries again
+                logger.warning(f"Could not collect batch {batch.batch_id}: {e}")
+                open_batches += 1
+        return open_batches
+
+    def _apply(self, batch):
+        updates = []
+        for custom_id, result in self.client.get_evaluation_batch_results(
+            batch.batch_id
+        ):
+            story_id = _story_id(custom_id)
+            if story_id is None or "error" in result:
+                continue
+            updates.append(
+                {
+                    "story_id": story_id,
+                    "ai_feedback": result.get("evaluation", ""),
+                    "ai_score": overall_score(result.get("scores")),
+                }
+            )
+        applied = self.db_manager.apply_rescore_batch(
+            batch.id, updates, failed=batch.request_count - len(updates)
+        )
+        if applied is not None:
+            logger.info(
+                f"Applied batch {batch.batch_id}: {applied.succeeded} scored, "
+                f"{applied.failed} failed, {applied.skipped} skipped"
+            )
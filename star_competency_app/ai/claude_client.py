@@ -1,24 +1,32 @@
 # star_competency_app/ai/claude_client.py
 import logging
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import anthropic
 from anthropic.types import Message
 
+from star_competency_app.ai.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    cache_key,
+    get_response_cache,
+)
 from star_competency_app.config.settings import get_settings
-from star_competency_app.utils.text_utils import extract_text_from_image
+from star_competency_app.utils.image_utils import extract_text_from_image
 
 logger = logging.getLogger(__name__)
 
 
 class ClaudeClient:
-    def __init__(self):
+    def __init__(self, cache: Optional[ResponseCache] = None):
         settings = get_settings()
         self.api_key = settings.CLAUDE_API_KEY
         self.model = settings.CLAUDE_MODEL
         self.client = anthropic.Anthropic(api_key=self.api_key)
         self.max_tokens = settings.CLAUDE_MAX_TOKENS
+        # Completions are reused for identical requests (AI_CACHE_* settings)
+        self.cache = cache or get_response_cache()
 
     def analyze_case_study(
         self,
@@ -72,16 +80,12 @@ class ClaudeClient:
             """
 
             # Call Claude API
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                messages=[{"role": "user", "content": prompt}],
-            )
+            text = self._complete("analyze_case_study", prompt)
 
             return {
-                "analysis": response.content[0].text,
+                "analysis": text,
                 "competency_alignment": self._extract_competency_alignment(
-                    response.content[0].text, competencies
+                    text, competencies
                 ),
             }
 
@@ -103,54 +107,122 @@ class ClaudeClient:
             Dict containing the evaluation results
         """
         try:
-            # Prepare competency context
-            competency_context = ""
-            if competency:
-                competency_context = f"""
-                This STAR story is meant to demonstrate the competency:
-                "{competency['name']}: {competency['description']}"
-                """
-
-            # Prepare the prompt
-            prompt = f"""
-            Please evaluate this STAR (Situation, Task, Action, Result) story and provide feedback on:
-            
-            1. Completeness and clarity of each STAR component
-            2. Effectiveness in demonstrating the relevant skills and behaviors
-            3. Impact and measurability of the results
-            4. Overall storytelling and persuasiveness
-            5. Areas for improvement
-            
-            {competency_context}
-            
-            STAR Story:
-            Title: {story.get('title', 'No title provided')}
-            
-            Situation: {story.get('situation', 'Not provided')}
-            
-            Task: {story.get('task', 'Not provided')}
-            
-            Action: {story.get('action', 'Not provided')}
-            
-            Result: {story.get('result', 'Not provided')}
-            """
-
             # Call Claude API
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                messages=[{"role": "user", "content": prompt}],
+            text = self._complete(
+                "evaluate_star_story",
+                self._evaluation_prompt(story, competency),
+                competency,
             )
 
-            return {
-                "evaluation": response.content[0].text,
-                "scores": self._extract_evaluation_scores(response.content[0].text),
-            }
+            return self.parse_evaluation(text)
 
         except Exception as e:
             logger.error(f"Error evaluating STAR story: {e}")
             return {"error": str(e)}
 
+    def stream_evaluate_star_story(
+        self, story: Dict[str, str], competency: Optional[Dict] = None
+    ) -> Iterator[str]:
+        """
+        Streaming variant of evaluate_star_story.
+
+        Yields the text as Claude produces it; pass the joined text to
+        parse_evaluation() once the stream ends. Errors are raised.
+        """
+        return self._stream(
+            "evaluate_star_story",
+            self._evaluation_prompt(story, competency),
+            competency,
+        )
+
+    def parse_evaluation(self, text: str) -> Dict[str, Any]:
+        """Build the evaluate_star_story() result from the evaluation text."""
+        return {"evaluation": text, "scores": self._extract_evaluation_scores(text)}
+
+    def submit_evaluation_batch(
+        self, items: Iterable[Tuple[str, Dict[str, str], Optional[Dict]]]
+    ) -> str:
+        """
+        Submit evaluations as a Message Batch (half price, within 24 hours).
+
+        Args:
+            items: (custom_id, story, competency) for each story
+
+        Returns:
+            The batch ID
+        """
+        batch = self.client.messages.batches.create(
+            requests=[
+                {
+                    "custom_id": custom_id,
+                    "params": self._request(self._evaluation_prompt(story, competency)),
+                }
+                for custom_id, story, competency in items
+            ]
+        )
+        return batch.id
+
+    def get_batch_status(self, batch_id: str) -> str:
+        """Return "running" or "ended" (results ready)."""
+        batch = self.client.messages.batches.retrieve(batch_id)
+        return "ended" if batch.processing_status == "ended" else "running"
+
+    def get_evaluation_batch_results(
+        self, batch_id: str
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield (custom_id, evaluation) for each request of an ended batch.
+
+        Evaluations are parse_evaluation() results, or {"error": ...} for
+        requests that errored, expired or were cancelled.
+        """
+        for entry in self.client.messages.batches.results(batch_id):
+            result = entry.result
+            if result.type != "succeeded":
+                error = getattr(result, "error", None)
+                yield entry.custom_id, {"error": str(error or result.type)}
+                continue
+            text = "".join(
+                block.text for block in result.message.content if block.type == "text"
+            )
+            yield entry.custom_id, self.parse_evaluation(text)
+
+    def _evaluation_prompt(
+        self, story: Dict[str, str], competency: Optional[Dict]
+    ) -> str:
+        # Prepare competency context
+        competency_context = ""
+        if competency:
+            competency_context = f"""
+            This STAR story is meant to demonstrate the competency:
+            "{competency['name']}: {competency['description']}"
+            """
+
+        # Prepare the prompt
+        prompt = f"""
+        Please evaluate this STAR (Situation, Task, Action, Result) story and provide feedback on:
+        
+        1. Completeness and clarity of each STAR component
+        2. Effectiveness in demonstrating the relevant skills and behaviors
+        3. Impact and measurability of the results
+        4. Overall storytelling and persuasiveness
+        5. Areas for improvement
+        
+        {competency_context}
+        
+        STAR Story:
+        Title: {story.get('title', 'No title provided')}
+        
+        Situation: {story.get('situation', 'Not provided')}
+        
+        Task: {story.get('task', 'Not provided')}
+        
+        Action: {story.get('action', 'Not provided')}
+        
+        Result: {story.get('result', 'Not provided')}
+        """
+        return prompt
+
     def suggest_star_improvements(
         self, story: Dict[str, str], competency: Optional[Dict] = None
     ) -> Dict[str, Any]:
@@ -165,58 +237,79 @@ class ClaudeClient:
             Dict containing suggested improvements
         """
         try:
-            # Prepare competency context
-            competency_context = ""
-            if competency:
-                competency_context = f"""
-                This STAR story is meant to demonstrate the competency:
-                "{competency['name']}: {competency['description']}"
-                Please ensure your suggestions help align the story better with this competency.
-                """
-
-            # Prepare the prompt
-            prompt = f"""
-            Please suggest specific improvements for each component of this STAR (Situation, Task, Action, Result) story.
-            Focus on making the story more compelling, specific, and effective for demonstrating skills in a professional context.
-            
-            {competency_context}
-            
-            STAR Story:
-            Title: {story.get('title', 'No title provided')}
-            
-            Situation: {story.get('situation', 'Not provided')}
-            
-            Task: {story.get('task', 'Not provided')}
-            
-            Action: {story.get('action', 'Not provided')}
-            
-            Result: {story.get('result', 'Not provided')}
-            
-            For each component (Situation, Task, Action, Result), please provide:
-            1. Specific suggestions for improvement
-            2. Example text showing how it could be rewritten
-            
-            Structure your response with clear headers for each STAR component and separate the suggestions from the examples.
-            """
-
             # Call Claude API
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                messages=[{"role": "user", "content": prompt}],
+            text = self._complete(
+                "suggest_star_improvements",
+                self._improvement_prompt(story, competency),
+                competency,
             )
 
-            return {
-                "suggestions": response.content[0].text,
-                "improved_components": self._extract_improved_components(
-                    response.content[0].text, story
-                ),
-            }
+            return self.parse_improvements(text, story)
 
         except Exception as e:
             logger.error(f"Error suggesting STAR improvements: {e}")
             return {"error": str(e)}
 
+    def stream_star_improvements(
+        self, story: Dict[str, str], competency: Optional[Dict] = None
+    ) -> Iterator[str]:
+        """
+        Streaming variant of suggest_star_improvements.
+
+        Yields the text as Claude produces it; pass the joined text to
+        parse_improvements() once the stream ends. Errors are raised.
+        """
+        return self._stream(
+            "suggest_star_improvements",
+            self._improvement_prompt(story, competency),
+            competency,
+        )
+
+    def parse_improvements(self, text: str, story: Dict[str, str]) -> Dict[str, Any]:
+        """Build the suggest_star_improvements() result from the suggestions text."""
+        return {
+            "suggestions": text,
+            "improved_components": self._extract_improved_components(text, story),
+        }
+
+    def _improvement_prompt(
+        self, story: Dict[str, str], competency: Optional[Dict]
+    ) -> str:
+        # Prepare competency context
+        competency_context = ""
+        if competency:
+            competency_context = f"""
+            This STAR story is meant to demonstrate the competency:
+            "{competency['name']}: {competency['description']}"
+            Please ensure your suggestions help align the story better with this competency.
+            """
+
+        # Prepare the prompt
+        prompt = f"""
+        Please suggest specific improvements for each component of this STAR (Situation, Task, Action, Result) story.
+        Focus on making the story more compelling, specific, and effective for demonstrating skills in a professional context.
+        
+        {competency_context}
+        
+        STAR Story:
+        Title: {story.get('title', 'No title provided')}
+        
+        Situation: {story.get('situation', 'Not provided')}
+        
+        Task: {story.get('task', 'Not provided')}
+        
+        Action: {story.get('action', 'Not provided')}
+        
+        Result: {story.get('result', 'Not provided')}
+        
+        For each component (Situation, Task, Action, Result), please provide:
+        1. Specific suggestions for improvement
+        2. Example text showing how it could be rewritten
+        
+        Structure your response with clear headers for each STAR component and separate the suggestions from the examples.
+        """
+        return prompt
+
     def _extract_competency_alignment(
         self, analysis_text: str, competencies: Optional[List[Dict]]
     ) -> Dict:
@@ -330,50 +423,136 @@ class ClaudeClient:
             Dict containing the generated STAR story
         """
         try:
-            # Prepare context
-            context_prompt = ""
-            if context:
-                context_prompt = f"""
-                Use this context/experience when creating the story:
-                {context}
-                """
-
-            # Prepare the prompt
-            prompt = f"""
-            Please generate a high-quality STAR (Situation, Task, Action, Result) story that demonstrates the following competency:
-            
-            Competency: {competency['name']}
-            Description: {competency['description']}
-            
-            {context_prompt}
-            
-            The story should:
-            1. Be specific and detailed
-            2. Clearly demonstrate the competency
-            3. Show measurable results
-            4. Be structured in the STAR format
-            5. Be written in first person
-            
-            Please structure your response with clear headers for Title, Situation, Task, Action, and Result.
-            """
-
             # Call Claude API
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                messages=[{"role": "user", "content": prompt}],
+            text = self._complete(
+                "generate_star_story",
+                self._generate_prompt(competency, context),
+                competency,
             )
 
-            # Parse the response to extract STAR components
-            story_text = response.content[0].text
-            story_components = self._extract_story_components(story_text)
-
-            return {"generated_story": story_text, "components": story_components}
+            return self.parse_generated_story(text)
 
         except Exception as e:
             logger.error(f"Error generating STAR story: {e}")
             return {"error": str(e)}
 
+    def stream_generate_star_story(
+        self, competency: Dict, context: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Streaming variant of generate_star_story.
+
+        Yields the text as Claude produces it; pass the joined text to
+        parse_generated_story() once the stream ends. Errors are raised.
+        """
+        return self._stream(
+            "generate_star_story",
+            self._generate_prompt(competency, context),
+            competency,
+        )
+
+    def parse_generated_story(self, text: str) -> Dict[str, Any]:
+        """Build the generate_star_story() result from the story text."""
+        return {
+            "generated_story": text,
+            "components": self._extract_story_components(text),
+        }
+
+    def _generate_prompt(self, competency: Dict, context: Optional[str]) -> str:
+        # Prepare context
+        context_prompt = ""
+        if context:
+            context_prompt = f"""
+            Use this context/experience when creating the story:
+            {context}
+            """
+
+        # Prepare the prompt
+        prompt = f"""
+        Please generate a high-quality STAR (Situation, Task, Action, Result) story that demonstrates the following competency:
+        
+        Competency: {competency['name']}
+        Description: {competency['description']}
+        
+        {context_prompt}
+        
+        The story should:
+        1. Be specific and detailed
+        2. Clearly demonstrate the competency
+        3. Show measurable results
+        4. Be structured in the STAR format
+        5. Be written in first person
+        
+        Please structure your response with clear headers for Title, Situation, Task, Action, and Result.
+        """
+        return prompt
+
+    def _request(self, prompt: str) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
+    def _cache_key(self, task: str, request: Dict[str, Any], competency):
+        if self.cache is None or not self.cache.enabled_for(task):
+            return None
+        return cache_key(request, competency)
+
+    def _complete(self, task: str, prompt: str, competency=None) -> str:
+        request = self._request(prompt)
+        key = self._cache_key(task, request, competency)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.debug(f"AI response cache hit for {task}")
+                return cached.text
+
+        response = self.client.messages.create(**request)
+        text = response.content[0].text
+
+        if key:
+            self.cache.put(
+                key,
+                task,
+                self.model,
+                CachedResponse(
+                    text, response.usage.input_tokens, response.usage.output_tokens
+                ),
+            )
+        return text
+
+    def _stream(self, task: str, prompt: str, competency=None) -> Iterator[str]:
+        request = self._request(prompt)
+        key = self._cache_key(task, request, competency)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.debug(f"AI response cache hit for {task}")
+                yield cached.text
+                return
+
+        # Leaving the context manager closes the connection, which also
+        # stops generation when the consumer stops reading early
+        with self.client.messages.stream(**request) as stream:
+            yield from stream.text_stream
+            message = stream.get_final_message()
+
+        # Only complete streams are cached
+        if key:
+            self.cache.put(
+                key,
+                task,
+                self.model,
+                CachedResponse(
+                    "".join(
+                        block.text for block in message.content if block.type == "text"
+                    ),
+                    message.usage.input_tokens,
+                    message.usage.output_tokens,
+                ),
+            )
+
     def _extract_story_components(self, story_text: str) -> Dict[str, str]:
         """Extract STAR components from generated story text."""
         components = {
@@ -0,0 +1,71 @@
+# star_competency_app/ai/concurrency.py
+"""
+Caps on concurrent AI calls in this process.
+
+Fan-outs such as PromptAgent.evaluate_stale_stories take a slot for each
+call, so one user's batch cannot use every slot, and all batches together
+stay within the provider's rate limits. The caps are per process; with
+several worker processes the total is the cap times the process count.
+"""
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+from star_competency_app.config.settings import get_settings
+
+
+class ConcurrencyLimiter:
+    """A global semaphore plus one semaphore per user."""
+
+    def __init__(self, global_limit: int = 8, per_user_limit: int = 3):
+        self._global_limit = global_limit
+        self._per_user_limit = per_user_limit
+        self._global = threading.BoundedSemaphore(global_limit)
+        self._users = {}  # user_id -> [semaphore, threads holding or waiting]
+        self._lock = threading.Lock()
+        self._in_use = 0
+
+    @contextmanager
+    def slot(self, user_id: int):
+        """Block until both the user and the process have a free slot."""
+        with self._lock:
+            entry = self._users.setdefault(
+                user_id, [threading.BoundedSemaphore(self._per_user_limit), 0]
+            )
+            entry[1] += 1
+        try:
+            # User slot first, so a user waiting on their own cap holds no
+            # global slot that other users could be using
+            with entry[0], self._global:
+                with self._lock:
+                    self._in_use += 1
+                try:
+                    yield
+                finally:
+                    with self._lock:
+                        self._in_use -= 1
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._users[user_id]
+
+    def stats(self):
+        """Return the caps and current usage."""
+        with self._lock:
+            return {
+                "global_limit": self._global_limit,
+                "per_user_limit": self._per_user_limit,
+                "in_use": self._in_use,
+                "users": len(self._users),
+            }
+
+
+@lru_cache
+def get_concurrency_limiter() -> ConcurrencyLimiter:
+    """Return this process's limiter (AI_GLOBAL_CONCURRENCY, AI_USER_CONCURRENCY)."""
+    settings = get_settings()
+    return ConcurrencyLimiter(
+        global_limit=settings.AI_GLOBAL_CONCURRENCY,
+        per_user_limit=settings.AI_USER_CONCURRENCY,
+    )
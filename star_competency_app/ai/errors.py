@@ -0,0 +1,38 @@
+# star_competency_app/ai/errors.py
+"""
+Error results of OpenAIClient and PromptAgent.
+
+Both report failures as {"error": message} rather than raising. Failures
+another attempt may not hit (connection errors, timeouts, rate limits,
+provider 5xx) also carry "retryable": True; the job worker retries only
+those, and shows every other error (a missing story, a bad request, a
+bug) right away.
+"""
+from typing import Any, Dict, Optional
+
+import anthropic
+import openai
+
+# Timeouts are APIConnectionErrors in both SDKs
+TRANSIENT_ERRORS = (
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+    anthropic.APIConnectionError,
+    anthropic.RateLimitError,
+    anthropic.InternalServerError,
+)
+
+
+def error_result(error: Exception, message: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Turn a caught exception into an error result.
+
+    Args:
+        error: The exception
+        message: Text shown to the user (default: str(error))
+    """
+    result = {"error": message or str(error)}
+    if isinstance(error, TRANSIENT_ERRORS):
+        result["retryable"] = True
+    return result
@@ -1,51 +1,63 @@
 # star_competency_app/ai/openai_client.py
+import json
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 
 from openai import OpenAI
 
+from star_competency_app.ai.errors import error_result
+from star_competency_app.ai.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    cache_key,
+)
+
 logger = logging.getLogger(__name__)
 
+# Batch API statuses after which no more results will arrive; expired and
+# cancelled batches still return the results finished before they stopped
+_BATCH_ENDED = {"completed", "expired", "cancelled"}
+_BATCH_FAILED = {"failed"}
+
 
 class OpenAIClient:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache: Optional[ResponseCache] = None):
         self.client = OpenAI(api_key=api_key)
+        # Completions are reused for identical requests when a cache is given
+        self.cache = cache
 
     def generate_star_story(self, competency: Any, context: str) -> Dict[str, Any]:
         """
         Generate a STAR story given a competency ORM object and a context string.
         """
         try:
-            # Extract ORM attributes directly
-            name = competency.name
-            description = getattr(competency, "description", "") or ""
-
-            # Build the prompt
-            prompt = (
-                f"Generate a STAR story for competency '{name}'.\n"
-                f"Description: {description}\n"
-                f"Context: {context}\n"
-                "Provide clear sections labeled Situation, Task, Action, and Result."
-            )
-
             # Call OpenAI
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.7,
-                max_tokens=500,
+            text = self._complete(
+                "generate_star_story",
+                self._generate_request(competency, context),
+                competency,
             )
-
-            text = response.choices[0].message.content
             story = self._parse_star_response(text)
             return story
 
         except Exception as e:
             logger.exception(f"Error generating STAR story: {e}")
-            return {"error": str(e)}
+            return error_result(e)
+
+    def stream_generate_star_story(
+        self, competency: Any, context: str
+    ) -> Iterator[str]:
+        """
+        Streaming variant of generate_star_story.
+
+        Yields the text as the model produces it; pass the joined text to
+        parse_star_story() once the stream ends. Errors are raised.
+        """
+        return self._stream(
+            "generate_star_story",
+            self._generate_request(competency, context),
+            competency,
+        )
 
     def evaluate_star_story(
         self, story_data: Dict[str, Any], competency: Any
@@ -53,35 +65,238 @@ class OpenAIClient:
         """
         Evaluate an existing STAR story against a competency ORM object.
         """
+        return self._evaluate("evaluate_star_story", story_data, competency)
+
+    def improve_star_story(
+        self, story_data: Dict[str, Any], competency: Any
+    ) -> Dict[str, Any]:
+        """
+        Evaluate a STAR story for improvement suggestions.
+
+        Same request as evaluate_star_story(), under its own cache task so
+        AI_CACHE_BYPASS can give a user asking again a fresh answer while
+        evaluations stay cached.
+        """
+        return self._evaluate("improve_star_story", story_data, competency)
+
+    def _evaluate(
+        self, task: str, story_data: Dict[str, Any], competency: Any
+    ) -> Dict[str, Any]:
         try:
-            name = competency.name
-
-            prompt = (
-                f"Evaluate the following STAR story against the competency '{name}'.\n"
-                f"Situation: {story_data['situation']}\n"
-                f"Task: {story_data['task']}\n"
-                f"Action: {story_data['action']}\n"
-                f"Result: {story_data['result']}\n"
-                "Provide constructive feedback and assign a score out of 5."
+            text = self._complete(
+                task, self._evaluation_request(story_data, competency), competency
+            )
+            return self.parse_evaluation(text)
+
+        except Exception as e:
+            logger.exception(f"Error evaluating STAR story: {e}")
+            return error_result(e)
+
+    def stream_evaluate_star_story(
+        self, story_data: Dict[str, Any], competency: Any
+    ) -> Iterator[str]:
+        """
+        Streaming variant of evaluate_star_story.
+
+        Yields the text as the model produces it; pass the joined text to
+        parse_evaluation() once the stream ends. Errors are raised.
+        """
+        return self._stream(
+            "evaluate_star_story",
+            self._evaluation_request(story_data, competency),
+            competency,
+        )
+
+    def parse_star_story(self, text: str) -> Dict[str, str]:
+        """Split a generated story into its STAR sections."""
+        return self._parse_star_response(text)
+
+    def parse_evaluation(self, text: str) -> Dict[str, Any]:
+        """Split an evaluation into its feedback text and scores."""
+        evaluation, scores = self._parse_evaluation_response(text)
+        return {"evaluation": evaluation, "scores": scores}
+
+    def submit_evaluation_batch(
+        self, items: Iterable[Tuple[str, Dict[str, Any], Any]]
+    ) -> str:
+        """
+        Submit evaluations to the Batch API (half price, within 24 hours).
+
+        Args:
+            items: (custom_id, story_data, competency) for each story
+
+        Returns:
+            The batch ID
+        """
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._evaluation_request(story_data, competency),
+                }
             )
+            for custom_id, story_data, competency in items
+        ]
+        input_file = self.client.files.create(
+            file=("evaluations.jsonl", "\n".join(lines).encode()), purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+
+    def get_batch_status(self, batch_id: str) -> str:
+        """Return "running", "ended" (results ready) or "failed"."""
+        status = self.client.batches.retrieve(batch_id).status
+        if status in _BATCH_ENDED:
+            return "ended"
+        if status in _BATCH_FAILED:
+            return "failed"
+        return "running"
+
+    def get_evaluation_batch_results(
+        self, batch_id: str
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield (custom_id, evaluation) for each finished request of a batch.
+
+        Evaluations are parse_evaluation() results, or {"error": ...} for
+        requests that failed; requests that never ran are not yielded.
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                response = record.get("response") or {}
+                if record.get("error") or response.get("status_code") != 200:
+                    error = record.get("error") or response.get("body")
+                    yield record["custom_id"], {"error": str(error)}
+                    continue
+                text = response["body"]["choices"][0]["message"]["content"]
+                yield record["custom_id"], self.parse_evaluation(text)
+
+    def _generate_request(self, competency: Any, context: str) -> Dict[str, Any]:
+        # Extract ORM attributes directly
+        name = competency.name
+        description = getattr(competency, "description", "") or ""
+
+        # Build the prompt
+        prompt = (
+            f"Generate a STAR story for competency '{name}'.\n"
+            f"Description: {description}\n"
+            f"Context: {context}\n"
+            "Provide clear sections labeled Situation, Task, Action, and Result."
+        )
+        return {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": 0.7,
+            "max_tokens": 500,
+        }
+
+    def _evaluation_request(
+        self, story_data: Dict[str, Any], competency: Any
+    ) -> Dict[str, Any]:
+        name = competency.name
+
+        prompt = (
+            f"Evaluate the following STAR story against the competency '{name}'.\n"
+            f"Situation: {story_data['situation']}\n"
+            f"Task: {story_data['task']}\n"
+            f"Action: {story_data['action']}\n"
+            f"Result: {story_data['result']}\n"
+            "Provide constructive feedback and assign a score out of 5."
+        )
+        return {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": 0.5,
+            "max_tokens": 300,
+        }
+
+    def _cache_key(self, task: str, request: Dict[str, Any], competency: Any):
+        if self.cache is None or not self.cache.enabled_for(task):
+            return None
+        return cache_key(request, competency)
 
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.5,
-                max_tokens=300,
+    def _complete(self, task: str, request: Dict[str, Any], competency: Any) -> str:
+        key = self._cache_key(task, request, competency)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.debug(f"AI response cache hit for {task}")
+                return cached.text
+
+        response = self.client.chat.completions.create(**request)
+        text = response.choices[0].message.content
+
+        if key:
+            usage = response.usage
+            self.cache.put(
+                key,
+                task,
+                request["model"],
+                CachedResponse(
+                    text,
+                    usage.prompt_tokens if usage else 0,
+                    usage.completion_tokens if usage else 0,
+                ),
             )
+        return text
 
-            text = response.choices[0].message.content
-            evaluation, scores = self._parse_evaluation_response(text)
-            return {"evaluation": evaluation, "scores": scores}
+    def _stream(
+        self, task: str, request: Dict[str, Any], competency: Any
+    ) -> Iterator[str]:
+        key = self._cache_key(task, request, competency)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.debug(f"AI response cache hit for {task}")
+                yield cached.text
+                return
 
-        except Exception as e:
-            logger.exception(f"Error evaluating STAR story: {e}")
-            return {"error": str(e)}
+        stream = self.client.chat.completions.create(
+            stream=True, stream_options={"include_usage": True}, **request
+        )
+        parts = []
+        usage = None
+        try:
+            for chunk in stream:
+                # The final chunk carries the usage and no choices
+                usage = getattr(chunk, "usage", None) or usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+        finally:
+            # Stop generating (and paying for) tokens nobody will read
+            stream.close()
+
+        # Only complete streams are cached
+        if key:
+            self.cache.put(
+                key,
+                task,
+                request["model"],
+                CachedResponse(
+                    "".join(parts),
+                    usage.prompt_tokens if usage else 0,
+                    usage.completion_tokens if usage else 0,
+                ),
+            )
 
     def _parse_star_response(self, text: str) -> Dict[str, str]:
         parts = {"situation": "", "task": "", "action": "", "result": ""}
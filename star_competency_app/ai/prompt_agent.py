@@ -1,10 +1,17 @@
 # star_competency_app/ai/prompt_agent.py
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
+from star_competency_app.ai.concurrency import get_concurrency_limiter
+from star_competency_app.ai.errors import error_result
 from star_competency_app.ai.openai_client import OpenAIClient
-from star_competency_app.database.db_manager import DatabaseManager
+from star_competency_app.ai.response_cache import get_response_cache
+from star_competency_app.ai.scoring import overall_score
+from star_competency_app.config.settings import get_settings
+from star_competency_app.database.db_manager import DatabaseManager, get_db_manager
 
 logger = logging.getLogger(__name__)
 
@@ -26,10 +33,12 @@ class PromptAgent:
             raise ValueError("OPENAI_API_KEY environment variable is not set")
 
         # If no client is provided, create one with the API key from environment
-        self.openai_client = openai_client or OpenAIClient(api_key=api_key)
+        self.openai_client = openai_client or OpenAIClient(
+            api_key=api_key, cache=get_response_cache()
+        )
 
         # Rest of the initialization remains the same
-        self.db_manager = db_manager or DatabaseManager()
+        self.db_manager = db_manager or get_db_manager()
         self.context = {}
 
     def analyze_case_study(
@@ -102,7 +111,7 @@ class PromptAgent:
 
         except Exception as e:
             logger.error(f"Error analyzing case study: {e}")
-            return {"error": str(e)}
+            return error_result(e)
 
     def evaluate_star_story(
         self,
@@ -145,7 +154,7 @@ class PromptAgent:
 
         except Exception as e:
             logger.error(f"Error evaluating STAR story: {e}")
-            return {"error": str(e)}
+            return error_result(e)
 
     def generate_star_story(
         self,
@@ -195,7 +204,207 @@ class PromptAgent:
 
         except Exception as e:
             logger.exception("Failed to generate STAR story")
-            return {"error": f"OpenAI generation failed: {str(e)}"}
+            return error_result(e, f"OpenAI generation failed: {str(e)}")
+
+    def evaluate_stale_stories(
+        self,
+        user_id: int,
+        progress: Optional[Callable[[Dict[str, int]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Evaluate every story of a user that is unevaluated or edited since.
+
+        Runs evaluate_star_story() on a thread pool, capped per user and per
+        process (AI_USER_CONCURRENCY, AI_GLOBAL_CONCURRENCY), and writes the
+        feedback and scores back EVALUATE_ALL_BATCH_SIZE stories at a time.
+        Stories already written back are no longer stale, so a rerun after a
+        failure only evaluates the rest. Stories edited while the run was in
+        flight are skipped rather than given feedback on their old text;
+        they stay stale for the next run.
+
+        Args:
+            user_id: Owner of the stories
+            progress: Called with {"total", "done", "failed"} as each
+                evaluation finishes; exceptions it raises abort the run
+
+        Returns:
+            Dict with total, evaluated, failed and skipped counts, plus
+            per-story "results" (story_id, title, score) and "errors"
+        """
+        settings = get_settings()
+        started_at = datetime.utcnow()
+        stories = self.db_manager.get_stale_star_stories(user_id)
+        counts = {"total": len(stories), "done": 0, "failed": 0}
+        results, errors, pending, skipped = [], [], [], []
+        if progress:
+            progress(dict(counts))
+
+        limiter = get_concurrency_limiter()
+
+        def evaluate(story):
+            with limiter.slot(user_id):
+                return self.evaluate_star_story(
+                    story_data={
+                        "title": story.title,
+                        "situation": story.situation,
+                        "task": story.task,
+                        "action": story.action,
+                        "result": story.result,
+                    },
+                    competency_id=story.competency_id,
+                    user_id=user_id,
+                )
+
+        if stories:
+            executor = ThreadPoolExecutor(
+                max_workers=min(settings.AI_USER_CONCURRENCY, len(stories)),
+                thread_name_prefix=f"evaluate-all-{user_id}",
+            )
+            futures = {executor.submit(evaluate, story): story for story in stories}
+            try:
+                for future in as_completed(futures):
+                    story = futures[future]
+                    result = future.result()
+                    counts["done"] += 1
+                    if "error" in result:
+                        counts["failed"] += 1
+                        errors.append(
+                            {
+                                "story_id": story.id,
+                                "title": story.title,
+                                "error": result["error"],
+                            }
+                        )
+                    else:
+                        score = overall_score(result.get("scores"))
+                        pending.append(
+                            (
+                                {
+                                    "story_id": story.id,
+                                    "ai_feedback": result.get("evaluation", ""),
+                                    "ai_score": score,
+                                },
+                                {
+                                    "story_id": story.id,
+                                    "title": story.title,
+                                    "score": score,
+                                },
+                            )
+                        )
+                        if len(pending) >= settings.EVALUATE_ALL_BATCH_SIZE:
+                            self._store_evaluations(
+                                pending, started_at, results, skipped
+                            )
+                            pending = []
+                    if progress:
+                        progress(dict(counts))
+
+                if pending:
+                    self._store_evaluations(pending, started_at, results, skipped)
+            finally:
+                # On an error, don't start evaluations nobody will store
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        logger.info(
+            f"Evaluated {len(results)} of {counts['total']} stale stories "
+            f"for user {user_id} ({counts['failed']} failed, "
+            f"{len(skipped)} edited meanwhile)"
+        )
+        return {
+            "total": counts["total"],
+            "evaluated": len(results),
+            "failed": counts["failed"],
+            "skipped": len(skipped),
+            "results": results,
+            "errors": errors,
+        }
+
+    def _store_evaluations(self, pending, started_at, results, skipped):
+        """Write back (update, result) pairs, sorting them into results or skipped."""
+        written = set(
+            self.db_manager.update_star_stories(
+                [update for update, _ in pending], unchanged_since=started_at
+            )
+        )
+        for update, result in pending:
+            (results if update["story_id"] in written else skipped).append(result)
+
+    def stream_evaluate_star_story(
+        self,
+        story_data: Dict[str, str],
+        competency_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Evaluate a STAR story, yielding the evaluation as it is written.
+
+        Args:
+            story_data: Dictionary containing STAR story components
+            competency_id: ID of the specific competency
+            user_id: User ID for personalization
+
+        Yields:
+            Chunks of the evaluation text; parse the joined text with
+            parse_evaluation(). Errors are raised, not returned.
+        """
+        competency = None
+        if competency_id:
+            competency = self.db_manager.get_competency_by_id(competency_id)
+
+        yield from self.openai_client.stream_evaluate_star_story(
+            story_data=story_data, competency=competency
+        )
+
+        if user_id:
+            self.db_manager.log_audit(
+                user_id=user_id,
+                action="evaluate_story",
+                entity_type="star_story",
+                details=f"Evaluated story: {story_data.get('title', 'Untitled')}",
+            )
+
+    def parse_evaluation(self, text: str) -> Dict[str, Any]:
+        """Turn streamed evaluation text into the evaluate_star_story() result."""
+        return self.openai_client.parse_evaluation(text)
+
+    def stream_generate_star_story(
+        self,
+        competency_id: int,
+        context: Optional[str] = None,
+        user_id: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Generate a STAR story, yielding the text as it is written.
+
+        Args:
+            competency_id: ID of the competency to generate a story for
+            context: Optional context for story generation
+            user_id: User ID for personalization
+
+        Yields:
+            Chunks of the story text; parse the joined text with
+            parse_star_story(). Errors are raised, not returned.
+        """
+        competency = self.db_manager.get_competency_by_id(competency_id)
+        if not competency:
+            logger.warning(f"Competency with ID {competency_id} not found.")
+            raise ValueError("Competency not found")
+
+        yield from self.openai_client.stream_generate_star_story(
+            competency=competency, context=context
+        )
+
+        if user_id:
+            self.db_manager.log_audit(
+                user_id=user_id,
+                action="generate_story",
+                entity_type="star_story",
+                details=f"Generated story for competency: {competency.name}",
+            )
+
+    def parse_star_story(self, text: str) -> Dict[str, str]:
+        """Turn streamed story text into its Situation/Task/Action/Result parts."""
+        return self.openai_client.parse_star_story(text)
 
     def perform_gap_analysis(self, user_id: int) -> Dict[str, Any]:
         """
@@ -267,7 +476,7 @@ class PromptAgent:
 
         except Exception as e:
             logger.error(f"Error performing gap analysis: {e}")
-            return {"error": str(e)}
+            return error_result(e)
 
     def improve_star_story(
         self, story_id: int, user_id: Optional[int] = None
@@ -307,8 +516,8 @@ class PromptAgent:
                 competency = self.db_manager.get_competency_by_id(story.competency_id)
 
             # Evaluate the story to get improvement suggestions
-            evaluation_result = self.openai_client.evaluate_star_story(
-                story=story_data, competency=competency
+            evaluation_result = self.openai_client.improve_star_story(
+                story_data=story_data, competency=competency
             )
 
             # Extract improvement suggestions
@@ -341,7 +550,7 @@ class PromptAgent:
 
         except Exception as e:
             logger.error(f"Error improving STAR story: {e}")
-            return {"error": str(e)}
+            return error_result(e)
 
     def handle_general_query(
         self, user_query: str, user_id: Optional[int] = None
@@ -398,4 +607,4 @@ class PromptAgent:
 
         except Exception as e:
             logger.error(f"Error handling general query: {e}")
-            return {"error": str(e)}
+            return error_result(e)
@@ -0,0 +1,243 @@
+# star_competency_app/ai/response_cache.py
+"""
+Content-addressed cache of AI completions.
+
+A completion is looked up by a hash of everything that determines it: the
+model, the messages, the sampling parameters and the content of the
+competency the prompt is about. Lookups try an in-process LRU first, then
+the ai_response_cache table shared by every process
+(database/ai_response_store.py); misses call the model and store the
+text in both tiers.
+"""
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, Iterable, NamedTuple, Optional
+
+from star_competency_app.config.settings import get_settings
+from star_competency_app.database.db_manager import get_db_manager
+
+logger = logging.getLogger(__name__)
+
+# Stores between purges of expired and surplus entries in the shared tier
+PURGE_EVERY = 100
+
+# Competency fields that can change a prompt
+_COMPETENCY_FIELDS = ("id", "name", "description", "category", "level", "expectations")
+
+
+class CachedResponse(NamedTuple):
+    """A completion's text and the tokens a cache hit saves."""
+
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+    @property
+    def tokens(self):
+        return self.prompt_tokens + self.completion_tokens
+
+
+def competency_version(competency) -> Optional[str]:
+    """
+    Content hash of a competency, so edits to it invalidate cached responses.
+
+    Args:
+        competency: CompetencyRecord, ORM object or dict; None for no competency
+
+    Returns:
+        A short hex digest, identical across processes, or None
+    """
+    if competency is None:
+        return None
+    if isinstance(competency, dict):
+        data = {field: competency.get(field) for field in _COMPETENCY_FIELDS}
+    else:
+        data = {field: getattr(competency, field, None) for field in _COMPETENCY_FIELDS}
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def cache_key(request: Dict[str, Any], competency=None) -> str:
+    """
+    Key for a model request.
+
+    Args:
+        request: The API call's keyword arguments (model, messages or prompt,
+            temperature, max_tokens, ...)
+        competency: The competency the prompt is about, if any
+
+    Returns:
+        SHA-256 hex digest
+    """
+    payload = json.dumps(
+        {"request": request, "competency": competency_version(competency)},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache of AI completions: a bounded in-process LRU with a TTL
+    in front of a shared store.
+
+    Store failures are logged and treated as misses; the cache never makes
+    an AI call fail.
+    """
+
+    def __init__(
+        self,
+        store=None,
+        maxsize: int = 256,
+        ttl: int = 604800,
+        bypass: Iterable[str] = (),
+    ):
+        """
+        Args:
+            store: Shared tier (a DatabaseManager), or None for memory only
+            maxsize: Entries kept in this process
+            ttl: Seconds an entry is served
+            bypass: Tasks that always call the model
+        """
+        self._store = store
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._bypass = frozenset(bypass)
+        self._entries = OrderedDict()  # key -> (CachedResponse, expires_at)
+        self._lock = threading.Lock()
+        self._memory_hits = 0
+        self._store_hits = 0
+        self._misses = 0
+        self._bypassed = 0
+        self._stores = 0
+        self._evictions = 0
+        self._store_errors = 0
+        self._tokens_saved = 0
+
+    def enabled_for(self, task: str) -> bool:
+        """False for tasks opted out of caching (AI_CACHE_BYPASS)."""
+        if task in self._bypass:
+            with self._lock:
+                self._bypassed += 1
+            return False
+        return True
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the cached response for key, or None on a miss."""
+        now = datetime.utcnow()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self._memory_hits += 1
+                self._tokens_saved += entry[0].tokens
+                return entry[0]
+
+        row = None
+        if self._store is not None:
+            try:
+                row = self._store.get_cached_ai_response(key)
+            except Exception as e:
+                logger.warning(f"AI response cache lookup failed: {e}")
+                with self._lock:
+                    self._store_errors += 1
+
+        with self._lock:
+            if row is None:
+                self._misses += 1
+                return None
+            response = CachedResponse(
+                row.content, row.prompt_tokens, row.completion_tokens
+            )
+            self._store_hits += 1
+            self._tokens_saved += response.tokens
+            self._remember(key, response, row.expires_at)
+            return response
+
+    def put(self, key: str, task: str, model: str, response: CachedResponse):
+        """Cache a completion in both tiers; empty responses are not cached."""
+        if not response.text:
+            return
+
+        with self._lock:
+            self._remember(
+                key, response, datetime.utcnow() + timedelta(seconds=self._ttl)
+            )
+            self._stores += 1
+            purge = self._stores % PURGE_EVERY == 0
+
+        if self._store is None:
+            return
+        try:
+            self._store.store_ai_response(
+                key,
+                task,
+                model,
+                response.text,
+                prompt_tokens=response.prompt_tokens,
+                completion_tokens=response.completion_tokens,
+                ttl=self._ttl,
+            )
+            if purge:
+                self._store.purge_ai_responses()
+        except Exception as e:
+            logger.warning(f"Failed to store AI response in the shared cache: {e}")
+            with self._lock:
+                self._store_errors += 1
+
+    def _remember(self, key, response, expires_at):
+        # Caller holds the lock
+        self._entries[key] = (response, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self):
+        """Drop every entry held in this process."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return size and hit/miss counters for this process."""
+        with self._lock:
+            hits = self._memory_hits + self._store_hits
+            lookups = hits + self._misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self._maxsize,
+                "ttl": self._ttl,
+                "bypass": sorted(self._bypass),
+                "hits": hits,
+                "memory_hits": self._memory_hits,
+                "store_hits": self._store_hits,
+                "misses": self._misses,
+                "bypassed": self._bypassed,
+                "stores": self._stores,
+                "evictions": self._evictions,
+                "store_errors": self._store_errors,
+                "tokens_saved": self._tokens_saved,
+                "hit_rate": round(hits / lookups, 4) if lookups else None,
+            }
+
+
+@lru_cache
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return this process's response cache, or None if AI_CACHE_ENABLED is off."""
+    settings = get_settings()
+    if not settings.AI_CACHE_ENABLED:
+        return None
+    return ResponseCache(
+        store=get_db_manager(),
+        maxsize=settings.AI_CACHE_SIZE,
+        ttl=settings.AI_CACHE_TTL,
+        bypass=[
+            task.strip() for task in settings.AI_CACHE_BYPASS.split(",") if task.strip()
+        ],
+    )
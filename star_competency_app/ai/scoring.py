@@ -0,0 +1,34 @@
+# star_competency_app/ai/scoring.py
+from typing import Dict, Optional
+
+# Evaluations score each aspect of a story on a 1-5 scale
+MIN_SCORE = 1
+MAX_SCORE = 5
+
+
+def overall_score(scores: Optional[Dict]) -> Optional[float]:
+    """
+    Reduce an evaluation's per-aspect scores to one overall score.
+
+    Args:
+        scores: The "scores" dict of an evaluation result
+
+    Returns:
+        The "overall" score if the model gave one, else the mean of the
+        numeric scores, clamped to 1-5; None when nothing was scored
+    """
+    if not scores:
+        return None
+
+    overall = scores.get("overall")
+    if not isinstance(overall, (int, float)):
+        values = [
+            value
+            for key, value in scores.items()
+            if key != "overall" and isinstance(value, (int, float))
+        ]
+        if not values:
+            return None
+        overall = sum(values) / len(values)
+
+    return round(max(MIN_SCORE, min(MAX_SCORE, float(overall))), 1)
@@ -0,0 +1,167 @@
+# star_competency_app/ai/tasks.py
+"""
+AI tasks run by the background worker (star_competency_app/worker.py).
+
+Each task takes the worker's PromptAgent and DatabaseManager, the job's
+user_id and payload, and a progress(dict) callback that stores progress on
+the job and extends its lease (returning False once the lease is lost);
+tasks making a single model call keep their lease with _lease_kept(). A
+task returns the JSON result the polling page renders. Routes queue them with
+DatabaseManager.enqueue_job(user_id, kind, payload).
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict
+
+from star_competency_app.ai.scoring import overall_score
+from star_competency_app.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class TaskError(Exception):
+    """A task failed; retryable=False when another attempt cannot succeed."""
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def _check(result: Dict[str, Any]) -> Dict[str, Any]:
+    # PromptAgent reports failures as {"error": ...}; only transient API
+    # failures are marked retryable (see ai/errors.py)
+    if "error" in result:
+        raise TaskError(result["error"], retryable=result.get("retryable", False))
+    return result
+
+
+@contextmanager
+def _lease_kept(progress):
+    """
+    Extend the job's lease while a model call runs.
+
+    A call can outlast JOB_VISIBILITY_TIMEOUT, and another worker would then
+    claim the job and run it twice. Renews the lease every third of the
+    timeout; raises TaskError after the call if the lease was lost anyway,
+    so its result is not stored twice.
+    """
+    interval = get_settings().JOB_VISIBILITY_TIMEOUT / 3
+    done, lost = threading.Event(), threading.Event()
+
+    def renew():
+        while not done.wait(interval):
+            try:
+                if not progress(None):
+                    lost.set()
+                    return
+            except Exception as e:
+                # e.g. a database blip; the lease still has time left
+                logger.warning(f"Could not extend job lease: {e}")
+
+    thread = threading.Thread(target=renew, name="job-lease", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join()
+    if lost.is_set():
+        raise TaskError("Another worker took over this job", retryable=False)
+
+
+def _owned_story(db_manager, story_id, user_id):
+    story = db_manager.get_star_story_by_id(story_id)
+    if not story or story.user_id != user_id:
+        raise TaskError("STAR story not found", retryable=False)
+    return story
+
+
+def store_evaluation(db_manager, story_id, result):
+    """Save an evaluation's feedback and overall score on the story; returns the result."""
+    db_manager.update_star_story(
+        story_id=story_id,
+        ai_feedback=result.get("evaluation", ""),
+        ai_score=overall_score(result.get("scores")),
+    )
+    return {
+        "evaluation": result.get("evaluation", ""),
+        "scores": result.get("scores", {}),
+    }
+
+
+def evaluate_story(prompt_agent, db_manager, user_id, payload, progress):
+    """Evaluate a STAR story and store the feedback and overall score on it."""
+    story = _owned_story(db_manager, payload["story_id"], user_id)
+    with _lease_kept(progress):
+        result = _check(
+            prompt_agent.evaluate_star_story(
+                story_data={
+                    "title": story.title,
+                    "situation": story.situation,
+                    "task": story.task,
+                    "action": story.action,
+                    "result": story.result,
+                },
+                competency_id=story.competency_id,
+                user_id=user_id,
+            )
+        )
+    return store_evaluation(db_manager, story.id, result)
+
+
+def improve_story(prompt_agent, db_manager, user_id, payload, progress):
+    """Suggest improvements to a STAR story."""
+    story = _owned_story(db_manager, payload["story_id"], user_id)
+    with _lease_kept(progress):
+        result = _check(
+            prompt_agent.improve_star_story(story_id=story.id, user_id=user_id)
+        )
+    return {
+        "suggestions": result.get("evaluation", ""),
+        "improved_components": result.get("improvement_suggestions", {}),
+    }
+
+
+def generate_story(prompt_agent, db_manager, user_id, payload, progress):
+    """Structure free text into STAR components for a competency."""
+    with _lease_kept(progress):
+        result = _check(
+            prompt_agent.generate_star_story(
+                competency_id=payload["competency_id"],
+                context=payload["story_content"],
+                user_id=user_id,
+            )
+        )
+    return {
+        "situation": result.get("situation", ""),
+        "task": result.get("task", ""),
+        "action": result.get("action", ""),
+        "result": result.get("result", ""),
+    }
+
+
+def gap_analysis(prompt_agent, db_manager, user_id, payload, progress):
+    """Analyse a user's stories against the competency framework."""
+    with _lease_kept(progress):
+        return _check(prompt_agent.perform_gap_analysis(user_id=user_id))
+
+
+def evaluate_all(prompt_agent, db_manager, user_id, payload, progress):
+    """Evaluate all of a user's stale STAR stories, reporting progress as they finish."""
+
+    def report(counts):
+        if not progress(counts):
+            raise TaskError("Another worker took over this job", retryable=False)
+
+    return prompt_agent.evaluate_stale_stories(user_id, progress=report)
+
+
+# Job kind -> task
+TASKS = {
+    "evaluate_story": evaluate_story,
+    "improve_story": improve_story,
+    "generate_story": generate_story,
+    "gap_analysis": gap_analysis,
+    "evaluate_all": evaluate_all,
+}
@@ -8,7 +8,7 @@ import requests
 from flask import redirect, request, session, url_for
 
 from star_competency_app.config.settings import get_settings
-from star_competency_app.database.db_manager import DatabaseManager
+from star_competency_app.database.db_manager import DatabaseManager, get_db_manager
 from star_competency_app.database.models import User
 
 logger = logging.getLogger(__name__)
@@ -24,7 +24,7 @@ class AzureSSO:
         self.scope = ["User.Read"]
         self.redirect_path = "/auth/callback"
 
-        self.db_manager = db_manager or DatabaseManager()
+        self.db_manager = db_manager or get_db_manager()
 
         # Initialize MSAL app
         self.app = msal.ConfidentialClientApplication(
@@ -186,6 +186,9 @@ class AzureSSO:
             # Commit changes
             db_session.commit()
 
+        # Azure may have changed the name or email; reload it on next access
+        self.db_manager.invalidate_user_identity(user_data["id"])
+
         # Store user data in Flask session (outside the db session)
         session["user"] = user_data
         session["access_token"] = token_result["access_token"]
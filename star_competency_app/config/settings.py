@@ -22,6 +22,121 @@ class Settings(BaseSettings):
     DATABASE_URL: str = os.getenv(
         "DATABASE_URL", "postgresql://user:password@db:5432/star_competency"
     )
+    # Comma-separated read replica URLs; empty sends all reads to the primary
+    DATABASE_REPLICA_URLS: str = os.getenv("DATABASE_REPLICA_URLS", "")
+    # Seconds a user's reads stay on the primary after their own write
+    DB_READ_YOUR_WRITES_SECONDS: int = int(
+        os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5")
+    )
+    # Seconds an unreachable replica is skipped before it is tried again
+    DB_REPLICA_RETRY_INTERVAL: int = int(os.getenv("DB_REPLICA_RETRY_INTERVAL", "10"))
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True").lower() in (
+        "true",
+        "1",
+        "t",
+    )
+
+    # Server-side limits per connection (PostgreSQL); 0 disables a limit
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    DB_LOCK_TIMEOUT_MS: int = int(os.getenv("DB_LOCK_TIMEOUT_MS", "5000"))
+    # Statements slower than this are written to logs/slow_query.log
+    DB_SLOW_QUERY_MS: int = int(os.getenv("DB_SLOW_QUERY_MS", "500"))
+
+    # Share one session per request and commit once when the view returns
+    DB_REQUEST_SESSION: bool = os.getenv("DB_REQUEST_SESSION", "False").lower() in (
+        "true",
+        "1",
+        "t",
+    )
+
+    # Per-request SQL instrumentation
+    QUERY_BUDGET: int = int(os.getenv("QUERY_BUDGET", "30"))  # statements/request
+    QUERY_REPEAT_THRESHOLD: int = int(os.getenv("QUERY_REPEAT_THRESHOLD", "5"))
+    QUERY_SLOWEST_KEEP: int = int(os.getenv("QUERY_SLOWEST_KEEP", "5"))
+    QUERY_DEBUG_HEADERS: bool = os.getenv(
+        "QUERY_DEBUG_HEADERS", os.getenv("DEBUG", "False")
+    ).lower() in ("true", "1", "t")
+
+    # Seconds before the in-process competency catalog is reloaded
+    COMPETENCY_CACHE_TTL: int = int(os.getenv("COMPETENCY_CACHE_TTL", "300"))
+
+    # In-process cache of logged-in user identities (Flask-Login user_loader)
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "1024"))
+    USER_CACHE_TTL: int = int(os.getenv("USER_CACHE_TTL", "60"))  # seconds
+
+    # Buffered audit log writer
+    AUDIT_BUFFER_ENABLED: bool = os.getenv("AUDIT_BUFFER_ENABLED", "True").lower() in (
+        "true",
+        "1",
+        "t",
+    )
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "100"))
+    AUDIT_FLUSH_INTERVAL: float = float(
+        os.getenv("AUDIT_FLUSH_INTERVAL", "2.0")
+    )  # seconds
+    AUDIT_QUEUE_MAX: int = int(os.getenv("AUDIT_QUEUE_MAX", "10000"))
+    AUDIT_SPOOL_PATH: str = os.getenv("AUDIT_SPOOL_PATH", "/app/data/audit_spool.jsonl")
+
+    # Audit log partitioning and retention (PostgreSQL)
+    AUDIT_PARTITION_MONTHS_AHEAD: int = int(
+        os.getenv("AUDIT_PARTITION_MONTHS_AHEAD", "3")
+    )
+    AUDIT_RETENTION_MONTHS: int = int(os.getenv("AUDIT_RETENTION_MONTHS", "12"))
+    AUDIT_ARCHIVE_DIR: str = os.getenv("AUDIT_ARCHIVE_DIR", "/app/data/audit_archive")
+
+    # Bulk STAR story / case study import and export
+    BULK_IMPORT_BATCH_SIZE: int = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "1000"))
+    BULK_EXPORT_BATCH_SIZE: int = int(os.getenv("BULK_EXPORT_BATCH_SIZE", "1000"))
+
+    # Background AI job queue (see star_competency_app/worker.py)
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_VISIBILITY_TIMEOUT: int = int(
+        os.getenv("JOB_VISIBILITY_TIMEOUT", "300")
+    )  # seconds a claimed job stays invisible to other workers
+    JOB_RETRY_BACKOFF: int = int(os.getenv("JOB_RETRY_BACKOFF", "10"))  # seconds
+    JOB_POLL_INTERVAL: float = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))  # seconds
+    JOB_WORKER_CONCURRENCY: int = int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))
+    JOB_RETENTION_DAYS: int = int(os.getenv("JOB_RETENTION_DAYS", "7"))
+
+    # "Evaluate all stale stories": concurrent AI calls per user and per
+    # process, and evaluations written back per transaction
+    AI_USER_CONCURRENCY: int = int(os.getenv("AI_USER_CONCURRENCY", "3"))
+    AI_GLOBAL_CONCURRENCY: int = int(os.getenv("AI_GLOBAL_CONCURRENCY", "8"))
+    EVALUATE_ALL_BATCH_SIZE: int = int(os.getenv("EVALUATE_ALL_BATCH_SIZE", "10"))
+
+    # Cache of AI responses keyed on model, prompt, parameters and competency
+    AI_CACHE_ENABLED: bool = os.getenv("AI_CACHE_ENABLED", "True").lower() in (
+        "true",
+        "1",
+        "t",
+    )
+    AI_CACHE_SIZE: int = int(os.getenv("AI_CACHE_SIZE", "256"))  # in-process entries
+    AI_CACHE_TTL: int = int(os.getenv("AI_CACHE_TTL", "604800"))  # seconds (7 days)
+    AI_CACHE_MAX_ROWS: int = int(
+        os.getenv("AI_CACHE_MAX_ROWS", "10000")
+    )  # entries kept in the ai_response_cache table
+    # Comma-separated tasks that always call the model. A user asking again
+    # for a generated story or improvement suggestions wants a new draft,
+    # not the cached one
+    AI_CACHE_BYPASS: str = os.getenv(
+        "AI_CACHE_BYPASS", "generate_star_story,improve_star_story"
+    )
+
+    # Bulk re-scoring through provider batch APIs (scripts/rescore_stories.py)
+    RESCORE_PROVIDER: str = os.getenv("RESCORE_PROVIDER", "openai")  # or "anthropic"
+    RESCORE_CHUNK_SIZE: int = int(
+        os.getenv("RESCORE_CHUNK_SIZE", "1000")
+    )  # stories per batch
+    RESCORE_MAX_OPEN_BATCHES: int = int(
+        os.getenv("RESCORE_MAX_OPEN_BATCHES", "5")
+    )  # submitted batches awaiting results
+    RESCORE_POLL_INTERVAL: float = float(
+        os.getenv("RESCORE_POLL_INTERVAL", "60")
+    )  # seconds
 
     # Claude API settings
     CLAUDE_API_KEY: str = os.getenv("CLAUDE_API_KEY", "")
@@ -0,0 +1,119 @@
+# star_competency_app/database/ai_response_store.py
+"""
+Shared tier of the AI response cache, in the ai_response_cache table.
+
+Every web and worker process reads and writes the same rows, so a
+completion paid for once is reused everywhere until it expires. The
+in-process LRU in front of it lives in star_competency_app/ai/response_cache.py.
+"""
+import logging
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from star_competency_app.database.models import AIResponseCacheEntry
+
+logger = logging.getLogger(__name__)
+
+_UPSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def load_response(conn, key, now):
+    """
+    Fetch an unexpired entry and record the hit.
+
+    Args:
+        conn: Connection with an open transaction
+        key: Cache key (see ai/response_cache.py:cache_key)
+        now: Current UTC time
+
+    Returns:
+        The row (content, task, model, token counts, expires_at) or None
+    """
+    table = AIResponseCacheEntry.__table__
+    row = conn.execute(
+        select(
+            table.c.content,
+            table.c.task,
+            table.c.model,
+            table.c.prompt_tokens,
+            table.c.completion_tokens,
+            table.c.expires_at,
+        ).where(table.c.key == key, table.c.expires_at > now)
+    ).first()
+    if row is None:
+        return None
+
+    conn.execute(
+        update(table)
+        .where(table.c.key == key)
+        .values(hits=table.c.hits + 1, last_used_at=now)
+    )
+    return row
+
+
+def save_response(
+    conn, key, task, model, content, prompt_tokens, completion_tokens, now, expires_at
+):
+    """Insert or replace an entry (a concurrent miss may have stored it first)."""
+    table = AIResponseCacheEntry.__table__
+    values = {
+        "task": task,
+        "model": model,
+        "content": content,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "last_used_at": now,
+        "expires_at": expires_at,
+    }
+    stmt = _UPSERTS[conn.dialect.name](table).values(
+        key=key, hits=0, created_at=now, **values
+    )
+    conn.execute(stmt.on_conflict_do_update(index_elements=[table.c.key], set_=values))
+
+
+def purge_responses(conn, max_rows, now):
+    """
+    Delete expired entries, then the least recently used beyond max_rows.
+
+    Returns:
+        Dict with the number of "expired" and "evicted" rows deleted
+    """
+    table = AIResponseCacheEntry.__table__
+    expired = conn.execute(delete(table).where(table.c.expires_at <= now)).rowcount
+
+    surplus = (
+        select(table.c.key)
+        .order_by(table.c.last_used_at.desc(), table.c.key)
+        .offset(max_rows)
+    )
+    evicted = conn.execute(delete(table).where(table.c.key.in_(surplus))).rowcount
+
+    if expired or evicted:
+        logger.info(f"Purged AI response cache: {expired} expired, {evicted} evicted")
+    return {"expired": expired, "evicted": evicted}
+
+
+def response_store_stats(conn, now):
+    """Size of the shared tier and the hits and tokens it has saved."""
+    table = AIResponseCacheEntry.__table__
+    row = conn.execute(
+        select(
+            func.count(),
+            func.coalesce(func.sum(table.c.hits), 0),
+            func.coalesce(
+                func.sum(
+                    table.c.hits * (table.c.prompt_tokens + table.c.completion_tokens)
+                ),
+                0,
+            ),
+            func.count().filter(table.c.expires_at <= now),
+        ).select_from(table)
+    ).one()
+    return {
+        "entries": row[0],
+        "hits": int(row[1]),
+        "tokens_saved": int(row[2]),
+        "expired": row[3],
+    }
@@ -0,0 +1,222 @@
+# star_competency_app/database/audit_partitions.py
+"""
+Monthly range partitions for audit_logs on PostgreSQL.
+
+Migration 0002 turns audit_logs into a table partitioned by created_at.
+The functions here keep partitions created ahead of time and move old
+months out of the table: a partition past the retention window is
+detached, exported to a gzip-compressed JSONL file and dropped.
+
+On other databases (SQLite in development) every function is a no-op.
+"""
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import date, datetime
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "audit_logs"
+DEFAULT_PARTITION = "audit_logs_default"
+PARTITION_NAME_RE = re.compile(r"^audit_logs_y(\d{4})m(\d{2})$")
+
+# Rows fetched per round trip while exporting a partition
+EXPORT_BATCH_SIZE = 5000
+
+
+def month_start(value) -> date:
+    """Return the first day of the month containing value."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Shift a first-of-month date by a number of months."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding the given month, e.g. audit_logs_y2026m10."""
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def parse_partition_name(name: str):
+    """Return the month a partition name covers, or None if it isn't one."""
+    match = PARTITION_NAME_RE.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def create_partition_sql(month: date) -> str:
+    """DDL creating the partition for one month if it doesn't already exist."""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+        f"PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def is_partitioned(conn) -> bool:
+    """Whether audit_logs is a partitioned table on this connection's database."""
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(
+        conn.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid "
+                "WHERE c.relname = :name AND pg_table_is_visible(c.oid)"
+            ),
+            {"name": PARENT_TABLE},
+        ).scalar()
+    )
+
+
+def list_partitions(conn):
+    """
+    List monthly audit log partitions, attached or detached.
+
+    Returns:
+        List of (name, month, attached) tuples ordered by month
+    """
+    rows = conn.execute(
+        text(
+            "SELECT c.relname, EXISTS ("
+            "  SELECT 1 FROM pg_inherits i JOIN pg_class p ON p.oid = i.inhparent"
+            "  WHERE i.inhrelid = c.oid AND p.relname = :parent"
+            ") AS attached "
+            "FROM pg_class c "
+            "WHERE c.relkind = 'r' AND c.relname LIKE 'audit\\_logs\\_y%' "
+            "AND pg_table_is_visible(c.oid)"
+        ),
+        {"parent": PARENT_TABLE},
+    ).fetchall()
+
+    partitions = []
+    for name, attached in rows:
+        month = parse_partition_name(name)
+        if month is not None:
+            partitions.append((name, month, attached))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def ensure_partitions(engine, months_ahead=3, today=None):
+    """
+    Create the partitions for the current month and the next months_ahead.
+
+    Rows outside every monthly range land in the default partition, so a
+    missed run never loses events; it just leaves them in one big table.
+
+    Args:
+        engine: SQLAlchemy engine
+        months_ahead: Number of future months to create partitions for
+        today: Reference date (defaults to today, UTC)
+
+    Returns:
+        List of partition names that were checked or created
+    """
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            return []
+
+        current = month_start(today or datetime.utcnow().date())
+        names = []
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            conn.execute(text(create_partition_sql(month)))
+            names.append(partition_name(month))
+
+    logger.info(f"Ensured audit log partitions: {', '.join(names)}")
+    return names
+
+
+def _export_partition(conn, name, archive_dir):
+    """Stream a partition's rows to archive_dir/<name>.jsonl.gz and return the row count."""
+    os.makedirs(archive_dir, exist_ok=True)
+    final_path = os.path.join(archive_dir, f"{name}.jsonl.gz")
+    tmp_path = f"{final_path}.tmp"
+
+    result = conn.execution_options(stream_results=True).execute(
+        text(
+            "SELECT id, user_id, action, entity_type, entity_id, details, created_at "
+            f"FROM {name} ORDER BY created_at, id"
+        )
+    )
+
+    count = 0
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        for rows in result.mappings().partitions(EXPORT_BATCH_SIZE):
+            for row in rows:
+                record = dict(row)
+                record["created_at"] = (
+                    record["created_at"].isoformat() if record["created_at"] else None
+                )
+                f.write(json.dumps(record) + "\n")
+                count += 1
+
+    # Only a complete export replaces the final file
+    os.replace(tmp_path, final_path)
+    return final_path, count
+
+
+def archive_partitions(
+    engine, retention_months, archive_dir, today=None, dry_run=False
+):
+    """
+    Detach, export and drop partitions older than the retention window.
+
+    A partition is expired when its whole month ends before the start of
+    the month retention_months ago. Each step is its own transaction, so
+    a failed export leaves the detached table in place and the next run
+    picks it up again.
+
+    Args:
+        engine: SQLAlchemy engine
+        retention_months: Number of whole months to keep in audit_logs
+        archive_dir: Directory for the compressed JSONL exports
+        today: Reference date (defaults to today, UTC)
+        dry_run: Only report what would be archived
+
+    Returns:
+        List of dicts describing each archived (or would-be archived) partition
+    """
+    with engine.connect() as conn:
+        if not is_partitioned(conn):
+            return []
+        partitions = list_partitions(conn)
+
+    cutoff = add_months(
+        month_start(today or datetime.utcnow().date()), -retention_months
+    )
+    expired = [p for p in partitions if p[1] < cutoff]
+
+    archived = []
+    for name, month, attached in expired:
+        if dry_run:
+            archived.append(
+                {"partition": name, "month": month.isoformat(), "dry_run": True}
+            )
+            continue
+
+        if attached:
+            with engine.begin() as conn:
+                conn.execute(
+                    text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}")
+                )
+            logger.info(f"Detached audit log partition {name}")
+
+        with engine.begin() as conn:
+            path, count = _export_partition(conn, name, archive_dir)
+            conn.execute(text(f"DROP TABLE {name}"))
+
+        logger.info(f"Archived {count} audit log rows from {name} to {path}")
+        archived.append(
+            {"partition": name, "month": month.isoformat(), "rows": count, "path": path}
+        )
+
+    return archived
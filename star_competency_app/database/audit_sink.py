@@ -0,0 +1,243 @@
+# star_competency_app/database/audit_sink.py
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from star_competency_app.database.models import AuditLog
+from star_competency_app.database.user_stats import (
+    apply_user_stats_deltas,
+    audit_stats_deltas,
+)
+
+logger = logging.getLogger(__name__)
+
+# Columns every buffered entry carries, so batches form one multi-row INSERT
+AUDIT_COLUMNS = (
+    "user_id",
+    "action",
+    "entity_type",
+    "entity_id",
+    "details",
+    "created_at",
+)
+
+
+class AuditLogBuffer:
+    """
+    In-process buffered sink for audit log events.
+
+    Events are queued by log_audit() and written by a background thread in
+    multi-row INSERTs whenever batch_size events are pending or
+    flush_interval seconds have passed. Events that cannot be written (the
+    database is down, or the process is shutting down) are appended to a
+    JSONL spool file and replayed on the next start.
+    """
+
+    def __init__(
+        self,
+        db_manager,
+        batch_size=100,
+        flush_interval=2.0,
+        max_queue=10000,
+        spool_path=None,
+    ):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spool_path = spool_path
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stopping = threading.Event()
+
+        self._enqueued = 0
+        self._written = 0
+        self._batches = 0
+        self._spooled = 0
+        self._overflow_writes = 0
+        self._failed_batches = 0
+        self._last_flush_at = None
+        self._last_batch_size = 0
+
+    def _ensure_started(self):
+        """Start the writer thread lazily, once per (forked) process."""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="audit-log-writer", daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.close)
+
+    def enqueue(self, user_id, action, entity_type, entity_id=None, details=None):
+        """Queue an audit event; the timestamp is taken now, not at flush time."""
+        entry = {
+            "user_id": user_id,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "details": details,
+            "created_at": datetime.utcnow(),
+        }
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+            with self._lock:
+                self._enqueued += 1
+        except queue.Full:
+            # Apply backpressure by writing this event synchronously
+            with self._lock:
+                self._overflow_writes += 1
+            self._write_batch([entry])
+
+    def _drain(self, limit):
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        # On the writer thread, so the request that started it doesn't wait
+        try:
+            self.replay_spool()
+        except Exception as e:
+            logger.error(f"Failed to replay spooled audit log entries: {e}")
+        while not self._stopping.is_set():
+            deadline = time.monotonic() + self.flush_interval
+            batch = []
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            if batch:
+                self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        """
+        Write a batch in a single multi-row INSERT, spooling it on failure.
+
+        The batch's per-user AI usage and activity are added to user_stats
+        in the same transaction. It runs on a connection of its own, never
+        the request's shared session, so an overflow write that fails
+        inside a request can't roll back the request's own work.
+        """
+        with self._write_lock:
+            try:
+                with self.db_manager.engine.begin() as conn:
+                    conn.execute(insert(AuditLog).values(batch))
+                    # AI usage and last-activity counters, in the same
+                    # transaction; no content changed, so no coverage refresh
+                    apply_user_stats_deltas(
+                        conn, audit_stats_deltas(batch), content_changed=False
+                    )
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} audit log entries: {e}")
+                with self._lock:
+                    self._failed_batches += 1
+                self._spool(batch)
+                return
+
+        with self._lock:
+            self._written += len(batch)
+            self._batches += 1
+            self._last_batch_size = len(batch)
+            self._last_flush_at = datetime.utcnow()
+
+    def flush(self):
+        """Synchronously write everything currently queued."""
+        while True:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                return
+            self._write_batch(batch)
+
+    def close(self, timeout=5.0):
+        """Stop the writer thread and flush remaining events (spooling on failure)."""
+        if self._pid != os.getpid():
+            return
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def _spool(self, batch):
+        if not self.spool_path:
+            logger.error(f"Dropping {len(batch)} audit log entries (no spool path)")
+            return
+        try:
+            os.makedirs(os.path.dirname(self.spool_path) or ".", exist_ok=True)
+            with open(self.spool_path, "a", encoding="utf-8") as f:
+                for entry in batch:
+                    record = dict(entry, created_at=entry["created_at"].isoformat())
+                    f.write(json.dumps(record) + "\n")
+            with self._lock:
+                self._spooled += len(batch)
+        except OSError as e:
+            logger.error(f"Failed to spool {len(batch)} audit log entries: {e}")
+
+    def replay_spool(self):
+        """Write spooled events back to the database and remove the spool file."""
+        if not self.spool_path or not os.path.exists(self.spool_path):
+            return 0
+
+        # Rename first so concurrent workers don't replay the same file twice
+        claimed = f"{self.spool_path}.{os.getpid()}.replay"
+        try:
+            os.replace(self.spool_path, claimed)
+        except OSError:
+            return 0
+
+        entries = []
+        with open(claimed, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    record["created_at"] = datetime.fromisoformat(record["created_at"])
+                    entries.append({c: record.get(c) for c in AUDIT_COLUMNS})
+
+        for start in range(0, len(entries), self.batch_size):
+            self._write_batch(entries[start : start + self.batch_size])
+        os.remove(claimed)
+
+        logger.info(f"Replayed {len(entries)} spooled audit log entries")
+        return len(entries)
+
+    def stats(self):
+        """Return queue depth and throughput counters."""
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "enqueued": self._enqueued,
+                "written": self._written,
+                "batches": self._batches,
+                "last_batch_size": self._last_batch_size,
+                "last_flush_at": (
+                    self._last_flush_at.isoformat() if self._last_flush_at else None
+                ),
+                "failed_batches": self._failed_batches,
+                "spooled": self._spooled,
+                "overflow_writes": self._overflow_writes,
+                "writer_alive": bool(self._thread and self._thread.is_alive()),
+            }
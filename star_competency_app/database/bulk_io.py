@@ -0,0 +1,286 @@
+# star_competency_app/database/bulk_io.py
+"""
+Streaming CSV / JSONL import and export of STAR stories and case studies.
+
+Imports read the upload one record at a time, validate each row with the
+same rules as the web forms, and write valid rows in batches: COPY on
+PostgreSQL, batched executemany INSERTs elsewhere. The whole import runs in one
+transaction, so a database error leaves nothing half-imported; rows that
+fail validation are skipped and reported.
+
+Exports stream rows from a server-side cursor and yield encoded chunks, so
+neither side ever holds a user's full history in memory.
+"""
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+
+from sqlalchemy import insert, select
+
+from star_competency_app.database.models import CaseStudy, Competency, STARStory
+from star_competency_app.utils.validation_utils import (
+    validate_case_study,
+    validate_star_story,
+)
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "jsonl")
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+}
+
+# Validation errors kept for the import report; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+BULK_ENTITIES = {
+    "star_story": {
+        "model": STARStory,
+        "fields": ("title", "competency_id", "situation", "task", "action", "result"),
+        "validate": validate_star_story,
+        "export_columns": (
+            "id",
+            "title",
+            "competency_id",
+            "situation",
+            "task",
+            "action",
+            "result",
+            "created_at",
+            "updated_at",
+        ),
+    },
+    "case_study": {
+        "model": CaseStudy,
+        "fields": ("title", "description"),
+        "validate": validate_case_study,
+        "export_columns": ("id", "title", "description", "created_at", "updated_at"),
+    },
+}
+
+
+class ImportResult:
+    """Outcome of a bulk import."""
+
+    __slots__ = ("kind", "inserted", "failed", "errors")
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.inserted = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, line, messages):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "errors": messages})
+
+    def to_dict(self):
+        return {
+            "kind": self.kind,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+    def __repr__(self):
+        return (
+            f"<ImportResult {self.kind} inserted={self.inserted} failed={self.failed}>"
+        )
+
+
+def detect_format(filename, default="csv"):
+    """Pick csv or jsonl from a file name's extension."""
+    name = (filename or "").lower()
+    if name.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    if name.endswith(".csv"):
+        return "csv"
+    return default
+
+
+# --- Reading ---------------------------------------------------------------
+
+
+def iter_records(stream, fmt):
+    """
+    Yield (line_number, record) pairs from a text stream.
+
+    A record that cannot be parsed is yielded as (line_number, None) so the
+    caller can report it and carry on.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == "jsonl":
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield line_number, None
+                continue
+            yield line_number, record if isinstance(record, dict) else None
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def _clean_record(record, fields):
+    """Keep the importable fields, dropping empty values."""
+    cleaned = {}
+    for field in fields:
+        value = record.get(field)
+        if isinstance(value, str) and field == "competency_id":
+            value = value.strip()
+        if value not in (None, ""):
+            cleaned[field] = value
+    return cleaned
+
+
+# --- Writing ---------------------------------------------------------------
+
+
+def _copy_rows(conn, table, columns, rows):
+    """Load rows into a PostgreSQL table with COPY ... FROM STDIN."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(
+            [
+                row[c].isoformat() if isinstance(row[c], datetime) else row[c]
+                for c in columns
+            ]
+        )
+    buffer.seek(0)
+
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def import_records(conn, kind, user_id, records, batch_size=1000):
+    """
+    Validate and insert records for one user.
+
+    Args:
+        conn: SQLAlchemy connection with an open transaction
+        kind: "star_story" or "case_study"
+        user_id: Owner of the imported rows
+        records: Iterable of (line_number, record) pairs, see iter_records()
+        batch_size: Rows written per COPY / INSERT
+
+    Returns:
+        ImportResult
+    """
+    entity = BULK_ENTITIES[kind]
+    model, fields, validate = entity["model"], entity["fields"], entity["validate"]
+    table = model.__table__
+    columns = ("user_id", *fields, "created_at", "updated_at")
+    use_copy = conn.dialect.name == "postgresql"
+
+    known_competencies = None
+    if "competency_id" in fields:
+        known_competencies = set(conn.execute(select(Competency.id)).scalars())
+
+    result = ImportResult(kind)
+    batch = []
+
+    def flush():
+        if use_copy:
+            _copy_rows(conn, table.name, columns, batch)
+        else:
+            # executemany of one cached INSERT; compiling a fresh multi-row
+            # VALUES clause per batch costs more than the insert itself
+            conn.execute(insert(table), batch)
+        result.inserted += len(batch)
+        batch.clear()
+
+    for line_number, record in records:
+        if record is None:
+            result.add_error(line_number, {"_record": ["Could not parse record."]})
+            continue
+
+        is_valid, data = validate(_clean_record(record, fields))
+        if not is_valid:
+            result.add_error(line_number, data)
+            continue
+
+        competency_id = data.get("competency_id")
+        if known_competencies is not None and competency_id is not None:
+            if competency_id not in known_competencies:
+                result.add_error(
+                    line_number, {"competency_id": ["Unknown competency."]}
+                )
+                continue
+
+        now = datetime.utcnow()
+        row = {column: data.get(column) for column in fields}
+        row.update(user_id=user_id, created_at=now, updated_at=now)
+        batch.append(row)
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    return result
+
+
+# --- Export ----------------------------------------------------------------
+
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def iter_export(session, kind, user_id, fmt, batch_size=1000):
+    """
+    Yield a user's rows as encoded CSV or JSONL chunks, oldest first.
+
+    Rows are fetched batch_size at a time through a server-side cursor
+    (yield_per), and each batch is emitted as one chunk.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    entity = BULK_ENTITIES[kind]
+    model, columns = entity["model"], entity["export_columns"]
+    stmt = (
+        select(*[getattr(model, c) for c in columns])
+        .where(model.user_id == user_id)
+        .order_by(model.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(columns)
+
+    for partition in session.execute(stmt).partitions():
+        for row in partition:
+            values = [_export_value(v) for v in row]
+            if writer:
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(columns, values))))
+                buffer.write("\n")
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
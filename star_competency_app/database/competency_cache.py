@@ -0,0 +1,115 @@
+# star_competency_app/database/competency_cache.py
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CompetencyRecord(NamedTuple):
+    """Immutable, session-independent copy of a Competency row."""
+
+    id: int
+    name: str
+    description: Optional[str]
+    category: Optional[str]
+    level: Optional[int]
+    expectations: Optional[Dict[str, Any]]
+
+    @classmethod
+    def from_model(cls, competency):
+        return cls(
+            id=competency.id,
+            name=competency.name,
+            description=competency.description,
+            category=competency.category,
+            level=competency.level,
+            expectations=copy.deepcopy(competency.expectations),
+        )
+
+
+class CompetencySnapshot:
+    """
+    A versioned, read-only view of the whole competency catalog.
+
+    ``version`` increases each time this process loads different content;
+    ``fingerprint`` is a content hash that is identical across workers.
+    """
+
+    def __init__(self, records: Iterable[CompetencyRecord], version: int):
+        self.items = tuple(sorted(records, key=lambda r: r.id))
+        self.by_id = MappingProxyType({r.id: r for r in self.items})
+        self.by_name = MappingProxyType({r.name: r for r in self.items})
+        self.version = version
+        self.fingerprint = self._fingerprint(self.items)
+        self.loaded_at = time.monotonic()
+
+    @staticmethod
+    def _fingerprint(items):
+        payload = json.dumps([r._asdict() for r in items], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    def __len__(self):
+        return len(self.items)
+
+    def __repr__(self):
+        return f"<CompetencySnapshot v{self.version} ({len(self.items)} competencies)>"
+
+
+class CompetencyCatalogCache:
+    """
+    In-process cache of the competency catalog.
+
+    The catalog only changes through DatabaseManager's competency write
+    methods, which call invalidate(). The TTL is a safety net for changes
+    made by other worker processes.
+    """
+
+    def __init__(
+        self, loader: Callable[[], Iterable[CompetencyRecord]], ttl: int = 300
+    ):
+        self._loader = loader
+        self._ttl = ttl
+        self._snapshot = None
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, snapshot):
+        return (
+            snapshot is not None and time.monotonic() - snapshot.loaded_at < self._ttl
+        )
+
+    def get(self) -> CompetencySnapshot:
+        """Return the current snapshot, reloading it if missing or expired."""
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            return snapshot
+
+        with self._lock:
+            # Another thread may have reloaded while we waited for the lock
+            snapshot = self._snapshot
+            if self._is_fresh(snapshot):
+                return snapshot
+
+            records = list(self._loader())
+            new_snapshot = CompetencySnapshot(records, self._version + 1)
+            if (
+                snapshot is not None
+                and snapshot.fingerprint == new_snapshot.fingerprint
+            ):
+                # Content unchanged: keep the version number stable
+                new_snapshot.version = snapshot.version
+            self._version = new_snapshot.version
+            self._snapshot = new_snapshot
+            logger.debug(f"Loaded competency catalog {new_snapshot!r}")
+            return new_snapshot
+
+    def invalidate(self):
+        """Drop the current snapshot so the next get() reloads it."""
+        with self._lock:
+            self._snapshot = None
@@ -0,0 +1,203 @@
+# star_competency_app/database/coverage_summary.py
+"""
+Organisation-wide competency coverage, materialised in summary tables.
+
+Two layers are kept:
+
+- user_competency_coverage: story counts and AI score buckets per
+  (user, competency), recomputed only for users whose content changed since
+  the last refresh. Every story write bumps user_stats.updated_at, which is
+  what identifies those users.
+- competency_coverage_summary: one row per competency, rebuilt from the
+  per-user layer at the end of each refresh, so the admin analytics page
+  reads a few dozen rows regardless of organisation size.
+
+refresh_coverage_summary() runs from `db_maintenance.py refresh-coverage`
+on a schedule (and from the admin page on demand).
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, delete, func, insert, literal, select
+
+from star_competency_app.database.models import (
+    CompetencyCoverageSummary,
+    STARStory,
+    SummaryRefresh,
+    UserCompetencyCoverage,
+    UserStats,
+)
+
+logger = logging.getLogger(__name__)
+
+REFRESH_NAME = "competency_coverage"
+
+# AI scores are bucketed to the nearest whole point on a 1-5 scale
+SCORE_BUCKETS = (1, 2, 3, 4, 5)
+BUCKET_COLUMNS = tuple(f"score_{bucket}" for bucket in SCORE_BUCKETS)
+
+# Re-examine users changed slightly before the previous refresh started, so
+# transactions that were still open at that moment are not missed
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+def _bucket(score_column, bucket):
+    rounded = func.round(score_column)
+    if bucket == SCORE_BUCKETS[0]:
+        condition = rounded <= bucket
+    elif bucket == SCORE_BUCKETS[-1]:
+        condition = rounded >= bucket
+    else:
+        condition = rounded == bucket
+    return func.sum(case((condition, 1), else_=0))
+
+
+def _user_coverage_select(user_filter=None):
+    """Aggregate star_stories into user_competency_coverage rows."""
+    stmt = (
+        select(
+            STARStory.user_id,
+            STARStory.competency_id,
+            func.count(),
+            func.count(STARStory.ai_score),
+            func.coalesce(func.sum(STARStory.ai_score), 0),
+            *[_bucket(STARStory.ai_score, bucket) for bucket in SCORE_BUCKETS],
+        )
+        .where(STARStory.competency_id.isnot(None))
+        .group_by(STARStory.user_id, STARStory.competency_id)
+    )
+    if user_filter is not None:
+        stmt = stmt.where(user_filter)
+    return stmt
+
+
+def refresh_coverage_summary(conn, full=False):
+    """
+    Bring the coverage summary tables up to date.
+
+    Args:
+        conn: Connection with an open transaction
+        full: Recompute every user instead of only those changed since the
+            last refresh
+
+    Returns:
+        Dict with "full", "users" (users recomputed, None for a full
+        refresh) and "duration_ms"
+    """
+    started = time.monotonic()
+    refresh_started_at = datetime.utcnow()
+
+    state = conn.execute(
+        select(SummaryRefresh.watermark).where(SummaryRefresh.name == REFRESH_NAME)
+    ).first()
+    if state is None or state.watermark is None:
+        full = True
+
+    user_columns = [
+        "user_id",
+        "competency_id",
+        "story_count",
+        "scored_count",
+        "score_sum",
+        *BUCKET_COLUMNS,
+    ]
+
+    changed_users = None
+    if full:
+        conn.execute(delete(UserCompetencyCoverage))
+        conn.execute(
+            insert(UserCompetencyCoverage).from_select(
+                user_columns, _user_coverage_select()
+            )
+        )
+    else:
+        changed_users = list(
+            conn.execute(
+                select(UserStats.user_id).where(
+                    UserStats.updated_at >= state.watermark - WATERMARK_OVERLAP
+                )
+            ).scalars()
+        )
+        if changed_users:
+            conn.execute(
+                delete(UserCompetencyCoverage).where(
+                    UserCompetencyCoverage.user_id.in_(changed_users)
+                )
+            )
+            conn.execute(
+                insert(UserCompetencyCoverage).from_select(
+                    user_columns,
+                    _user_coverage_select(STARStory.user_id.in_(changed_users)),
+                )
+            )
+
+    # The per-competency layer is small; rebuild it from the per-user layer
+    conn.execute(delete(CompetencyCoverageSummary))
+    conn.execute(
+        insert(CompetencyCoverageSummary).from_select(
+            [
+                "competency_id",
+                "story_count",
+                "users_covered",
+                "scored_count",
+                "score_sum",
+                *BUCKET_COLUMNS,
+                "refreshed_at",
+            ],
+            select(
+                UserCompetencyCoverage.competency_id,
+                func.sum(UserCompetencyCoverage.story_count),
+                func.count(),
+                func.sum(UserCompetencyCoverage.scored_count),
+                func.sum(UserCompetencyCoverage.score_sum),
+                *[
+                    func.sum(UserCompetencyCoverage.__table__.c[column])
+                    for column in BUCKET_COLUMNS
+                ],
+                literal(refresh_started_at),
+            ).group_by(UserCompetencyCoverage.competency_id),
+        )
+    )
+
+    duration_ms = int((time.monotonic() - started) * 1000)
+    values = {
+        "watermark": refresh_started_at,
+        "refreshed_at": datetime.utcnow(),
+        "duration_ms": duration_ms,
+        "rows_refreshed": None if changed_users is None else len(changed_users),
+    }
+    if state is None:
+        conn.execute(insert(SummaryRefresh).values(name=REFRESH_NAME, **values))
+    else:
+        conn.execute(
+            SummaryRefresh.__table__.update()
+            .where(SummaryRefresh.name == REFRESH_NAME)
+            .values(**values)
+        )
+
+    logger.info(
+        f"Refreshed competency coverage summary "
+        f"({'full' if full else f'{len(changed_users)} changed users'}) "
+        f"in {duration_ms} ms"
+    )
+    return {
+        "full": full,
+        "users": None if full else len(changed_users),
+        "duration_ms": duration_ms,
+    }
+
+
+def load_coverage_summary(session):
+    """
+    Read the materialised summary.
+
+    Returns:
+        (dict of competency_id -> CompetencyCoverageSummary, SummaryRefresh
+        or None)
+    """
+    rows = {
+        row.competency_id: row for row in session.query(CompetencyCoverageSummary).all()
+    }
+    refresh = session.get(SummaryRefresh, REFRESH_NAME)
+    return rows, refresh
@@ -1,28 +1,132 @@
 import logging
+import time
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 
-from sqlalchemy import create_engine
+from flask import g, has_request_context
+from flask import session as flask_session
+from sqlalchemy import delete, event, func, inspect, or_, select, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import joinedload, scoped_session, sessionmaker
+from sqlalchemy.orm.attributes import flag_modified
 
 from star_competency_app.config.settings import get_settings
+from star_competency_app.database.ai_response_store import (
+    load_response,
+    purge_responses,
+    response_store_stats,
+    save_response,
+)
+from star_competency_app.database.audit_partitions import (
+    archive_partitions,
+    ensure_partitions,
+)
+from star_competency_app.database.audit_sink import AuditLogBuffer
+from star_competency_app.database.bulk_io import (
+    import_records,
+    iter_export,
+    iter_records,
+)
+from star_competency_app.database.competency_cache import (
+    CompetencyCatalogCache,
+    CompetencyRecord,
+)
+from star_competency_app.database.coverage_summary import (
+    SCORE_BUCKETS,
+    load_coverage_summary,
+    refresh_coverage_summary,
+)
+from star_competency_app.database.engine import get_engine, get_pool_stats
+from star_competency_app.database.identity_cache import UserIdentity, UserIdentityCache
+from star_competency_app.database.job_queue import (
+    claim_jobs,
+    complete_job,
+    enqueue_job,
+    fail_job,
+    purge_finished_jobs,
+    report_progress,
+)
 from star_competency_app.database.models import (
     AuditLog,
     Base,
     CaseStudy,
+    CaseStudyAnalysis,
     Competency,
+    Job,
+    RescoreBatch,
     STARStory,
+    STARStoryFeedback,
     User,
+    UserStats,
+)
+from star_competency_app.database.pagination import (
+    TOTAL_COUNT_CAP,
+    Page,
+    encode_cursor,
+    keyset_filter,
+)
+from star_competency_app.database.query_stats import init_query_stats, instrument_engine
+from star_competency_app.database.read_models import (
+    CaseStudyListRow,
+    StoryListRow,
+    UserDirectoryRow,
+)
+from star_competency_app.database.replicas import ReplicaRouter
+from star_competency_app.database.rescore_checkpoint import (
+    load_batches,
+    mark_failed,
+    mark_submitted,
+    record_batch,
+)
+from star_competency_app.database.search import (
+    ensure_sqlite_fts,
+    search_entities,
+    suggest_entity_titles,
+)
+from star_competency_app.database.user_stats import (
+    apply_user_stats_deltas,
+    audit_stats_deltas,
+    bump_user_stats,
+    empty_user_stats,
+    recompute_user_stats,
 )
 
 logger = logging.getLogger(__name__)
 
+# Flask session key holding the time until which reads go to the primary
+PRIMARY_PIN_KEY = "_db_primary_until"
+
+
+def _touch(entity, edited, now):
+    """
+    Set updated_at for user edits only.
+
+    updated_at orders story and case study lists, so storing AI output
+    (which has its own feedback_at / analysis_at) must leave it alone. Its
+    onupdate default would bump it on any UPDATE that omits it, so an
+    unedited row writes its current value back.
+    """
+    if edited:
+        entity.updated_at = now
+    else:
+        flag_modified(entity, "updated_at")
+
+
+def _prefix_pattern(prefix):
+    """LIKE pattern matching values that start with prefix, wildcards escaped."""
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
 
 class DatabaseManager:
     def __init__(self, db_url=None):
         settings = get_settings()
         self.db_url = db_url or settings.DATABASE_URL
-        self.engine = create_engine(self.db_url)
+        # Engines are shared per process so every manager reuses one pool
+        self.engine = get_engine(self.db_url)
+        # Statement timing for the slow-query log and per-request stats
+        instrument_engine(self.engine)
 
         # Configure session with additional options to help with detached instances
         self.session_factory = sessionmaker(
@@ -35,22 +139,331 @@ class DatabaseManager:
         # Thread-local sessions
         self.Session = scoped_session(self.session_factory)
 
+        # Opt-in: share one session per Flask request (see init_app)
+        self.request_sessions = settings.DB_REQUEST_SESSION
+
+        # Optional read replicas for read_session_scope()
+        self.replica_router = None
+        replica_urls = [
+            url.strip()
+            for url in settings.DATABASE_REPLICA_URLS.split(",")
+            if url.strip()
+        ]
+        if replica_urls:
+            self.replica_router = ReplicaRouter(
+                replica_urls, retry_interval=settings.DB_REPLICA_RETRY_INTERVAL
+            )
+            for replica_engine in self.replica_router.engines:
+                instrument_engine(replica_engine)
+            # Any flushed write pins the writing user to the primary for a while
+            event.listen(self.session_factory, "after_flush", self._pin_to_primary)
+
+        # Read-mostly competency catalog, invalidated by the competency writers
+        self.competency_cache = CompetencyCatalogCache(
+            self._load_competency_records, ttl=settings.COMPETENCY_CACHE_TTL
+        )
+
+        # Compact user records for Flask-Login, invalidated by the user writers
+        self.identity_cache = UserIdentityCache(
+            self._load_user_identity,
+            maxsize=settings.USER_CACHE_SIZE,
+            ttl=settings.USER_CACHE_TTL,
+        )
+
+        # Audit events are written in background batches unless disabled
+        self.audit_buffer = None
+        if settings.AUDIT_BUFFER_ENABLED:
+            self.audit_buffer = AuditLogBuffer(
+                self,
+                batch_size=settings.AUDIT_BATCH_SIZE,
+                flush_interval=settings.AUDIT_FLUSH_INTERVAL,
+                max_queue=settings.AUDIT_QUEUE_MAX,
+                spool_path=settings.AUDIT_SPOOL_PATH,
+            )
+
     def create_tables(self):
         """Create all tables in the database."""
         try:
+            inspector = inspect(self.engine)
+            had_user_stats = inspector.has_table(UserStats.__tablename__)
             Base.metadata.create_all(self.engine)
+            # SQLite FTS5 search tables; PostgreSQL gets search columns via migration 0003
+            with self.engine.begin() as conn:
+                ensure_sqlite_fts(conn)
+                # Counters for data that predates the user_stats table
+                if not had_user_stats:
+                    recompute_user_stats(conn)
+            # The coverage summary is built by migration 0006, which can run
+            # only after adding star_stories.ai_score to older databases
             logger.info("Database tables created successfully")
         except Exception as e:
             logger.error(f"Failed to create database tables: {e}")
             raise
 
+    def ensure_audit_partitions(self):
+        """Create upcoming audit_logs partitions; a no-op unless it is partitioned."""
+        try:
+            return ensure_partitions(
+                self.engine, months_ahead=get_settings().AUDIT_PARTITION_MONTHS_AHEAD
+            )
+        except Exception as e:
+            # Rows still land in the default partition, so don't block startup
+            logger.error(f"Failed to ensure audit log partitions: {e}")
+            return []
+
+    def archive_audit_logs(
+        self, retention_months=None, archive_dir=None, dry_run=False
+    ):
+        """
+        Detach, export and drop audit_logs partitions past the retention window.
+
+        Args:
+            retention_months: Months to keep (defaults to AUDIT_RETENTION_MONTHS)
+            archive_dir: Export directory (defaults to AUDIT_ARCHIVE_DIR)
+            dry_run: Only report what would be archived
+
+        Returns:
+            List of dicts describing each archived partition
+        """
+        settings = get_settings()
+        return archive_partitions(
+            self.engine,
+            retention_months=(
+                retention_months
+                if retention_months is not None
+                else settings.AUDIT_RETENTION_MONTHS
+            ),
+            archive_dir=archive_dir or settings.AUDIT_ARCHIVE_DIR,
+            dry_run=dry_run,
+        )
+
+    def get_pool_stats(self):
+        """Return live connection pool statistics for this manager's engine."""
+        return get_pool_stats(self.engine)
+
+    def get_cache_stats(self):
+        """Return statistics for the in-process identity and competency caches."""
+        catalog = self.competency_cache.get()
+        return {
+            "user_identity": self.identity_cache.stats(),
+            "competency_catalog": {
+                "version": catalog.version,
+                "fingerprint": catalog.fingerprint,
+                "size": len(catalog),
+            },
+        }
+
+    def get_audit_buffer_stats(self):
+        """Return audit buffer queue depth and throughput counters, if enabled."""
+        if self.audit_buffer is None:
+            return {"enabled": False}
+        return dict(self.audit_buffer.stats(), enabled=True)
+
+    def init_app(self, app):
+        """
+        Bind the request-scoped unit of work to a Flask app.
+
+        When DB_REQUEST_SESSION is enabled, every session_scope() inside a
+        request shares one session: repeated lookups by primary key come
+        from its identity map, and all writes are committed once after the
+        view returns. The session is closed at request teardown.
+
+        It also instruments the engine with per-request SQL statistics.
+        """
+        init_query_stats(app, self.engine)
+        app.after_request(self._commit_request_session)
+        app.teardown_request(self._close_request_session)
+
+    def _request_session(self, create=True):
+        """Return the current request's session, creating it if asked."""
+        sessions = g.setdefault("_db_sessions", {})
+        session = sessions.get(id(self))
+        if session is None and create:
+            session = sessions[id(self)] = self.session_factory()
+        return session
+
+    def _commit_request_session(self, response):
+        """Commit the request's unit of work before the response is sent."""
+        session = self._request_session(create=False)
+        if session is not None:
+            try:
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Failed to commit request session: {e}")
+                raise
+        # Writes from here on (a streamed body) would never be committed by
+        # the request; they get session_scope()'s own committing session
+        g.setdefault("_db_committed", set()).add(id(self))
+        return response
+
+    def _close_request_session(self, exc=None):
+        """Roll back anything uncommitted (e.g. after an error) and close."""
+        sessions = g.pop("_db_sessions", {})
+        session = sessions.get(id(self))
+        if session is not None:
+            if exc is not None:
+                session.rollback()
+            session.close()
+
+    def _in_request_session(self):
+        return (
+            self.request_sessions
+            and has_request_context()
+            and id(self) not in g.get("_db_committed", ())
+        )
+
+    def after_commit(self, callback):
+        """
+        Run callback once the current writes are committed.
+
+        Inside a request-scoped session that is at the end of the request;
+        otherwise the surrounding session_scope has already committed, so
+        the callback runs immediately.
+        """
+        if self._in_request_session():
+            session = self._request_session()
+            event.listen(session, "after_commit", lambda s: callback(), once=True)
+        else:
+            callback()
+
+    def _set_timeouts(self, session, statement_timeout_ms=None, lock_timeout_ms=None):
+        """Override the connection timeouts for the current transaction (PostgreSQL)."""
+        if self.engine.dialect.name != "postgresql":
+            return
+        if statement_timeout_ms is not None:
+            session.execute(
+                text(f"SET LOCAL statement_timeout = {int(statement_timeout_ms)}")
+            )
+        if lock_timeout_ms is not None:
+            session.execute(text(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}"))
+
+    def pin_reads_to_primary(self, seconds=None):
+        """
+        Send this user's reads to the primary for a while.
+
+        Session flushes pin automatically; call this after writes made
+        another way (e.g. a Core connection) that the user should see next.
+        The pin lives in the session cookie, so a streamed response must
+        pin before it starts, for long enough to cover the stream. A no-op
+        without replicas or outside a request.
+
+        Args:
+            seconds: How long (default: DB_READ_YOUR_WRITES_SECONDS)
+        """
+        if self.replica_router is not None and has_request_context():
+            if seconds is None:
+                seconds = get_settings().DB_READ_YOUR_WRITES_SECONDS
+            flask_session[PRIMARY_PIN_KEY] = time.time() + seconds
+
+    def _pin_to_primary(self, session, flush_context):
+        self.pin_reads_to_primary()
+
+    def _pinned_to_primary(self):
+        if not has_request_context():
+            return False
+        return flask_session.get(PRIMARY_PIN_KEY, 0) > time.time()
+
     @contextmanager
-    def session_scope(self):
+    def read_session_scope(self):
+        """
+        Provide a session for read-only operations, on a replica when possible.
+
+        Falls back to session_scope() on the primary when no replicas are
+        configured, inside a shared request session, for a short window
+        after the current user's own writes (read-your-writes), or when no
+        replica can hand out a connection.
+        """
+        if (
+            self.replica_router is None
+            or self._in_request_session()
+            or self._pinned_to_primary()
+        ):
+            with self.session_scope() as session:
+                yield session
+            return
+
+        session, tried = None, []
+        while session is None:
+            replica = self.replica_router.choose(exclude=tried)
+            if replica is None:
+                break
+            tried.append(replica)
+            candidate = self.session_factory(bind=replica)
+            try:
+                # Check out a connection now so a dead replica fails over here
+                candidate.connection()
+                session = candidate
+            except OperationalError as e:
+                candidate.close()
+                self.replica_router.mark_down(replica, e)
+
+        if session is None:
+            with self.session_scope() as session:
+                yield session
+            return
+
+        try:
+            yield session
+        except OperationalError as e:
+            session.rollback()
+            self.replica_router.mark_down(session.get_bind(), e)
+            raise
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Database session error: {e}")
+            raise
+        finally:
+            # Read-only: closing ends the transaction without expiring the
+            # objects handed to the caller, as a rollback would
+            session.close()
+
+    def get_replica_status(self):
+        """Return replica health, or an empty list when none are configured."""
+        return self.replica_router.status() if self.replica_router else []
+
+    @contextmanager
+    def session_scope(self, statement_timeout_ms=None, lock_timeout_ms=None):
         """
         Provide a transactional scope around operations.
+
+        Inside a request with DB_REQUEST_SESSION enabled this yields the
+        shared request session and only flushes; the commit happens once
+        when the request finishes.
+
+        Args:
+            statement_timeout_ms: Per-call statement_timeout overriding
+                DB_STATEMENT_TIMEOUT_MS (PostgreSQL only)
+            lock_timeout_ms: Per-call lock_timeout overriding DB_LOCK_TIMEOUT_MS
         """
+        overrides = statement_timeout_ms is not None or lock_timeout_ms is not None
+
+        if self._in_request_session():
+            session = self._request_session()
+            try:
+                if overrides:
+                    self._set_timeouts(session, statement_timeout_ms, lock_timeout_ms)
+                yield session
+                session.flush()
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Database session error: {e}")
+                raise
+            finally:
+                if overrides and session.in_transaction():
+                    # The request transaction continues; restore the defaults
+                    settings = get_settings()
+                    self._set_timeouts(
+                        session,
+                        settings.DB_STATEMENT_TIMEOUT_MS,
+                        settings.DB_LOCK_TIMEOUT_MS,
+                    )
+            return
+
         session = self.Session()
         try:
+            if overrides:
+                self._set_timeouts(session, statement_timeout_ms, lock_timeout_ms)
             yield session
             session.commit()
         except Exception as e:
@@ -63,8 +476,56 @@ class DatabaseManager:
             # This removes the session from the registry
             self.Session.remove()
 
+    def _build_query(
+        self,
+        session,
+        model_class,
+        filters=None,
+        relationships=None,
+        order_by=None,
+        row_type=None,
+    ):
+        """
+        Build a query with filters, eager loading and ordering applied.
+
+        When row_type is given (see database/read_models.py) only its
+        columns are selected and relationships are ignored.
+        """
+        if row_type is not None:
+            query = session.query(*row_type.columns()).select_from(model_class)
+            for rel in row_type.outerjoins():
+                query = query.outerjoin(rel)
+            relationships = None
+        else:
+            query = session.query(model_class)
+
+        # Apply filters
+        if filters:
+            for filter_condition in filters:
+                query = query.filter(filter_condition)
+
+        # Apply eager loading
+        if relationships:
+            for rel in relationships:
+                query = query.options(joinedload(rel))
+
+        # Apply ordering
+        if order_by is not None:
+            query = query.order_by(order_by)
+
+        return query
+
     def _load_objects_with_relationships(
-        self, model_class, filters=None, relationships=None, order_by=None, limit=None
+        self,
+        model_class,
+        filters=None,
+        relationships=None,
+        order_by=None,
+        limit=None,
+        keyset_column=None,
+        cursor=None,
+        with_total=False,
+        row_type=None,
     ):
         """
         Load objects with specified relationships.
@@ -75,30 +536,105 @@ class DatabaseManager:
             relationships: List of relationship attributes to eager load
             order_by: Optional order by clause
             limit: Optional limit on results
+            keyset_column: Optional timestamp column to paginate on; when set,
+                results are ordered by (keyset_column, id) descending and a
+                Page is returned instead of a list
+            cursor: Cursor from a previous Page to continue after
+            with_total: Also count matching rows (capped at TOTAL_COUNT_CAP)
+            row_type: Optional read-model class; selects only its columns
+                and returns instances of it instead of ORM objects
         """
-        with self.session_scope() as session:
-            query = session.query(model_class)
-
-            # Apply filters
-            if filters:
-                for filter_condition in filters:
-                    query = query.filter(filter_condition)
-
-            # Apply eager loading
-            if relationships:
-                for rel in relationships:
-                    query = query.options(joinedload(rel))
+        if keyset_column is not None:
+            return self._load_page(
+                model_class,
+                keyset_column,
+                filters=filters,
+                relationships=relationships,
+                limit=limit or 20,
+                cursor=cursor,
+                with_total=with_total,
+                row_type=row_type,
+            )
 
-            # Apply ordering
-            if order_by:
-                query = query.order_by(order_by)
+        with self.read_session_scope() as session:
+            query = self._build_query(
+                session, model_class, filters, relationships, order_by, row_type
+            )
 
             # Apply limit
             if limit:
                 query = query.limit(limit)
 
+            if row_type is not None:
+                return [row_type.from_row(row) for row in query]
             return query.all()
 
+    def _load_page(
+        self,
+        model_class,
+        keyset_column,
+        filters=None,
+        relationships=None,
+        limit=20,
+        cursor=None,
+        with_total=False,
+        row_type=None,
+        descending=True,
+    ):
+        """
+        Load one page of objects using keyset pagination on (column, id).
+
+        The cost of a page depends only on its size, not on how far into
+        the result set the cursor points. Pages run newest first unless
+        descending is False.
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        id_column = model_class.id
+        page_filters = list(filters or [])
+        if cursor:
+            page_filters.append(
+                keyset_filter(keyset_column, id_column, cursor, descending=descending)
+            )
+        if descending:
+            ordering = (keyset_column.desc(), id_column.desc())
+        else:
+            ordering = (keyset_column.asc(), id_column.asc())
+
+        with self.read_session_scope() as session:
+            query = self._build_query(
+                session, model_class, page_filters, relationships, row_type=row_type
+            ).order_by(*ordering)
+
+            # Fetch one extra row to find out whether another page exists
+            rows = query.limit(limit + 1).all()
+            if row_type is not None:
+                rows = [row_type.from_row(row) for row in rows]
+            items = rows[:limit]
+
+            next_cursor = None
+            if len(rows) > limit:
+                last = items[-1]
+                next_cursor = encode_cursor(getattr(last, keyset_column.key), last.id)
+
+            total = None
+            total_capped = False
+            if with_total:
+                capped = (
+                    self._build_query(session, model_class, filters)
+                    .with_entities(id_column)
+                    .limit(TOTAL_COUNT_CAP + 1)
+                    .subquery()
+                )
+                total = session.execute(
+                    select(func.count()).select_from(capped)
+                ).scalar()
+                if total > TOTAL_COUNT_CAP:
+                    total, total_capped = TOTAL_COUNT_CAP, True
+
+            return Page(items, next_cursor, total, total_capped)
+
     def refresh_object(self, obj, relationships=None):
         """
         Refresh a potentially detached object with a new session.
@@ -130,13 +666,27 @@ class DatabaseManager:
 
     def get_user_by_azure_id(self, azure_id: str):
         """Get a user by their Azure ID."""
-        with self.session_scope() as session:
+        with self.read_session_scope() as session:
             return session.query(User).filter(User.azure_id == azure_id).first()
 
     def get_user_by_id(self, user_id: int):
         """Get a user by their ID."""
+        with self.read_session_scope() as session:
+            return session.get(User, user_id)
+
+    def _load_user_identity(self, user_id: int):
+        """Load a user as a compact UserIdentity record."""
         with self.session_scope() as session:
-            return session.query(User).filter(User.id == user_id).first()
+            user = session.get(User, user_id)
+            return UserIdentity.from_model(user) if user else None
+
+    def get_user_identity(self, user_id: int):
+        """Get a user's cached identity record, as used for current_user."""
+        return self.identity_cache.get(user_id)
+
+    def invalidate_user_identity(self, user_id: int):
+        """Drop a user's cached identity once the current writes are committed."""
+        self.after_commit(lambda: self.identity_cache.invalidate(user_id))
 
     def create_user(self, azure_id: str, email: str, display_name: str, is_admin=False):
         """Create a new user."""
@@ -152,16 +702,29 @@ class DatabaseManager:
             session.flush()  # Ensure ID is generated
             return user
 
+    def _load_competency_records(self):
+        """Load the competency catalog from the database as immutable records."""
+        with self.session_scope() as session:
+            return [
+                CompetencyRecord.from_model(comp)
+                for comp in session.query(Competency).order_by(Competency.id)
+            ]
+
+    def get_competency_catalog(self):
+        """Get the cached, versioned snapshot of the competency catalog."""
+        return self.competency_cache.get()
+
     def get_competencies(self):
         """Get all competencies."""
-        return self._load_objects_with_relationships(model_class=Competency)
+        return list(self.competency_cache.get().items)
 
     def get_competency_by_id(self, competency_id: int):
         """Get a competency by its ID."""
-        with self.session_scope() as session:
-            return (
-                session.query(Competency).filter(Competency.id == competency_id).first()
-            )
+        return self.competency_cache.get().by_id.get(competency_id)
+
+    def get_competency_by_name(self, name: str):
+        """Get a competency by its exact name."""
+        return self.competency_cache.get().by_name.get(name)
 
     def create_competency(self, name: str, description: str, category=None, level=None):
         """Create a new competency."""
@@ -171,16 +734,15 @@ class DatabaseManager:
             )
             session.add(comp)
             session.flush()  # Ensure ID is generated
-            return comp
+        self.after_commit(self.competency_cache.invalidate)
+        return comp
 
     def update_competency(
         self, competency_id: int, name=None, description=None, category=None, level=None
     ):
         """Update a competency."""
         with self.session_scope() as session:
-            comp = (
-                session.query(Competency).filter(Competency.id == competency_id).first()
-            )
+            comp = session.get(Competency, competency_id)
             if not comp:
                 return None
             if name is not None:
@@ -192,18 +754,18 @@ class DatabaseManager:
             if level is not None:
                 comp.level = level
             comp.updated_at = datetime.utcnow()
-            return comp
+        self.after_commit(self.competency_cache.invalidate)
+        return comp
 
     def delete_competency(self, competency_id: int) -> bool:
         """Delete a competency."""
         with self.session_scope() as session:
-            comp = (
-                session.query(Competency).filter(Competency.id == competency_id).first()
-            )
+            comp = session.get(Competency, competency_id)
             if not comp:
                 return False
             session.delete(comp)
-            return True
+        self.after_commit(self.competency_cache.invalidate)
+        return True
 
     def is_competency_in_use(self, competency_id: int) -> bool:
         """Check if a competency is in use."""
@@ -223,15 +785,37 @@ class DatabaseManager:
             relationships=[STARStory.competency],
         )
 
-    def get_star_story_by_id(self, story_id: int):
-        """Get a STAR story by its ID with eager loading."""
-        with self.session_scope() as session:
-            return (
-                session.query(STARStory)
-                .options(joinedload(STARStory.competency))
-                .filter(STARStory.id == story_id)
-                .first()
-            )
+    def get_star_stories_page(
+        self, user_id: int, cursor=None, limit=20, with_total=False
+    ) -> Page:
+        """Get a page of a user's STAR stories as StoryListRow objects."""
+        return self._load_objects_with_relationships(
+            model_class=STARStory,
+            filters=[STARStory.user_id == user_id],
+            keyset_column=STARStory.updated_at,
+            row_type=StoryListRow,
+            cursor=cursor,
+            limit=limit,
+            with_total=with_total,
+        )
+
+    def get_star_story_by_id(self, story_id: int, with_ai_output=False):
+        """
+        Get a STAR story by its ID with its competency eagerly loaded.
+
+        Args:
+            story_id: Story ID
+            with_ai_output: Also load the latest AI feedback (story.ai_feedback),
+                which only the detail view shows
+
+        Returns:
+            STARStory or None
+        """
+        options = [joinedload(STARStory.competency)]
+        if with_ai_output:
+            options.append(joinedload(STARStory.latest_feedback))
+        with self.read_session_scope() as session:
+            return session.get(STARStory, story_id, options=options)
 
     def create_star_story(
         self,
@@ -256,6 +840,7 @@ class DatabaseManager:
             )
             session.add(story)
             session.flush()  # Ensure ID is generated
+            bump_user_stats(session, user_id, star_stories=1)
             return story
 
     def update_star_story(
@@ -268,33 +853,129 @@ class DatabaseManager:
         action=None,
         result=None,
         ai_feedback=None,
+        ai_score=None,
     ):
-        """Update a STAR story."""
+        """Update a STAR story; new AI feedback is stored as its next version."""
         with self.session_scope() as session:
-            story = session.query(STARStory).filter(STARStory.id == story_id).first()
-            if not story:
-                return None
-            for field, value in [
-                ("title", title),
-                ("competency_id", competency_id),
-                ("situation", situation),
-                ("task", task),
-                ("action", action),
-                ("result", result),
-                ("ai_feedback", ai_feedback),
-            ]:
-                if value is not None:
-                    setattr(story, field, value)
-            story.updated_at = datetime.utcnow()
-            return story
+            return self._update_star_story(
+                session,
+                story_id,
+                title=title,
+                competency_id=competency_id,
+                situation=situation,
+                task=task,
+                action=action,
+                result=result,
+                ai_feedback=ai_feedback,
+                ai_score=ai_score,
+            )
+
+    def update_star_stories(self, updates, unchanged_since=None):
+        """
+        Apply several update_star_story() calls in one transaction.
+
+        Args:
+            updates: Dicts of update_star_story() keyword arguments, each
+                including story_id
+            unchanged_since: Skip stories edited after this time, e.g. while
+                an evaluation of their earlier text was in flight
+
+        Returns:
+            IDs of the stories updated (missing and skipped stories are not)
+        """
+        with self.session_scope() as session:
+            # Lock rows in a consistent order so concurrent batches can't deadlock
+            return [
+                update["story_id"]
+                for update in sorted(updates, key=lambda update: update["story_id"])
+                if self._update_star_story(
+                    session, **update, unchanged_since=unchanged_since
+                )
+                is not None
+            ]
+
+    def _update_star_story(
+        self,
+        session,
+        story_id,
+        ai_feedback=None,
+        ai_score=None,
+        unchanged_since=None,
+        **fields,
+    ):
+        story = session.get(
+            STARStory,
+            story_id,
+            with_for_update=True if ai_feedback is not None else None,
+        )
+        if not story:
+            return None
+        if unchanged_since is not None and story.updated_at > unchanged_since:
+            return None
+        now = datetime.utcnow()
+        edited = False
+        for field, value in fields.items():
+            if value is not None:
+                setattr(story, field, value)
+                edited = True
+        if ai_score is not None:
+            story.ai_score = ai_score
+        if ai_feedback is not None:
+            version = (story.ai_feedback_version or 0) + 1
+            session.add(
+                STARStoryFeedback(
+                    story_id=story.id, version=version, content=ai_feedback
+                )
+            )
+            story.ai_feedback_version = version
+            story.feedback_at = now
+        _touch(story, edited, now)
+        bump_user_stats(session, story.user_id)
+        return story
+
+    def get_stale_star_stories(self, user_id: int):
+        """
+        Get a user's stories that need an AI evaluation.
+
+        A story is stale when it has never been evaluated or was edited
+        after its latest evaluation.
+
+        Returns:
+            Rows of id, title, competency_id, situation, task, action and
+            result, most recently updated first
+        """
+        with self.read_session_scope() as session:
+            return session.execute(
+                select(
+                    STARStory.id,
+                    STARStory.title,
+                    STARStory.competency_id,
+                    STARStory.situation,
+                    STARStory.task,
+                    STARStory.action,
+                    STARStory.result,
+                )
+                .where(STARStory.user_id == user_id)
+                .where(
+                    or_(
+                        STARStory.feedback_at.is_(None),
+                        STARStory.updated_at > STARStory.feedback_at,
+                    )
+                )
+                .order_by(STARStory.updated_at.desc(), STARStory.id)
+            ).all()
 
     def delete_star_story(self, story_id: int) -> bool:
         """Delete a STAR story."""
         with self.session_scope() as session:
-            story = session.query(STARStory).filter(STARStory.id == story_id).first()
+            story = session.get(STARStory, story_id)
             if not story:
                 return False
+            session.execute(
+                delete(STARStoryFeedback).where(STARStoryFeedback.story_id == story_id)
+            )
             session.delete(story)
+            bump_user_stats(session, story.user_id, star_stories=-1)
             return True
 
     def get_recent_star_stories_by_user(self, user_id: int, limit=3):
@@ -320,12 +1001,24 @@ class DatabaseManager:
             )
             session.add(cs)
             session.flush()  # Ensure ID is generated
+            bump_user_stats(session, user_id, case_studies=1)
             return cs
 
-    def get_case_study_by_id(self, case_id: int):
-        """Get a case study by its ID."""
-        with self.session_scope() as session:
-            return session.query(CaseStudy).filter(CaseStudy.id == case_id).first()
+    def get_case_study_by_id(self, case_id: int, with_ai_output=False):
+        """
+        Get a case study by its ID.
+
+        Args:
+            case_id: Case study ID
+            with_ai_output: Also load the latest AI analysis
+                (case_study.claude_analysis), which only the detail view shows
+
+        Returns:
+            CaseStudy or None
+        """
+        options = [joinedload(CaseStudy.latest_analysis)] if with_ai_output else None
+        with self.read_session_scope() as session:
+            return session.get(CaseStudy, case_id, options=options)
 
     def get_case_studies_by_user(self, user_id: int):
         """Get all case studies for a user."""
@@ -333,6 +1026,20 @@ class DatabaseManager:
             model_class=CaseStudy, filters=[CaseStudy.user_id == user_id]
         )
 
+    def get_case_studies_page(
+        self, user_id: int, cursor=None, limit=20, with_total=False
+    ) -> Page:
+        """Get a page of a user's case studies as CaseStudyListRow objects."""
+        return self._load_objects_with_relationships(
+            model_class=CaseStudy,
+            filters=[CaseStudy.user_id == user_id],
+            keyset_column=CaseStudy.updated_at,
+            row_type=CaseStudyListRow,
+            cursor=cursor,
+            limit=limit,
+            with_total=with_total,
+        )
+
     def update_case_study(
         self,
         case_id: int,
@@ -341,35 +1048,67 @@ class DatabaseManager:
         image_path=None,
         claude_analysis=None,
     ):
-        """Update a case study."""
+        """Update a case study; a new AI analysis is stored as its next version."""
         with self.session_scope() as session:
-            cs = session.query(CaseStudy).filter(CaseStudy.id == case_id).first()
+            cs = session.get(
+                CaseStudy,
+                case_id,
+                with_for_update=True if claude_analysis is not None else None,
+            )
             if not cs:
                 return None
+            now = datetime.utcnow()
+            edited = False
             for field, value in [
                 ("title", title),
                 ("description", description),
                 ("image_path", image_path),
-                ("claude_analysis", claude_analysis),
             ]:
                 if value is not None:
                     setattr(cs, field, value)
-            cs.updated_at = datetime.utcnow()
+                    edited = True
+            if claude_analysis is not None:
+                version = (cs.analysis_version or 0) + 1
+                session.add(
+                    CaseStudyAnalysis(
+                        case_study_id=cs.id, version=version, content=claude_analysis
+                    )
+                )
+                cs.analysis_version = version
+                cs.analysis_at = now
+            _touch(cs, edited, now)
+            bump_user_stats(session, cs.user_id)
             return cs
 
     def delete_case_study(self, case_id: int) -> bool:
         """Delete a case study."""
         with self.session_scope() as session:
-            cs = session.query(CaseStudy).filter(CaseStudy.id == case_id).first()
+            cs = session.get(CaseStudy, case_id)
             if not cs:
                 return False
+            session.execute(
+                delete(CaseStudyAnalysis).where(
+                    CaseStudyAnalysis.case_study_id == case_id
+                )
+            )
             session.delete(cs)
+            bump_user_stats(session, cs.user_id, case_studies=-1)
             return True
 
     def log_audit(
         self, user_id: int, action: str, entity_type: str, entity_id=None, details=None
     ):
-        """Log an audit event."""
+        """
+        Log an audit event.
+
+        With the audit buffer enabled the event is queued and written in a
+        later batch, so nothing is returned; otherwise the row is inserted
+        immediately and returned.
+        """
+        if self.audit_buffer is not None:
+            self.audit_buffer.enqueue(user_id, action, entity_type, entity_id, details)
+            return None
+
         with self.session_scope() as session:
             log = AuditLog(
                 user_id=user_id,
@@ -377,8 +1116,21 @@ class DatabaseManager:
                 entity_type=entity_type,
                 entity_id=entity_id,
                 details=details,
+                created_at=datetime.utcnow(),
             )
             session.add(log)
+            apply_user_stats_deltas(
+                session,
+                audit_stats_deltas(
+                    [
+                        {
+                            "user_id": user_id,
+                            "action": action,
+                            "created_at": log.created_at,
+                        }
+                    ]
+                ),
+            )
             return log
 
     def get_recent_audit_logs(self, user_id: int, action_type=None, limit=10):
@@ -394,30 +1146,727 @@ class DatabaseManager:
             limit=limit,
         )
 
+    def get_user_stats(self, user_id: int):
+        """Get a user's denormalised counters (zeros if none are recorded yet)."""
+        with self.read_session_scope() as session:
+            return self._user_summary_counts(session, user_id)
+
     def count_star_stories_by_user(self, user_id: int) -> int:
         """Count STAR stories for a user."""
-        with self.session_scope() as session:
-            return session.query(STARStory).filter(STARStory.user_id == user_id).count()
+        return self.get_user_stats(user_id).star_stories_count
 
     def count_case_studies_by_user(self, user_id: int) -> int:
         """Count case studies for a user."""
+        return self.get_user_stats(user_id).case_studies_count
+
+    def _user_summary_counts(self, session, user_id: int):
+        """
+        Fetch a user's counters from user_stats by primary key.
+
+        Args:
+            session: Active database session
+            user_id: User ID
+
+        Returns:
+            UserStats with star_stories_count, case_studies_count,
+            ai_requests_count and last_activity_at
+        """
+        return session.get(UserStats, user_id) or empty_user_stats(user_id)
+
+    def repair_user_stats(self, user_ids=None):
+        """
+        Recompute user_stats counters from the source tables.
+
+        Args:
+            user_ids: Only repair these users (default: everyone)
+
+        Returns:
+            Number of users whose counters were rewritten
+        """
+        with self.engine.begin() as conn:
+            return recompute_user_stats(conn, user_ids=user_ids)
+
+    def get_competency_coverage(self, user_id: int, titles_per_competency=10):
+        """
+        Compute a user's competency coverage in SQL.
+
+        Story counts come from a GROUP BY on competency_id, and titles from
+        an (id, title) projection capped per competency, so no story bodies
+        are loaded and the cost barely depends on how many stories exist.
+
+        Args:
+            user_id: User ID
+            titles_per_competency: Most recent story titles to include per
+                competency; 0 skips the title query entirely
+
+        Returns:
+            Dict containing coverage statistics per competency and overall
+        """
+        catalog = self.competency_cache.get()
+
+        with self.read_session_scope() as session:
+            counts = dict(
+                session.query(STARStory.competency_id, func.count(STARStory.id))
+                .filter(STARStory.user_id == user_id)
+                .group_by(STARStory.competency_id)
+                .all()
+            )
+
+            titles = []
+            if titles_per_competency:
+                position = (
+                    func.row_number()
+                    .over(
+                        partition_by=STARStory.competency_id,
+                        order_by=(STARStory.updated_at.desc(), STARStory.id.desc()),
+                    )
+                    .label("position")
+                )
+                ranked = (
+                    select(
+                        STARStory.id,
+                        STARStory.title,
+                        STARStory.competency_id,
+                        position,
+                    )
+                    .where(STARStory.user_id == user_id)
+                    .where(STARStory.competency_id.isnot(None))
+                    .subquery()
+                )
+                titles = session.execute(
+                    select(ranked.c.id, ranked.c.title, ranked.c.competency_id)
+                    .where(ranked.c.position <= titles_per_competency)
+                    .order_by(ranked.c.competency_id, ranked.c.position)
+                ).all()
+
+        coverage = {}
+        for comp in catalog.items:
+            coverage[comp.id] = {
+                "id": comp.id,
+                "name": comp.name,
+                "category": comp.category,
+                "story_count": counts.get(comp.id, 0),
+                "stories": [],
+            }
+
+        for story_id, title, competency_id in titles:
+            if competency_id in coverage:
+                coverage[competency_id]["stories"].append(
+                    {"id": story_id, "title": title}
+                )
+
+        total_competencies = len(coverage)
+        covered_competencies = len(
+            [c for c in coverage.values() if c["story_count"] > 0]
+        )
+        coverage_percentage = (
+            round((covered_competencies / total_competencies) * 100)
+            if total_competencies > 0
+            else 0
+        )
+
+        return {
+            "competencies": coverage,
+            "total_stories": sum(counts.values()),
+            "total_competencies": total_competencies,
+            "covered_competencies": covered_competencies,
+            "coverage_percentage": coverage_percentage,
+        }
+
+    def refresh_coverage_summary(self, full=False):
+        """
+        Update the organisation-wide coverage summary tables.
+
+        Args:
+            full: Recompute every user rather than only those whose stories
+                changed since the last refresh
+
+        Returns:
+            Dict with "full", "users" and "duration_ms"
+        """
+        with self.engine.begin() as conn:
+            return refresh_coverage_summary(conn, full=full)
+
+    def get_org_coverage(self):
+        """
+        Organisation-wide coverage per competency, grouped by category.
+
+        Reads only the materialised summary rows (one per competency), so
+        the cost does not depend on how many users or stories exist.
+
+        Returns:
+            Dict with "categories" (category -> list of per-competency
+            dicts), totals, the overall score distribution and the time of
+            the last refresh
+        """
+        catalog = self.competency_cache.get()
+
+        with self.read_session_scope() as session:
+            summary, refresh = load_coverage_summary(session)
+            active_users = (
+                session.query(func.count(User.id))
+                .filter(User.is_active.isnot(False))
+                .scalar()
+            )
+
+        categories = {}
+        distribution = {bucket: 0 for bucket in SCORE_BUCKETS}
+        total_stories = scored_stories = score_sum = 0
+        for comp in catalog.items:
+            row = summary.get(comp.id)
+            buckets = {
+                bucket: getattr(row, f"score_{bucket}") if row else 0
+                for bucket in SCORE_BUCKETS
+            }
+            entry = {
+                "id": comp.id,
+                "name": comp.name,
+                "story_count": row.story_count if row else 0,
+                "users_covered": row.users_covered if row else 0,
+                "user_percentage": (
+                    round(row.users_covered / active_users * 100)
+                    if row and active_users
+                    else 0
+                ),
+                "scored_count": row.scored_count if row else 0,
+                "average_score": (
+                    round(row.score_sum / row.scored_count, 1)
+                    if row and row.scored_count
+                    else None
+                ),
+                "score_distribution": buckets,
+            }
+            categories.setdefault(comp.category or "Uncategorized", []).append(entry)
+
+            total_stories += entry["story_count"]
+            if row and row.scored_count:
+                scored_stories += row.scored_count
+                score_sum += row.score_sum
+            for bucket, count in buckets.items():
+                distribution[bucket] += count
+
+        return {
+            "categories": dict(sorted(categories.items())),
+            "active_users": active_users,
+            "total_stories": total_stories,
+            "scored_stories": scored_stories,
+            "average_score": (
+                round(score_sum / scored_stories, 1) if scored_stories else None
+            ),
+            "score_distribution": distribution,
+            "covered_competencies": sum(
+                1
+                for entries in categories.values()
+                for entry in entries
+                if entry["story_count"]
+            ),
+            "total_competencies": len(catalog),
+            "refreshed_at": refresh.refreshed_at if refresh else None,
+            "refresh_duration_ms": refresh.duration_ms if refresh else None,
+        }
+
+    def get_dashboard_data(self, user_id: int, limit=5):
+        """
+        Get everything the dashboard renders for a user.
+
+        Only the most recent items are loaded; totals come from one
+        aggregate query so the cost doesn't grow with the user's history.
+
+        Args:
+            user_id: User ID
+            limit: Number of recent stories and case studies to return
+
+        Returns:
+            Dict with recent items and counts
+        """
+        with self.read_session_scope() as session:
+            counts = self._user_summary_counts(session, user_id)
+
+            recent_stories = [
+                StoryListRow.from_row(row)
+                for row in self._build_query(
+                    session,
+                    STARStory,
+                    [STARStory.user_id == user_id],
+                    row_type=StoryListRow,
+                )
+                .order_by(STARStory.updated_at.desc(), STARStory.id.desc())
+                .limit(limit)
+            ]
+            recent_case_studies = [
+                CaseStudyListRow.from_row(row)
+                for row in self._build_query(
+                    session,
+                    CaseStudy,
+                    [CaseStudy.user_id == user_id],
+                    row_type=CaseStudyListRow,
+                )
+                .order_by(CaseStudy.updated_at.desc(), CaseStudy.id.desc())
+                .limit(limit)
+            ]
+
+            return {
+                "recent_star_stories": recent_stories,
+                "recent_case_studies": recent_case_studies,
+                "star_stories_count": counts.star_stories_count,
+                "case_studies_count": counts.case_studies_count,
+            }
+
+    def search(self, user_id: int, query: str, limit=20):
+        """
+        Full-text search over a user's STAR stories and case studies.
+
+        Args:
+            user_id: ID of the user whose content is searched
+            query: Free-text query
+            limit: Maximum hits per entity type
+
+        Returns:
+            Dict with "star_stories" and "case_studies" lists of SearchHit
+        """
+        with self.read_session_scope() as session:
+            return {
+                "star_stories": search_entities(
+                    session, "star_story", user_id, query, limit
+                ),
+                "case_studies": search_entities(
+                    session, "case_study", user_id, query, limit
+                ),
+            }
+
+    def suggest_titles(self, user_id: int, query: str, limit=8):
+        """
+        Typeahead suggestions from a user's story and case study titles.
+
+        Returns:
+            List of (kind, id, title) tuples, stories first
+        """
+        with self.read_session_scope() as session:
+            return [
+                (kind, entity_id, title)
+                for kind in ("star_story", "case_study")
+                for entity_id, title in suggest_entity_titles(
+                    session, kind, user_id, query, limit
+                )
+            ][:limit]
+
+    def import_entities(self, user_id: int, kind: str, stream, fmt="csv"):
+        """
+        Bulk import STAR stories or case studies from a CSV / JSONL stream.
+
+        Args:
+            user_id: Owner of the imported rows
+            kind: "star_story" or "case_study"
+            stream: Text stream of records
+            fmt: "csv" or "jsonl"
+
+        Returns:
+            ImportResult
+        """
+        with self.engine.begin() as conn:
+            result = import_records(
+                conn,
+                kind,
+                user_id,
+                iter_records(stream, fmt),
+                batch_size=get_settings().BULK_IMPORT_BATCH_SIZE,
+            )
+            if result.inserted:
+                counter = "star_stories" if kind == "star_story" else "case_studies"
+                bump_user_stats(conn, user_id, **{counter: result.inserted})
+
+        if result.inserted:
+            self.pin_reads_to_primary()
+        self.log_audit(
+            user_id,
+            "bulk_import",
+            kind,
+            details=f"inserted={result.inserted} failed={result.failed} format={fmt}",
+        )
+        return result
+
+    def export_entities(self, user_id: int, kind: str, fmt="csv"):
+        """
+        Stream a user's STAR stories or case studies as CSV / JSONL chunks.
+
+        This is a generator; the read session stays open until it is
+        exhausted or closed.
+        """
+        with self.read_session_scope() as session:
+            yield from iter_export(
+                session,
+                kind,
+                user_id,
+                fmt,
+                batch_size=get_settings().BULK_EXPORT_BATCH_SIZE,
+            )
+
+    def enqueue_job(self, user_id: int, kind: str, payload):
+        """
+        Queue a background job for the worker processes.
+
+        Args:
+            user_id: Owner of the job
+            kind: Task name (see star_competency_app.ai.tasks.TASKS)
+            payload: JSON-serialisable task arguments
+
+        Returns:
+            The new job's ID
+        """
+        with self.session_scope() as session:
+            job = enqueue_job(
+                session,
+                user_id,
+                kind,
+                payload,
+                max_attempts=get_settings().JOB_MAX_ATTEMPTS,
+            )
+            return job.id
+
+    def get_job(self, job_id: int):
+        """Get a job by its ID; read from the primary, which workers update."""
+        with self.session_scope() as session:
+            return session.get(Job, job_id)
+
+    def claim_jobs(self, worker_id: str, limit=1):
+        """Claim runnable jobs for a worker (see database/job_queue.py)."""
+        with self.engine.begin() as conn:
+            return claim_jobs(
+                conn,
+                worker_id,
+                limit=limit,
+                visibility_timeout=get_settings().JOB_VISIBILITY_TIMEOUT,
+            )
+
+    def complete_job(self, job_id: int, worker_id: str, result) -> bool:
+        """Store a claimed job's result; False if the worker lost its lease."""
+        with self.engine.begin() as conn:
+            return complete_job(conn, job_id, worker_id, result)
+
+    def report_job_progress(self, job_id: int, worker_id: str, progress) -> bool:
+        """Store a running job's progress and extend its lease; False if lost."""
+        with self.engine.begin() as conn:
+            return report_progress(
+                conn,
+                job_id,
+                worker_id,
+                progress,
+                visibility_timeout=get_settings().JOB_VISIBILITY_TIMEOUT,
+            )
+
+    def fail_job(self, job, worker_id: str, error: str, retryable=True) -> str:
+        """Record a failed attempt of a claimed job; returns its new status."""
+        with self.engine.begin() as conn:
+            return fail_job(
+                conn,
+                job,
+                worker_id,
+                error,
+                retryable=retryable,
+                backoff=get_settings().JOB_RETRY_BACKOFF,
+            )
+
+    def purge_jobs(self, retention_days=None) -> int:
+        """
+        Delete finished jobs older than the retention period.
+
+        Args:
+            retention_days: Days to keep finished jobs (default:
+                JOB_RETENTION_DAYS)
+
+        Returns:
+            Number of jobs deleted
+        """
+        if retention_days is None:
+            retention_days = get_settings().JOB_RETENTION_DAYS
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        with self.engine.begin() as conn:
+            return purge_finished_jobs(conn, cutoff)
+
+    def get_cached_ai_response(self, key: str):
+        """Fetch an unexpired shared AI cache entry, counting the hit."""
+        with self.engine.begin() as conn:
+            return load_response(conn, key, datetime.utcnow())
+
+    def store_ai_response(
+        self,
+        key: str,
+        task: str,
+        model: str,
+        content: str,
+        prompt_tokens=0,
+        completion_tokens=0,
+        ttl=None,
+    ):
+        """
+        Store an AI completion in the shared cache tier.
+
+        Args:
+            key: Cache key (see ai/response_cache.py:cache_key)
+            task: Client method that produced it, e.g. "evaluate_star_story"
+            model: Model that produced it
+            content: Completion text
+            prompt_tokens: Prompt tokens a hit saves
+            completion_tokens: Completion tokens a hit saves
+            ttl: Seconds until it expires (default: AI_CACHE_TTL)
+        """
+        now = datetime.utcnow()
+        if ttl is None:
+            ttl = get_settings().AI_CACHE_TTL
+        with self.engine.begin() as conn:
+            save_response(
+                conn,
+                key,
+                task,
+                model,
+                content,
+                prompt_tokens,
+                completion_tokens,
+                now,
+                now + timedelta(seconds=ttl),
+            )
+
+    def purge_ai_responses(self, max_rows=None):
+        """
+        Delete expired and least recently used AI cache entries.
+
+        Args:
+            max_rows: Entries to keep (default: AI_CACHE_MAX_ROWS)
+
+        Returns:
+            Dict with the number of "expired" and "evicted" entries deleted
+        """
+        if max_rows is None:
+            max_rows = get_settings().AI_CACHE_MAX_ROWS
+        with self.engine.begin() as conn:
+            return purge_responses(conn, max_rows, datetime.utcnow())
+
+    def get_ai_response_store_stats(self):
+        """Return the size of the shared AI cache tier and the tokens it saved."""
+        with self.engine.begin() as conn:
+            return response_store_stats(conn, datetime.utcnow())
+
+    def get_star_stories_for_rescore(self, after_id: int, limit: int, up_to=None):
+        """
+        Get the next chunk of stories, across all users, for bulk re-scoring.
+
+        Stories without a competency are left out; evaluations need one.
+
+        Args:
+            after_id: Only stories with a higher ID (a keyset cursor)
+            limit: Maximum number of stories
+            up_to: Highest story ID to include, if any
+
+        Returns:
+            (story, CompetencyRecord) pairs in story ID order; each story row
+            has id, title, situation, task, action and result
+        """
+        query = (
+            select(
+                STARStory.id,
+                STARStory.title,
+                STARStory.situation,
+                STARStory.task,
+                STARStory.action,
+                STARStory.result,
+                Competency,
+            )
+            .join(Competency, Competency.id == STARStory.competency_id)
+            .where(STARStory.id > after_id)
+            .order_by(STARStory.id)
+            .limit(limit)
+        )
+        if up_to is not None:
+            query = query.where(STARStory.id <= up_to)
+        with self.read_session_scope() as session:
+            return [
+                (row, CompetencyRecord.from_model(row.Competency))
+                for row in session.execute(query)
+            ]
+
+    def get_rescore_batches(self, run: str):
+        """Get the batches of a bulk re-scoring run (its checkpoint)."""
+        with self.engine.begin() as conn:
+            return load_batches(conn, run)
+
+    def record_rescore_batch(
+        self,
+        run: str,
+        provider: str,
+        first_story_id: int,
+        last_story_id: int,
+        request_count: int,
+    ):
+        """Checkpoint a chunk before submitting it; None if already recorded."""
+        with self.engine.begin() as conn:
+            return record_batch(
+                conn, run, provider, first_story_id, last_story_id, request_count
+            )
+
+    def mark_rescore_batch_submitted(self, rescore_batch_id: int, batch_id: str):
+        """Store the provider's batch ID for a recorded chunk."""
+        with self.engine.begin() as conn:
+            return mark_submitted(conn, rescore_batch_id, batch_id)
+
+    def mark_rescore_batch_failed(self, rescore_batch_id: int, error: str):
+        """Record that the provider did not complete a batch."""
+        with self.engine.begin() as conn:
+            mark_failed(conn, rescore_batch_id, error)
+
+    def apply_rescore_batch(self, rescore_batch_id: int, updates, failed=0):
+        """
+        Write a finished batch's evaluations and mark it applied, atomically.
+
+        Each evaluation is stored as the story's next feedback version.
+        Stories edited or deleted after the batch was submitted are skipped:
+        their results score text that no longer exists.
+
+        Args:
+            rescore_batch_id: RescoreBatch ID
+            updates: Dicts of story_id, ai_feedback and ai_score
+            failed: Requests that errored or are missing from the results
+
+        Returns:
+            The applied RescoreBatch, or None if it was not awaiting results
+            (e.g. another runner applied it first)
+        """
+        now = datetime.utcnow()
         with self.session_scope() as session:
-            return session.query(CaseStudy).filter(CaseStudy.user_id == user_id).count()
+            batch = session.get(RescoreBatch, rescore_batch_id, with_for_update=True)
+            if batch is None or batch.status != "submitted":
+                return None
+
+            # Lock the whole range in ID order with one query
+            stories = {
+                story.id: story
+                for story in session.scalars(
+                    select(STARStory)
+                    .where(
+                        STARStory.id.between(batch.first_story_id, batch.last_story_id),
+                        STARStory.updated_at <= batch.submitted_at,
+                    )
+                    .order_by(STARStory.id)
+                    .with_for_update()
+                )
+            }
+            users, succeeded = set(), 0
+            for update in updates:
+                story = stories.get(update["story_id"])
+                if story is None:
+                    continue
+                version = (story.ai_feedback_version or 0) + 1
+                session.add(
+                    STARStoryFeedback(
+                        story_id=story.id,
+                        version=version,
+                        content=update["ai_feedback"],
+                        created_at=now,
+                    )
+                )
+                story.ai_feedback_version = version
+                if update["ai_score"] is not None:
+                    story.ai_score = update["ai_score"]
+                story.feedback_at = now
+                _touch(story, False, now)
+                users.add(story.user_id)
+                succeeded += 1
+            # One statement for every owner, so coverage refreshes pick them up
+            apply_user_stats_deltas(session, {user_id: {} for user_id in users})
+
+            batch.status = "applied"
+            batch.succeeded = succeeded
+            batch.failed = failed
+            batch.skipped = len(updates) - succeeded
+            batch.finished_at = now
+            return batch
+
+    def get_profile_data(self, user_id: int, activity_limit=10):
+        """
+        Get activity counts, coverage and recent audit logs for a profile page.
+
+        Args:
+            user_id: User ID
+            activity_limit: Number of recent audit log entries to return
+
+        Returns:
+            Dict with counts, coverage statistics and recent activity
+        """
+        with self.read_session_scope() as session:
+            counts = self._user_summary_counts(session, user_id)
+
+            recent_activity = (
+                session.query(AuditLog)
+                .filter(AuditLog.user_id == user_id)
+                .order_by(AuditLog.created_at.desc())
+                .limit(activity_limit)
+                .all()
+            )
+
+        return {
+            "star_stories_count": counts.star_stories_count,
+            "case_studies_count": counts.case_studies_count,
+            "recent_activity": recent_activity,
+            "coverage_stats": self.get_competency_coverage(
+                user_id, titles_per_competency=0
+            ),
+        }
+
+    def get_users_page(
+        self, search=None, role=None, cursor=None, limit=50, with_total=False
+    ) -> Page:
+        """
+        Get a page of the admin user directory, ordered by display name.
+
+        Args:
+            search: Case-insensitive prefix of a display name or email
+            role: "admin" or "user" to filter by role
+            cursor: Cursor from a previous Page
+            limit: Users per page
+            with_total: Also count matching users (capped)
+
+        Returns:
+            Page of UserDirectoryRow, with user_stats counters joined in
+        """
+        filters = []
+        if search:
+            pattern = _prefix_pattern(search.lower())
+            filters.append(
+                or_(
+                    func.lower(User.display_name).like(pattern, escape="\\"),
+                    func.lower(User.email).like(pattern, escape="\\"),
+                )
+            )
+        if role == "admin":
+            filters.append(User.is_admin.is_(True))
+        elif role == "user":
+            filters.append(User.is_admin.isnot(True))
+
+        return self._load_page(
+            model_class=User,
+            keyset_column=User.display_name,
+            filters=filters,
+            row_type=UserDirectoryRow,
+            cursor=cursor,
+            limit=limit,
+            with_total=with_total,
+            descending=False,
+        )
 
     def get_all_users(self):
-        """Get all users."""
+        """Get all users with their user_stats counters joined in."""
         return self._load_objects_with_relationships(
-            model_class=User, order_by=User.display_name
+            model_class=User, relationships=[User.stats], order_by=User.display_name
         )
 
     def toggle_admin_role(self, user_id: int):
         """Toggle admin role for a user."""
         with self.session_scope() as session:
-            user = session.query(User).filter(User.id == user_id).first()
+            user = session.get(User, user_id)
             if not user:
                 return False
             user.is_admin = not user.is_admin
-            return user
+        self.invalidate_user_identity(user_id)
+        return user
 
     def get_audit_logs_by_user(self, user_id: int):
         """Get all audit logs for a user."""
@@ -427,6 +1876,19 @@ class DatabaseManager:
             order_by=AuditLog.created_at.desc(),
         )
 
+    def get_audit_logs_page(
+        self, user_id: int, cursor=None, limit=50, with_total=False
+    ) -> Page:
+        """Get a page of a user's audit logs, newest first."""
+        return self._load_objects_with_relationships(
+            model_class=AuditLog,
+            filters=[AuditLog.user_id == user_id],
+            keyset_column=AuditLog.created_at,
+            cursor=cursor,
+            limit=limit,
+            with_total=with_total,
+        )
+
     def count_users(self) -> int:
         """Count total number of users."""
         with self.session_scope() as session:
@@ -435,7 +1897,7 @@ class DatabaseManager:
     def update_user_if_changed(self, user_id: int, email=None, display_name=None):
         """Update user information if it has changed."""
         with self.session_scope() as session:
-            user = session.query(User).filter(User.id == user_id).first()
+            user = session.get(User, user_id)
             if not user:
                 return None
             changed = False
@@ -457,4 +1919,12 @@ class DatabaseManager:
                         details="User information synced from Azure",
                     )
                 )
-            return user
+        if changed:
+            self.invalidate_user_identity(user_id)
+        return user
+
+
+@lru_cache()
+def get_db_manager():
+    """Get the process-wide DatabaseManager shared by all blueprints."""
+    return DatabaseManager()
@@ -0,0 +1,164 @@
+# star_competency_app/database/engine.py
+import logging
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+from star_competency_app.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Process-wide registry of engines keyed by database URL
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._waits = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                self._waits += 1
+                self._total_wait += elapsed
+                self._max_wait = max(self._max_wait, elapsed)
+
+    def recreate(self):
+        # Carry the stats over so dispose()/recreate() doesn't reset them
+        new_pool = super().recreate()
+        with self._stats_lock:
+            new_pool._waits = self._waits
+            new_pool._total_wait = self._total_wait
+            new_pool._max_wait = self._max_wait
+            new_pool._timeouts = self._timeouts
+        return new_pool
+
+    def wait_stats(self):
+        """Return checkout wait statistics in milliseconds."""
+        with self._stats_lock:
+            avg_wait = self._total_wait / self._waits if self._waits else 0.0
+            return {
+                "checkouts": self._waits,
+                "avg_wait_ms": round(avg_wait * 1000, 3),
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+                "timeouts": self._timeouts,
+            }
+
+
+def _engine_options(db_url, settings):
+    """Build create_engine() keyword arguments for the given URL."""
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+
+    # SQLite uses its own pool classes; sizing options only apply to server DBs
+    if make_url(db_url).get_backend_name() == "sqlite":
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+
+    if make_url(db_url).get_backend_name() == "postgresql":
+        # Cap every statement and lock wait server-side so a runaway query
+        # fails fast instead of holding a gunicorn worker
+        options["connect_args"] = {
+            "options": (
+                f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS} "
+                f"-c lock_timeout={settings.DB_LOCK_TIMEOUT_MS}"
+            )
+        }
+    return options
+
+
+def get_engine(db_url=None):
+    """
+    Get the shared engine for a database URL, creating it on first use.
+
+    Every DatabaseManager in a worker process reuses the same engine, so each
+    gunicorn worker holds exactly one connection pool per database.
+    """
+    settings = get_settings()
+    db_url = db_url or settings.DATABASE_URL
+
+    engine = _engines.get(db_url)
+    if engine is not None:
+        return engine
+
+    with _engines_lock:
+        engine = _engines.get(db_url)
+        if engine is None:
+            engine = create_engine(db_url, **_engine_options(db_url, settings))
+            _engines[db_url] = engine
+            logger.info(
+                f"Created database engine for {engine.url.render_as_string(hide_password=True)}"
+            )
+        return engine
+
+
+def get_pool_stats(engine):
+    """
+    Return live statistics for an engine's connection pool.
+
+    Args:
+        engine: The SQLAlchemy engine to inspect
+
+    Returns:
+        Dict with pool size, checked-out and idle counts and wait times
+    """
+    pool = engine.pool
+    stats = {
+        "url": engine.url.render_as_string(hide_password=True),
+        "pool_class": type(pool).__name__,
+    }
+
+    if isinstance(pool, QueuePool):
+        stats.update(
+            {
+                "size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": pool.overflow(),
+            }
+        )
+
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(pool.wait_stats())
+
+    return stats
+
+
+def get_all_pool_stats():
+    """Return pool statistics for every engine in this process."""
+    with _engines_lock:
+        engines = list(_engines.values())
+    return [get_pool_stats(engine) for engine in engines]
+
+
+def dispose_engines():
+    """Dispose every registered engine, e.g. after forking a worker."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
@@ -0,0 +1,160 @@
+# star_competency_app/database/identity_cache.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class UserIdentity:
+    """
+    Compact, session-independent view of a User for Flask-Login.
+
+    Carries only what current_user is used for (templates, require_admin,
+    logging), so it can be cached and shared across requests without ever
+    touching a database session.
+    """
+
+    __slots__ = (
+        "id",
+        "azure_id",
+        "email",
+        "display_name",
+        "is_admin",
+        "is_active",
+        "created_at",
+    )
+
+    def __init__(
+        self, id, azure_id, email, display_name, is_admin, is_active, created_at
+    ):
+        self.id = id
+        self.azure_id = azure_id
+        self.email = email
+        self.display_name = display_name
+        self.is_admin = bool(is_admin)
+        self.is_active = bool(is_active)
+        self.created_at = created_at
+
+    @classmethod
+    def from_model(cls, user):
+        return cls(
+            id=user.id,
+            azure_id=user.azure_id,
+            email=user.email,
+            display_name=user.display_name,
+            is_admin=user.is_admin,
+            is_active=user.is_active if user.is_active is not None else True,
+            created_at=user.created_at,
+        )
+
+    # Flask-Login user interface
+    @property
+    def is_authenticated(self):
+        return True
+
+    @property
+    def is_anonymous(self):
+        return False
+
+    def get_id(self):
+        """Return the user's ID as a string."""
+        return str(self.id)
+
+    # Same accessors as the User model, used by the templates
+    @property
+    def is_admin_safe(self):
+        return self.is_admin
+
+    @property
+    def display_name_safe(self):
+        return self.display_name or ""
+
+    @property
+    def email_safe(self):
+        return self.email or ""
+
+    def __eq__(self, other):
+        return isinstance(other, UserIdentity) and self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f"<UserIdentity {self.id} {self.display_name!r}>"
+
+
+class UserIdentityCache:
+    """
+    Bounded LRU cache of UserIdentity records with a TTL.
+
+    DatabaseManager invalidates an entry whenever it changes that user.
+    The TTL bounds how long other worker processes can serve a stale
+    record (e.g. a revoked admin flag).
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[int], Optional[UserIdentity]],
+        maxsize: int = 1024,
+        ttl: int = 60,
+    ):
+        self._loader = loader
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries = OrderedDict()  # user_id -> (identity, loaded_at)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, user_id: int) -> Optional[UserIdentity]:
+        """Return the identity for user_id, loading it on a miss or expiry."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and now - entry[1] < self._ttl:
+                self._entries.move_to_end(user_id)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        identity = self._loader(user_id)
+        if identity is None:
+            # Unknown users are not cached, so a new account is seen at once
+            self.invalidate(user_id)
+            return None
+
+        with self._lock:
+            self._entries[user_id] = (identity, now)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return identity
+
+    def invalidate(self, user_id: int):
+        """Drop one user's cached identity."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        """Drop every cached identity."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return size and hit/miss counters."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self._maxsize,
+                "ttl": self._ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else None,
+            }
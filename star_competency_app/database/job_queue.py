@@ -0,0 +1,257 @@
+# star_competency_app/database/job_queue.py
+"""
+Durable background job queue in the jobs table.
+
+The web app enqueues a job and returns its id straight away; worker
+processes (star_competency_app/worker.py) claim jobs with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of workers can poll the
+same table without handing one job to two of them.
+
+A claimed job is leased to its worker until locked_until (the visibility
+timeout). A worker that dies mid-job simply lets the lease expire, after
+which another worker claims the job again. Failed attempts are retried
+with exponential backoff until max_attempts is reached.
+"""
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, delete, or_, select, update
+
+from star_competency_app.database.models import Job
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+FINISHED_STATUSES = frozenset({JOB_SUCCEEDED, JOB_FAILED})
+
+
+def enqueue_job(session, user_id, kind, payload, max_attempts=3):
+    """
+    Add a job to the queue.
+
+    Args:
+        session: Active database session; the job commits with it
+        user_id: Owner of the job (only they can read its status)
+        kind: Task name, a key of star_competency_app.ai.tasks.TASKS
+        payload: JSON-serialisable task arguments
+        max_attempts: Attempts before the job is marked failed
+
+    Returns:
+        The new Job (with its id)
+    """
+    job = Job(
+        user_id=user_id,
+        kind=kind,
+        payload=payload,
+        status=JOB_QUEUED,
+        attempts=0,
+        max_attempts=max_attempts,
+        run_after=datetime.utcnow(),
+    )
+    session.add(job)
+    session.flush()
+    return job
+
+
+def _claimable(now):
+    return or_(
+        and_(Job.status == JOB_QUEUED, Job.run_after <= now),
+        # Lease expired: the worker holding it died or hung
+        and_(
+            Job.status == JOB_RUNNING,
+            Job.locked_until < now,
+            Job.attempts < Job.max_attempts,
+        ),
+    )
+
+
+def claim_jobs(conn, worker_id, limit=1, visibility_timeout=300):
+    """
+    Claim up to `limit` runnable jobs for one worker.
+
+    Args:
+        conn: Connection with an open transaction
+        worker_id: Identifies the claiming worker (stored in locked_by)
+        limit: Maximum number of jobs to claim
+        visibility_timeout: Seconds before an unfinished job can be
+            claimed by another worker
+
+    Returns:
+        List of claimed job rows (id, user_id, kind, payload, attempts,
+        max_attempts)
+    """
+    now = datetime.utcnow()
+
+    # Jobs whose worker vanished on their final attempt will not be retried
+    conn.execute(
+        update(Job)
+        .where(Job.status == JOB_RUNNING)
+        .where(Job.locked_until < now)
+        .where(Job.attempts >= Job.max_attempts)
+        .values(
+            status=JOB_FAILED,
+            error="Timed out",
+            locked_by=None,
+            locked_until=None,
+            finished_at=now,
+            updated_at=now,
+        )
+    )
+
+    candidate_ids = (
+        conn.execute(
+            select(Job.id)
+            .where(_claimable(now))
+            .order_by(Job.run_after, Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        .scalars()
+        .all()
+    )
+    if not candidate_ids:
+        return []
+
+    # Re-checking the condition keeps claims exclusive on SQLite too, which
+    # has no row locks
+    claimed = [
+        job_id
+        for job_id in candidate_ids
+        if conn.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .where(_claimable(now))
+            .values(
+                status=JOB_RUNNING,
+                attempts=Job.attempts + 1,
+                locked_by=worker_id,
+                locked_until=now + timedelta(seconds=visibility_timeout),
+                updated_at=now,
+            )
+        ).rowcount
+        == 1
+    ]
+    if not claimed:
+        return []
+
+    return conn.execute(
+        select(
+            Job.id,
+            Job.user_id,
+            Job.kind,
+            Job.payload,
+            Job.attempts,
+            Job.max_attempts,
+        )
+        .where(Job.id.in_(claimed))
+        .order_by(Job.run_after, Job.id)
+    ).all()
+
+
+def _owned_by(job_id, worker_id):
+    return (
+        update(Job)
+        .where(Job.id == job_id)
+        .where(Job.status == JOB_RUNNING)
+        .where(Job.locked_by == worker_id)
+    )
+
+
+def complete_job(conn, job_id, worker_id, result):
+    """
+    Store a job's result and mark it succeeded.
+
+    Returns:
+        False if the worker's lease had expired and the job was taken over
+    """
+    now = datetime.utcnow()
+    done = conn.execute(
+        _owned_by(job_id, worker_id).values(
+            status=JOB_SUCCEEDED,
+            result=result,
+            error=None,
+            locked_by=None,
+            locked_until=None,
+            finished_at=now,
+            updated_at=now,
+        )
+    ).rowcount
+    if not done:
+        logger.warning(f"Job {job_id} finished after {worker_id} lost its lease")
+    return bool(done)
+
+
+def report_progress(conn, job_id, worker_id, progress, visibility_timeout=300):
+    """
+    Record a running job's progress and extend its lease.
+
+    Long-running tasks report as they go, so a job that is still making
+    progress is not handed to another worker when its first lease expires.
+
+    Returns:
+        False if the worker's lease had expired and the job was taken over
+    """
+    now = datetime.utcnow()
+    return bool(
+        conn.execute(
+            _owned_by(job_id, worker_id).values(
+                progress=progress,
+                locked_until=now + timedelta(seconds=visibility_timeout),
+                updated_at=now,
+            )
+        ).rowcount
+    )
+
+
+def fail_job(conn, job, worker_id, error, retryable=True, backoff=10):
+    """
+    Record a failed attempt, scheduling a retry while attempts remain.
+
+    Args:
+        conn: Connection with an open transaction
+        job: Claimed job row (see claim_jobs)
+        worker_id: Worker that ran the attempt
+        error: Message shown to the user if the job finally fails
+        retryable: False for errors that another attempt cannot fix
+        backoff: Base retry delay in seconds, doubled on each attempt
+
+    Returns:
+        The job's new status
+    """
+    now = datetime.utcnow()
+    if retryable and job.attempts < job.max_attempts:
+        status = JOB_QUEUED
+        values = {
+            "run_after": now + timedelta(seconds=backoff * 2 ** (job.attempts - 1)),
+            "finished_at": None,
+        }
+    else:
+        status = JOB_FAILED
+        values = {"finished_at": now}
+
+    conn.execute(
+        _owned_by(job.id, worker_id).values(
+            status=status,
+            error=error,
+            locked_by=None,
+            locked_until=None,
+            updated_at=now,
+            **values,
+        )
+    )
+    return status
+
+
+def purge_finished_jobs(conn, older_than):
+    """
+    Delete succeeded and failed jobs that finished before `older_than`.
+
+    Returns:
+        Number of jobs deleted
+    """
+    result = conn.execute(delete(Job).where(Job.finished_at < older_than))
+    return result.rowcount
@@ -0,0 +1,81 @@
+# star_competency_app/database/migration_utils.py
+"""Helpers shared by the Alembic migrations in database/migrations."""
+import sqlalchemy as sa
+from alembic import context, op
+
+
+def _is_postgresql():
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def create_index_concurrently(name, table, columns, using=None, where=None):
+    """
+    Create an index without blocking writes to the table.
+
+    On PostgreSQL this runs CREATE INDEX CONCURRENTLY outside the migration
+    transaction. Other databases get a plain CREATE INDEX. IF NOT EXISTS
+    makes the step safe to re-run, including on databases whose tables were
+    created by DatabaseManager.create_tables() with the index already present
+    (columns added by migrations use add_column_if_missing() for the same
+    reason).
+
+    Note: if a concurrent build fails, PostgreSQL leaves an INVALID index
+    behind; drop it manually before re-running the migration.
+
+    Args:
+        name: Index name
+        table: Table name
+        columns: List of column names or expressions
+        using: Optional index method, e.g. "gin" (PostgreSQL only)
+        where: Optional partial index predicate
+    """
+    column_sql = ", ".join(columns)
+    where_sql = f" WHERE {where}" if where else ""
+
+    if _is_postgresql():
+        using_sql = f" USING {using}" if using else ""
+        with op.get_context().autocommit_block():
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON {table}{using_sql} ({column_sql}){where_sql}"
+            )
+    else:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column_sql}){where_sql}"
+        )
+
+
+def drop_index_concurrently(name):
+    """Drop an index without blocking writes (PostgreSQL) or plainly elsewhere."""
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    else:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def has_column(table, column, offline=False):
+    """
+    Whether a table already has a column.
+
+    docker/entrypoint.sh runs DatabaseManager.create_tables() before
+    `alembic upgrade head`, so a fresh database already has every column
+    of the current models when the migrations that add them run.
+
+    Args:
+        table: Table name
+        column: Column name
+        offline: Answer with --sql, where nothing can be inspected; the
+            schema of the previous revision decides it
+    """
+    if context.is_offline_mode():
+        return offline
+    return column in {
+        col["name"] for col in sa.inspect(op.get_bind()).get_columns(table)
+    }
+
+
+def add_column_if_missing(table, column):
+    """op.add_column(), skipped when the column already exists."""
+    if not has_column(table, column.name):
+        op.add_column(table, column)
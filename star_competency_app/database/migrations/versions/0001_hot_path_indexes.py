@@ -0,0 +1,50 @@
+"""Add composite indexes for the hot per-user query shapes
+
+Tables themselves are created by DatabaseManager.create_tables(); this is
+the first revision applied on top of that schema.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+
+"""
+from star_competency_app.database.migration_utils import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    (
+        "ix_star_stories_user_id_updated_at",
+        "star_stories",
+        ["user_id", "updated_at", "id"],
+    ),
+    (
+        "ix_star_stories_user_id_competency_id",
+        "star_stories",
+        ["user_id", "competency_id"],
+    ),
+    ("ix_star_stories_competency_id", "star_stories", ["competency_id"]),
+    (
+        "ix_case_studies_user_id_updated_at",
+        "case_studies",
+        ["user_id", "updated_at", "id"],
+    ),
+    ("ix_audit_logs_user_id_created_at", "audit_logs", ["user_id", "created_at", "id"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        create_index_concurrently(name, table, columns)
+
+
+def downgrade():
+    for name, _, _ in reversed(INDEXES):
+        drop_index_concurrently(name)
@@ -0,0 +1,132 @@
+"""Partition audit_logs by month on created_at (PostgreSQL only)
+
+The existing table is renamed, a partitioned audit_logs is created with a
+partition per month from the oldest row up to a few months ahead plus a
+default partition, and the rows are copied across. The primary key becomes
+(id, created_at) because PostgreSQL requires the partition key in it; the
+ORM keeps treating id alone as the identity, which the shared sequence
+keeps unique.
+
+The copy holds a lock on audit_logs for its duration, so on a large table
+run this during a maintenance window.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+"""
+from datetime import datetime
+
+from alembic import op
+from sqlalchemy import text
+
+from star_competency_app.database.audit_partitions import (
+    DEFAULT_PARTITION,
+    add_months,
+    create_partition_sql,
+    month_start,
+)
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# Future months created up front; the app keeps extending this at startup
+MONTHS_AHEAD = 3
+
+COLUMNS = "id, user_id, action, entity_type, entity_id, details, created_at"
+
+
+def _is_postgresql():
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade():
+    if not _is_postgresql():
+        return
+
+    bind = op.get_bind()
+
+    # Free the names used by the new table
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_legacy")
+    op.execute("ALTER INDEX audit_logs_pkey RENAME TO audit_logs_legacy_pkey")
+    op.execute(
+        "ALTER INDEX IF EXISTS ix_audit_logs_user_id_created_at "
+        "RENAME TO ix_audit_logs_legacy_user_id_created_at"
+    )
+
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            user_id INTEGER NOT NULL REFERENCES users (id),
+            action VARCHAR NOT NULL,
+            entity_type VARCHAR NOT NULL,
+            entity_id INTEGER,
+            details TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.execute(
+        "CREATE INDEX ix_audit_logs_user_id_created_at "
+        "ON audit_logs (user_id, created_at, id)"
+    )
+    op.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF audit_logs DEFAULT")
+
+    oldest = bind.execute(
+        text("SELECT min(created_at) FROM audit_logs_legacy")
+    ).scalar()
+    current = month_start(datetime.utcnow())
+    month = month_start(oldest) if oldest else current
+    while month <= add_months(current, MONTHS_AHEAD):
+        op.execute(create_partition_sql(month))
+        month = add_months(month, 1)
+
+    # Legacy rows may have a NULL created_at, which a partition key can't hold
+    op.execute(
+        f"INSERT INTO audit_logs ({COLUMNS}) "
+        "SELECT id, user_id, action, entity_type, entity_id, details, "
+        "COALESCE(created_at, now() AT TIME ZONE 'utc') FROM audit_logs_legacy"
+    )
+    op.execute("DROP TABLE audit_logs_legacy")
+    op.execute("ANALYZE audit_logs")
+
+
+def downgrade():
+    if not _is_postgresql():
+        return
+
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute(
+        "ALTER INDEX ix_audit_logs_user_id_created_at "
+        "RENAME TO ix_audit_logs_partitioned_user_id_created_at"
+    )
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq') PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users (id),
+            action VARCHAR NOT NULL,
+            entity_type VARCHAR NOT NULL,
+            entity_id INTEGER,
+            details TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE
+        )
+        """
+    )
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.execute(
+        "CREATE INDEX ix_audit_logs_user_id_created_at "
+        "ON audit_logs (user_id, created_at, id)"
+    )
+    op.execute(
+        f"INSERT INTO audit_logs ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM audit_logs_partitioned"
+    )
+    # Dropping the parent drops every attached partition with it
+    op.execute("DROP TABLE audit_logs_partitioned")
@@ -0,0 +1,82 @@
+"""Full-text search columns and indexes for STAR stories and case studies
+
+PostgreSQL: adds a generated, stored ``search_vector`` tsvector column to
+star_stories and case_studies (title weighted above the body), a GIN index
+on it, and pg_trgm GIN indexes on the titles for typeahead. Adding a stored
+generated column rewrites the table once.
+
+SQLite: creates the FTS5 tables and sync triggers from database/search.py.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+
+from star_competency_app.database.migration_utils import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+from star_competency_app.database.search import SEARCH_TARGETS, ensure_sqlite_fts
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def _search_vector_sql(target):
+    body = " || ' ' || ".join(f"coalesce({c}, '')" for c in target["body"])
+    return (
+        f"setweight(to_tsvector('english', coalesce({target['title']}, '')), 'A') || "
+        f"setweight(to_tsvector('english', {body}), 'B')"
+    )
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name != "postgresql":
+        ensure_sqlite_fts(bind)
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for target in SEARCH_TARGETS.values():
+        table = target["table"]
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({_search_vector_sql(target)}) STORED"
+        )
+
+    for target in SEARCH_TARGETS.values():
+        table = target["table"]
+        create_index_concurrently(
+            f"ix_{table}_search_vector", table, ["search_vector"], using="gin"
+        )
+        create_index_concurrently(
+            f"ix_{table}_title_trgm",
+            table,
+            [f"{target['title']} gin_trgm_ops"],
+            using="gin",
+        )
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name != "postgresql":
+        for target in SEARCH_TARGETS.values():
+            fts = f"{target['table']}_fts"
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+            op.execute(f"DROP TABLE IF EXISTS {fts}")
+        return
+
+    for target in SEARCH_TARGETS.values():
+        table = target["table"]
+        drop_index_concurrently(f"ix_{table}_title_trgm")
+        drop_index_concurrently(f"ix_{table}_search_vector")
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,45 @@
+"""Add the user_stats counter table and backfill it
+
+One row per user with story, case study and AI request counts and the time
+of their last activity, maintained by DatabaseManager and the audit log
+writer. The backfill is the same bulk recompute that
+`scripts/db_maintenance.py repair-user-stats` runs.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from star_competency_app.database.user_stats import recompute_user_stats
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "user_stats",
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("star_stories_count", sa.Integer(), nullable=False),
+        sa.Column("case_studies_count", sa.Integer(), nullable=False),
+        sa.Column("ai_requests_count", sa.Integer(), nullable=False),
+        sa.Column("last_activity_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+        if_not_exists=True,
+    )
+    recompute_user_stats(op.get_bind())
+
+
+def downgrade():
+    op.drop_table("user_stats")
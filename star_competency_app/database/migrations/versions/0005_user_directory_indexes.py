@@ -0,0 +1,46 @@
+"""Indexes for the paginated admin user directory
+
+A (display_name, id) index serves the keyset-paginated listing. On
+PostgreSQL, lower(display_name) and lower(email) text_pattern_ops indexes
+serve the case-insensitive prefix search (LIKE 'abc%') under any collation.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+
+from star_competency_app.database.migration_utils import (
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+PREFIX_INDEXES = [
+    ("ix_users_lower_display_name_prefix", "lower(display_name) text_pattern_ops"),
+    ("ix_users_lower_email_prefix", "lower(email) text_pattern_ops"),
+]
+
+
+def upgrade():
+    create_index_concurrently(
+        "ix_users_display_name_id", "users", ["display_name", "id"]
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        for name, expression in PREFIX_INDEXES:
+            create_index_concurrently(name, "users", [expression])
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        for name, _ in reversed(PREFIX_INDEXES):
+            drop_index_concurrently(name)
+
+    drop_index_concurrently("ix_users_display_name_id")
@@ -0,0 +1,110 @@
+"""Summary tables for organisation-wide competency coverage
+
+Adds star_stories.ai_score (the overall score of the latest evaluation),
+the per-user and per-competency coverage summary tables and their refresh
+watermark, plus an index on user_stats.updated_at, which incremental
+refreshes use to find users whose stories changed. The summary is then
+built with a full refresh, the same one that
+`scripts/db_maintenance.py refresh-coverage --full` runs; this migration,
+not DatabaseManager.create_tables(), owns that backfill, since only here
+is ai_score known to exist.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+
+"""
+import sqlalchemy as sa
+from alembic import context, op
+
+from star_competency_app.database.coverage_summary import refresh_coverage_summary
+from star_competency_app.database.migration_utils import (
+    add_column_if_missing,
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def _count_columns():
+    return [
+        sa.Column("story_count", sa.Integer(), nullable=False),
+        sa.Column("scored_count", sa.Integer(), nullable=False),
+        sa.Column("score_sum", sa.Float(), nullable=False),
+        *[
+            sa.Column(f"score_{bucket}", sa.Integer(), nullable=False)
+            for bucket in range(1, 6)
+        ],
+    ]
+
+
+def upgrade():
+    add_column_if_missing("star_stories", sa.Column("ai_score", sa.Float()))
+
+    op.create_table(
+        "user_competency_coverage",
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "competency_id",
+            sa.Integer(),
+            sa.ForeignKey("competencies.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        *_count_columns(),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_user_competency_coverage_competency_id",
+        "user_competency_coverage",
+        ["competency_id"],
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "competency_coverage_summary",
+        sa.Column(
+            "competency_id",
+            sa.Integer(),
+            sa.ForeignKey("competencies.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        *_count_columns(),
+        sa.Column("users_covered", sa.Integer(), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime()),
+        if_not_exists=True,
+    )
+
+    op.create_table(
+        "summary_refreshes",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("watermark", sa.DateTime()),
+        sa.Column("refreshed_at", sa.DateTime()),
+        sa.Column("duration_ms", sa.Integer()),
+        sa.Column("rows_refreshed", sa.Integer()),
+        if_not_exists=True,
+    )
+
+    # Build the summary now; with --sql there is nothing to read yet, and
+    # the first scheduled refresh does a full build instead
+    if not context.is_offline_mode():
+        refresh_coverage_summary(op.get_bind(), full=True)
+
+    create_index_concurrently("ix_user_stats_updated_at", "user_stats", ["updated_at"])
+
+
+def downgrade():
+    drop_index_concurrently("ix_user_stats_updated_at")
+    op.drop_table("summary_refreshes")
+    op.drop_table("competency_coverage_summary")
+    op.drop_table("user_competency_coverage")
+    op.drop_column("star_stories", "ai_score")
@@ -0,0 +1,94 @@
+"""Move AI feedback and analysis text out of the story and case study rows
+
+star_stories.ai_feedback and case_studies.claude_analysis become versioned
+rows in star_story_feedback and case_study_analyses. The parent rows keep
+only the number of their latest version (ai_feedback_version,
+analysis_version), so list scans no longer drag the text along. Existing
+text is copied in as version 1.
+
+The copy clears the old column in the same UPDATE that sets the version, so
+on PostgreSQL the large values stop being referenced before the column is
+dropped; the space is reused after the next (auto)vacuum.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from star_competency_app.database.migration_utils import (
+    add_column_if_missing,
+    has_column,
+)
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+# (parent table, old text column, version column, side table, side table key)
+AI_OUTPUTS = [
+    (
+        "star_stories",
+        "ai_feedback",
+        "ai_feedback_version",
+        "star_story_feedback",
+        "story_id",
+    ),
+    (
+        "case_studies",
+        "claude_analysis",
+        "analysis_version",
+        "case_study_analyses",
+        "case_study_id",
+    ),
+]
+
+
+def upgrade():
+    for parent, text_column, version_column, side_table, key in AI_OUTPUTS:
+        op.create_table(
+            side_table,
+            sa.Column(
+                key,
+                sa.Integer(),
+                sa.ForeignKey(f"{parent}.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column("version", sa.Integer(), primary_key=True),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.DateTime()),
+            if_not_exists=True,
+        )
+        add_column_if_missing(parent, sa.Column(version_column, sa.Integer()))
+        # Tables built by create_tables() from the current models never had it
+        if not has_column(parent, text_column, offline=True):
+            continue
+
+        op.execute(
+            f"INSERT INTO {side_table} ({key}, version, content, created_at) "
+            f"SELECT id, 1, {text_column}, COALESCE(updated_at, created_at) "
+            f"FROM {parent} WHERE {text_column} IS NOT NULL"
+        )
+        op.execute(
+            f"UPDATE {parent} SET {version_column} = 1, {text_column} = NULL "
+            f"WHERE {text_column} IS NOT NULL"
+        )
+        op.drop_column(parent, text_column)
+
+
+def downgrade():
+    for parent, text_column, version_column, side_table, key in reversed(AI_OUTPUTS):
+        op.add_column(parent, sa.Column(text_column, sa.Text()))
+        op.execute(
+            f"UPDATE {parent} SET {text_column} = ("
+            f"SELECT content FROM {side_table} "
+            f"WHERE {side_table}.{key} = {parent}.id "
+            f"AND {side_table}.version = {parent}.{version_column}"
+            f") WHERE {version_column} IS NOT NULL"
+        )
+        op.drop_column(parent, version_column)
+        op.drop_table(side_table)
@@ -0,0 +1,56 @@
+"""Add the jobs table for the background AI job queue
+
+Workers claim runnable jobs ordered by (run_after, id) for a given status
+with SELECT ... FOR UPDATE SKIP LOCKED; see database/job_queue.py.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("result", sa.JSON()),
+        sa.Column("error", sa.Text()),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=False),
+        sa.Column("run_after", sa.DateTime(), nullable=False),
+        sa.Column("locked_by", sa.String()),
+        sa.Column("locked_until", sa.DateTime()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+        sa.Column("finished_at", sa.DateTime()),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_jobs_status_run_after",
+        "jobs",
+        ["status", "run_after", "id"],
+        if_not_exists=True,
+    )
+    op.create_index("ix_jobs_finished_at", "jobs", ["finished_at"], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_table("jobs")
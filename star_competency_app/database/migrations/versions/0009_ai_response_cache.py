@@ -0,0 +1,52 @@
+"""Add the ai_response_cache table behind the in-process AI response cache
+
+Entries expire by expires_at and are evicted least-recently-used first
+(last_used_at) once the table grows past AI_CACHE_MAX_ROWS; see
+database/ai_response_store.py.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "ai_response_cache",
+        sa.Column("key", sa.String(64), primary_key=True),
+        sa.Column("task", sa.String(), nullable=False),
+        sa.Column("model", sa.String(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("prompt_tokens", sa.Integer(), nullable=False),
+        sa.Column("completion_tokens", sa.Integer(), nullable=False),
+        sa.Column("hits", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("last_used_at", sa.DateTime()),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_ai_response_cache_expires_at",
+        "ai_response_cache",
+        ["expires_at"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_ai_response_cache_last_used_at",
+        "ai_response_cache",
+        ["last_used_at"],
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table("ai_response_cache")
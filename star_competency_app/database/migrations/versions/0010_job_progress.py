@@ -0,0 +1,25 @@
+"""Add jobs.progress for long-running jobs such as evaluate-all
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from star_competency_app.database.migration_utils import add_column_if_missing
+
+# revision identifiers, used by Alembic.
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    add_column_if_missing("jobs", sa.Column("progress", sa.JSON()))
+
+
+def downgrade():
+    op.drop_column("jobs", "progress")
@@ -0,0 +1,52 @@
+"""Add the rescore_batches table checkpointing bulk re-scoring runs
+
+Each row is one provider batch submission covering a range of story IDs;
+a unique (run, first_story_id) index stops two runners resuming the same
+run from submitting a range twice. See ai/batch_rescore.py.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "rescore_batches",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("run", sa.String(), nullable=False),
+        sa.Column("provider", sa.String(), nullable=False),
+        sa.Column("first_story_id", sa.Integer(), nullable=False),
+        sa.Column("last_story_id", sa.Integer(), nullable=False),
+        sa.Column("request_count", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("batch_id", sa.String()),
+        sa.Column("succeeded", sa.Integer(), nullable=False),
+        sa.Column("failed", sa.Integer(), nullable=False),
+        sa.Column("skipped", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("submitted_at", sa.DateTime()),
+        sa.Column("finished_at", sa.DateTime()),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_rescore_batches_run_first_story",
+        "rescore_batches",
+        ["run", "first_story_id"],
+        unique=True,
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table("rescore_batches")
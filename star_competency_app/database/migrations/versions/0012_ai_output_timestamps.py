@@ -0,0 +1,58 @@
+"""Track when AI output was stored apart from updated_at
+
+Adds star_stories.feedback_at and case_studies.analysis_at. Storing AI
+feedback or an analysis no longer bumps updated_at, which orders the story
+and case study lists and marks a story as edited since its evaluation.
+Both columns are backfilled from the creation time of the latest version
+in star_story_feedback / case_study_analyses.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-17
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from star_competency_app.database.migration_utils import add_column_if_missing
+
+# revision identifiers, used by Alembic.
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+# (parent table, timestamp column, version column, side table, side table key)
+AI_OUTPUTS = [
+    (
+        "star_stories",
+        "feedback_at",
+        "ai_feedback_version",
+        "star_story_feedback",
+        "story_id",
+    ),
+    (
+        "case_studies",
+        "analysis_at",
+        "analysis_version",
+        "case_study_analyses",
+        "case_study_id",
+    ),
+]
+
+
+def upgrade():
+    for parent, column, version_column, side_table, key in AI_OUTPUTS:
+        add_column_if_missing(parent, sa.Column(column, sa.DateTime()))
+        op.execute(
+            f"UPDATE {parent} SET {column} = ("
+            f"SELECT created_at FROM {side_table} "
+            f"WHERE {side_table}.{key} = {parent}.id "
+            f"AND {side_table}.version = {parent}.{version_column}"
+            f") WHERE {version_column} IS NOT NULL AND {column} IS NULL"
+        )
+
+
+def downgrade():
+    for parent, column, *_ in reversed(AI_OUTPUTS):
+        op.drop_column(parent, column)
@@ -6,7 +6,9 @@ from sqlalchemy import (
     Boolean,
     Column,
     DateTime,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -34,6 +36,14 @@ class User(UserMixin, Base):
     case_studies = relationship(
         "CaseStudy", back_populates="user", cascade="all, delete-orphan"
     )
+    stats = relationship(
+        "UserStats", back_populates="user", uselist=False, cascade="all, delete-orphan"
+    )
+
+    __table_args__ = (
+        # Admin user directory: ORDER BY display_name, id with keyset paging
+        Index("ix_users_display_name_id", "display_name", "id"),
+    )
 
     def __repr__(self):
         return f"<User {self.display_name}>"
@@ -86,6 +96,37 @@ class User(UserMixin, Base):
             return ""
 
 
+class UserStats(Base):
+    """
+    Denormalised per-user counters.
+
+    Maintained in the same transaction as the writes they count (see
+    database/user_stats.py); `db_maintenance.py repair-user-stats`
+    recomputes them from the source tables.
+    """
+
+    __tablename__ = "user_stats"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    star_stories_count = Column(Integer, nullable=False, default=0)
+    case_studies_count = Column(Integer, nullable=False, default=0)
+    ai_requests_count = Column(Integer, nullable=False, default=0)
+    last_activity_at = Column(DateTime)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    user = relationship("User", back_populates="stats")
+
+    __table_args__ = (
+        # Incremental summary refreshes: users changed since a watermark
+        Index("ix_user_stats_updated_at", "updated_at"),
+    )
+
+    def __repr__(self):
+        return f"<UserStats {self.user_id}>"
+
+
 class Competency(Base):
     __tablename__ = "competencies"
 
@@ -115,17 +156,56 @@ class STARStory(Base):
     task = Column(Text)
     action = Column(Text)
     result = Column(Text)
-    ai_feedback = Column(Text)
+    # Latest row in star_story_feedback; the text itself lives there
+    ai_feedback_version = Column(Integer)
+    ai_score = Column(Float)  # Overall score (1-5) from the latest AI evaluation
+    # When the latest AI evaluation was stored; updated_at is for user edits
+    feedback_at = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     user = relationship("User", back_populates="star_stories")
     competency = relationship("Competency", back_populates="star_stories")
+    # Only loaded on request (get_star_story_by_id(..., with_ai_output=True))
+    latest_feedback = relationship(
+        "STARStoryFeedback",
+        primaryjoin="and_(STARStory.id == foreign(STARStoryFeedback.story_id), "
+        "STARStory.ai_feedback_version == STARStoryFeedback.version)",
+        uselist=False,
+        viewonly=True,
+        lazy="raise",
+    )
+
+    __table_args__ = (
+        # Story lists and recent stories: WHERE user_id ORDER BY updated_at, id
+        Index("ix_star_stories_user_id_updated_at", "user_id", "updated_at", "id"),
+        # Per-user competency coverage: WHERE user_id GROUP BY competency_id
+        Index("ix_star_stories_user_id_competency_id", "user_id", "competency_id"),
+        # is_competency_in_use() and competency deletes
+        Index("ix_star_stories_competency_id", "competency_id"),
+    )
+
+    @property
+    def ai_feedback(self):
+        return self.latest_feedback.content if self.latest_feedback else None
 
     def __repr__(self):
         return f"<STARStory {self.title}>"
 
 
+class STARStoryFeedback(Base):
+    """One version of the AI evaluation of a STAR story."""
+
+    __tablename__ = "star_story_feedback"
+
+    story_id = Column(
+        Integer, ForeignKey("star_stories.id", ondelete="CASCADE"), primary_key=True
+    )
+    version = Column(Integer, primary_key=True)
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class CaseStudy(Base):
     __tablename__ = "case_studies"
 
@@ -134,16 +214,49 @@ class CaseStudy(Base):
     title = Column(String, nullable=False)
     description = Column(Text)
     image_path = Column(String)
-    claude_analysis = Column(Text)
+    # Latest row in case_study_analyses; the text itself lives there
+    analysis_version = Column(Integer)
+    # When the latest AI analysis was stored; updated_at is for user edits
+    analysis_at = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     user = relationship("User", back_populates="case_studies")
+    # Only loaded on request (get_case_study_by_id(..., with_ai_output=True))
+    latest_analysis = relationship(
+        "CaseStudyAnalysis",
+        primaryjoin="and_(CaseStudy.id == foreign(CaseStudyAnalysis.case_study_id), "
+        "CaseStudy.analysis_version == CaseStudyAnalysis.version)",
+        uselist=False,
+        viewonly=True,
+        lazy="raise",
+    )
+
+    __table_args__ = (
+        Index("ix_case_studies_user_id_updated_at", "user_id", "updated_at", "id"),
+    )
+
+    @property
+    def claude_analysis(self):
+        return self.latest_analysis.content if self.latest_analysis else None
 
     def __repr__(self):
         return f"<CaseStudy {self.title}>"
 
 
+class CaseStudyAnalysis(Base):
+    """One version of the AI analysis of a case study."""
+
+    __tablename__ = "case_study_analyses"
+
+    case_study_id = Column(
+        Integer, ForeignKey("case_studies.id", ondelete="CASCADE"), primary_key=True
+    )
+    version = Column(Integer, primary_key=True)
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class AuditLog(Base):
     __tablename__ = "audit_logs"
 
@@ -155,5 +268,188 @@ class AuditLog(Base):
     details = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_audit_logs_user_id_created_at", "user_id", "created_at", "id"),
+    )
+
     def __repr__(self):
         return f"<AuditLog {self.action} on {self.entity_type}>"
+
+
+class Job(Base):
+    """
+    A background task (an AI call) queued by the web app and run by a worker.
+
+    See database/job_queue.py for the claim / complete / retry life cycle.
+    """
+
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    kind = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    status = Column(String, nullable=False, default="queued")
+    result = Column(JSON)
+    # Reported by long-running tasks while they run, e.g. {"done": 3, "total": 9}
+    progress = Column(JSON)
+    error = Column(Text)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    # Earliest time the job may be claimed (now, or later after a failure)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # Worker holding the job and when its claim expires (visibility timeout)
+    locked_by = Column(String)
+    locked_until = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        # Claiming: WHERE status ... ORDER BY run_after, id
+        Index("ix_jobs_status_run_after", "status", "run_after", "id"),
+        # Purging finished jobs
+        Index("ix_jobs_finished_at", "finished_at"),
+    )
+
+    def __repr__(self):
+        return f"<Job {self.id} {self.kind} {self.status}>"
+
+
+class AIResponseCacheEntry(Base):
+    """
+    A cached AI completion, shared by every process.
+
+    The tier behind the in-process LRU in ai/response_cache.py; key is a
+    hash of the model, prompt, parameters and competency content.
+    """
+
+    __tablename__ = "ai_response_cache"
+
+    key = Column(String(64), primary_key=True)
+    task = Column(String, nullable=False)
+    model = Column(String, nullable=False)
+    content = Column(Text, nullable=False)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    hits = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # TTL purge
+        Index("ix_ai_response_cache_expires_at", "expires_at"),
+        # Size-based eviction of the least recently used entries
+        Index("ix_ai_response_cache_last_used_at", "last_used_at"),
+    )
+
+    def __repr__(self):
+        return f"<AIResponseCacheEntry {self.key[:12]} {self.task}>"
+
+
+class RescoreBatch(Base):
+    """
+    One provider batch submission of a bulk re-scoring run.
+
+    Each row covers a contiguous range of story IDs, so the rows of a run
+    are its checkpoint: a restarted run resubmits unsubmitted rows, polls
+    submitted ones and continues after the highest last_story_id. See
+    ai/batch_rescore.py.
+    """
+
+    __tablename__ = "rescore_batches"
+
+    id = Column(Integer, primary_key=True)
+    run = Column(String, nullable=False)
+    provider = Column(String, nullable=False)
+    first_story_id = Column(Integer, nullable=False)
+    last_story_id = Column(Integer, nullable=False)
+    request_count = Column(Integer, nullable=False)
+    # pending (recorded, not yet submitted), submitted, applied or failed
+    status = Column(String, nullable=False, default="pending")
+    # The provider's batch ID once submitted
+    batch_id = Column(String)
+    succeeded = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    # Stories edited or deleted after submission, whose results are stale
+    skipped = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    submitted_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    __table_args__ = (
+        # Two runners resuming the same run cannot both submit a range
+        Index(
+            "ix_rescore_batches_run_first_story", "run", "first_story_id", unique=True
+        ),
+    )
+
+    def __repr__(self):
+        return f"<RescoreBatch {self.id} {self.run} {self.status}>"
+
+
+class UserCompetencyCoverage(Base):
+    """
+    Per-user, per-competency story aggregates.
+
+    The incrementally refreshed layer behind CompetencyCoverageSummary
+    (see database/coverage_summary.py); only users whose content changed
+    since the last refresh are recomputed.
+    """
+
+    __tablename__ = "user_competency_coverage"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    competency_id = Column(
+        Integer, ForeignKey("competencies.id", ondelete="CASCADE"), primary_key=True
+    )
+    story_count = Column(Integer, nullable=False, default=0)
+    scored_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0)
+    score_1 = Column(Integer, nullable=False, default=0)
+    score_2 = Column(Integer, nullable=False, default=0)
+    score_3 = Column(Integer, nullable=False, default=0)
+    score_4 = Column(Integer, nullable=False, default=0)
+    score_5 = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_user_competency_coverage_competency_id", "competency_id"),
+    )
+
+
+class CompetencyCoverageSummary(Base):
+    """Organisation-wide coverage per competency, served to the admin analytics page."""
+
+    __tablename__ = "competency_coverage_summary"
+
+    competency_id = Column(
+        Integer, ForeignKey("competencies.id", ondelete="CASCADE"), primary_key=True
+    )
+    story_count = Column(Integer, nullable=False, default=0)
+    users_covered = Column(Integer, nullable=False, default=0)
+    scored_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0)
+    score_1 = Column(Integer, nullable=False, default=0)
+    score_2 = Column(Integer, nullable=False, default=0)
+    score_3 = Column(Integer, nullable=False, default=0)
+    score_4 = Column(Integer, nullable=False, default=0)
+    score_5 = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime)
+
+
+class SummaryRefresh(Base):
+    """Watermark and timing of the last refresh of a summary table."""
+
+    __tablename__ = "summary_refreshes"
+
+    name = Column(String, primary_key=True)
+    watermark = Column(DateTime)
+    refreshed_at = Column(DateTime)
+    duration_ms = Column(Integer)
+    rows_refreshed = Column(Integer)
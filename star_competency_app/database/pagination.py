@@ -0,0 +1,105 @@
+# star_competency_app/database/pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple, Union
+
+from sqlalchemy import DateTime, and_, or_
+
+# Totals are counted up to this many rows; beyond it pages report "cap+"
+TOTAL_COUNT_CAP = 1000
+
+
+class Page:
+    """A single page of keyset-paginated results."""
+
+    def __init__(
+        self,
+        items: List[Any],
+        next_cursor: Optional[str] = None,
+        total: Optional[int] = None,
+        total_capped: bool = False,
+    ):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.total = total
+        self.total_capped = total_capped
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def __repr__(self):
+        return f"<Page items={len(self.items)} has_next={self.has_next}>"
+
+
+def encode_cursor(sort_value: Union[datetime, str], row_id: int) -> str:
+    """
+    Encode the position of the last row on a page as an opaque cursor.
+
+    Args:
+        sort_value: Value of the keyset sort column for the row
+        row_id: Primary key of the row, used as the tie-breaker
+
+    Returns:
+        URL-safe cursor string
+    """
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str, as_datetime: bool = True
+) -> Tuple[Union[datetime, str], int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string
+        as_datetime: Parse the sort value as a timestamp (else keep the string)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if as_datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        elif not isinstance(sort_value, str):
+            raise TypeError("sort value must be a string")
+        return sort_value, int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid page cursor: {cursor!r}") from e
+
+
+def keyset_filter(sort_column, id_column, cursor: str, descending: bool = True):
+    """
+    Build the WHERE clause selecting rows after a cursor.
+
+    Uses an expanded OR rather than a row-value comparison so the same
+    predicate works on PostgreSQL and SQLite.
+    """
+    sort_value, row_id = decode_cursor(
+        cursor, as_datetime=isinstance(sort_column.type, DateTime)
+    )
+    if descending:
+        return or_(
+            sort_column < sort_value,
+            and_(sort_column == sort_value, id_column < row_id),
+        )
+    return or_(
+        sort_column > sort_value,
+        and_(sort_column == sort_value, id_column > row_id),
+    )
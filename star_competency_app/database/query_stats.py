@@ -0,0 +1,208 @@
+# star_competency_app/database/query_stats.py
+"""
+Per-request SQL statement instrumentation.
+
+Engine event hooks time every statement executed inside a Flask request
+and collect them on ``g.query_stats``. After the request, a warning is
+logged if the request issued more statements than QUERY_BUDGET or ran
+the same statement shape QUERY_REPEAT_THRESHOLD times or more (the usual
+signature of an N+1 lazy load). In debug mode a short summary is added to
+the response headers.
+
+Statements slower than DB_SLOW_QUERY_MS, inside a request or not, go to
+the "slow_query" logger with a fingerprint of their bound parameters.
+"""
+import hashlib
+import heapq
+import json
+import logging
+import re
+import time
+from collections import Counter
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from star_competency_app.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("slow_query")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN \((?:[^()]*)\)", re.IGNORECASE)
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Reduce a SQL statement to its shape for repeat detection.
+
+    Literals and IN lists are replaced so that the same query issued with
+    different parameters maps to the same shape.
+    """
+    shape = _WHITESPACE_RE.sub(" ", statement).strip()
+    shape = _STRING_RE.sub("?", shape)
+    shape = _NUMBER_RE.sub("?", shape)
+    shape = _IN_LIST_RE.sub("IN (...)", shape)
+    return shape
+
+
+def parameter_fingerprint(parameters) -> str:
+    """
+    Short hash of a statement's bound parameters.
+
+    Lets repeated slow calls with identical arguments be correlated in the
+    slow-query log without writing user data (emails, story text) to it.
+    """
+    payload = json.dumps(parameters, default=str, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:12]
+
+
+def _log_slow_query(statement, parameters, elapsed_ms, error=None):
+    shape = statement_shape(statement)
+    shape_hash = hashlib.sha256(shape.encode()).hexdigest()[:12]
+    outcome = f"failed ({type(error).__name__})" if error is not None else "ok"
+    slow_query_logger.warning(
+        f"{elapsed_ms:.1f} ms {outcome} shape={shape_hash} "
+        f"params={parameter_fingerprint(parameters)} sql={shape[:500]}"
+    )
+
+
+class RequestQueryStats:
+    """Statement count, DB time and slowest statements for one request."""
+
+    def __init__(self, request_id=None, keep_slowest=5):
+        self.request_id = request_id
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes = Counter()
+        self._keep_slowest = keep_slowest
+        self._slowest = []  # min-heap of (elapsed_ms, seq, statement)
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.shapes[statement_shape(statement)] += 1
+
+        item = (elapsed_ms, self.count, statement)
+        if len(self._slowest) < self._keep_slowest:
+            heapq.heappush(self._slowest, item)
+        elif elapsed_ms > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, item)
+
+    @property
+    def slowest(self):
+        """The slowest statements as (elapsed_ms, statement), slowest first."""
+        return [(ms, sql) for ms, _, sql in sorted(self._slowest, reverse=True)]
+
+    def repeated(self, threshold: int):
+        """Statement shapes executed at least threshold times."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def summary(self):
+        return {
+            "request_id": self.request_id,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 2),
+            "slowest": [
+                {"ms": round(ms, 2), "statement": statement_shape(sql)[:200]}
+                for ms, sql in self.slowest
+            ],
+        }
+
+
+def current_query_stats(create=True):
+    """Return the RequestQueryStats for the current request, if any."""
+    if not has_request_context():
+        return None
+    stats = g.get("query_stats")
+    if stats is None and create:
+        stats = g.query_stats = RequestQueryStats(
+            request_id=g.get("request_id"),
+            keep_slowest=get_settings().QUERY_SLOWEST_KEEP,
+        )
+    return stats
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    elapsed_ms = (time.perf_counter() - start_times.pop()) * 1000
+
+    slow_ms = get_settings().DB_SLOW_QUERY_MS
+    if slow_ms and elapsed_ms >= slow_ms:
+        _log_slow_query(statement, parameters, elapsed_ms)
+
+    stats = current_query_stats()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its timer
+    conn = exception_context.connection
+    if conn is None or not conn.info.get("query_start_time"):
+        return
+    elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+
+    # Statement and lock timeouts are slow by definition; log them too
+    slow_ms = get_settings().DB_SLOW_QUERY_MS
+    if exception_context.statement and slow_ms and elapsed_ms >= slow_ms:
+        _log_slow_query(
+            exception_context.statement,
+            exception_context.parameters,
+            elapsed_ms,
+            error=exception_context.original_exception,
+        )
+
+
+def instrument_engine(engine):
+    """Attach the statement timing hooks to an engine (idempotent)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+def _report_query_stats(response):
+    """Warn about budget overruns and repeated statements; add debug headers."""
+    stats = current_query_stats(create=False)
+    if stats is None:
+        return response
+
+    settings = get_settings()
+    # Backfill the ID in case statements ran before security_before_request
+    stats.request_id = stats.request_id or g.get("request_id")
+
+    if stats.count > settings.QUERY_BUDGET:
+        logger.warning(
+            f"[{stats.request_id}] {request.method} {request.path} issued "
+            f"{stats.count} SQL statements (budget {settings.QUERY_BUDGET}, "
+            f"{stats.total_ms:.1f} ms)"
+        )
+    for shape, n in stats.repeated(settings.QUERY_REPEAT_THRESHOLD):
+        logger.warning(
+            f"[{stats.request_id}] {request.method} {request.path} repeated a "
+            f"statement {n} times (possible N+1): {shape[:200]}"
+        )
+
+    if settings.QUERY_DEBUG_HEADERS:
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Time-Ms"] = f"{stats.total_ms:.2f}"
+        if stats.slowest:
+            response.headers["X-DB-Slowest-Ms"] = f"{stats.slowest[0][0]:.2f}"
+
+    logger.debug(f"SQL stats for {request.path}: {stats.summary()}")
+    return response
+
+
+def init_query_stats(app, engine):
+    """Instrument an engine and report per-request SQL stats for a Flask app."""
+    instrument_engine(engine)
+    app.after_request(_report_query_stats)
@@ -0,0 +1,198 @@
+# star_competency_app/database/read_models.py
+"""
+Compact, column-projected rows for list views.
+
+List pages only need a handful of columns, so instead of full ORM
+instances (with every Text column loaded) they receive these slotted
+objects built from a narrow SELECT.
+"""
+from sqlalchemy import func
+
+from star_competency_app.database.models import (
+    CaseStudy,
+    Competency,
+    STARStory,
+    User,
+    UserStats,
+)
+
+# Characters of a case study description shown on list cards
+CASE_STUDY_SUMMARY_LENGTH = 200
+
+
+class StoryListRow:
+    """A STAR story as shown in story lists and on the dashboard."""
+
+    __slots__ = (
+        "id",
+        "title",
+        "competency_id",
+        "competency_name",
+        "created_at",
+        "updated_at",
+        "has_ai_feedback",
+    )
+
+    def __init__(
+        self,
+        id,
+        title,
+        competency_id,
+        competency_name,
+        created_at,
+        updated_at,
+        has_ai_feedback,
+    ):
+        self.id = id
+        self.title = title
+        self.competency_id = competency_id
+        self.competency_name = competency_name
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.has_ai_feedback = bool(has_ai_feedback)
+
+    @staticmethod
+    def columns():
+        """Columns to select, in constructor order."""
+        return (
+            STARStory.id,
+            STARStory.title,
+            STARStory.competency_id,
+            Competency.name.label("competency_name"),
+            STARStory.created_at,
+            STARStory.updated_at,
+            STARStory.ai_feedback_version.isnot(None).label("has_ai_feedback"),
+        )
+
+    @staticmethod
+    def outerjoins():
+        """Relationships to LEFT OUTER JOIN for the projected columns."""
+        return (STARStory.competency,)
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+    def __repr__(self):
+        return f"<StoryListRow {self.id} {self.title!r}>"
+
+
+class CaseStudyListRow:
+    """A case study as shown in case study lists and on the dashboard."""
+
+    __slots__ = (
+        "id",
+        "title",
+        "summary",
+        "image_path",
+        "created_at",
+        "updated_at",
+        "has_analysis",
+    )
+
+    def __init__(
+        self, id, title, summary, image_path, created_at, updated_at, has_analysis
+    ):
+        self.id = id
+        self.title = title
+        self.summary = summary
+        self.image_path = image_path
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.has_analysis = bool(has_analysis)
+
+    @staticmethod
+    def columns():
+        """Columns to select, in constructor order."""
+        return (
+            CaseStudy.id,
+            CaseStudy.title,
+            func.substr(CaseStudy.description, 1, CASE_STUDY_SUMMARY_LENGTH).label(
+                "summary"
+            ),
+            CaseStudy.image_path,
+            CaseStudy.created_at,
+            CaseStudy.updated_at,
+            CaseStudy.analysis_version.isnot(None).label("has_analysis"),
+        )
+
+    @staticmethod
+    def outerjoins():
+        """Relationships to LEFT OUTER JOIN for the projected columns."""
+        return ()
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+    def __repr__(self):
+        return f"<CaseStudyListRow {self.id} {self.title!r}>"
+
+
+class UserDirectoryRow:
+    """A user as listed in the admin user directory, with their counters."""
+
+    __slots__ = (
+        "id",
+        "display_name",
+        "email",
+        "is_admin",
+        "is_active",
+        "created_at",
+        "star_stories_count",
+        "case_studies_count",
+        "ai_requests_count",
+        "last_activity_at",
+    )
+
+    def __init__(
+        self,
+        id,
+        display_name,
+        email,
+        is_admin,
+        is_active,
+        created_at,
+        star_stories_count,
+        case_studies_count,
+        ai_requests_count,
+        last_activity_at,
+    ):
+        self.id = id
+        self.display_name = display_name
+        self.email = email
+        self.is_admin = bool(is_admin)
+        self.is_active = bool(is_active)
+        self.created_at = created_at
+        self.star_stories_count = star_stories_count
+        self.case_studies_count = case_studies_count
+        self.ai_requests_count = ai_requests_count
+        self.last_activity_at = last_activity_at
+
+    @staticmethod
+    def columns():
+        """Columns to select, in constructor order."""
+        return (
+            User.id,
+            User.display_name,
+            User.email,
+            User.is_admin,
+            User.is_active,
+            User.created_at,
+            func.coalesce(UserStats.star_stories_count, 0).label("star_stories_count"),
+            func.coalesce(UserStats.case_studies_count, 0).label("case_studies_count"),
+            func.coalesce(UserStats.ai_requests_count, 0).label("ai_requests_count"),
+            UserStats.last_activity_at,
+        )
+
+    @staticmethod
+    def outerjoins():
+        """Relationships to LEFT OUTER JOIN for the projected columns."""
+        return (User.stats,)
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+    def __repr__(self):
+        return f"<UserDirectoryRow {self.id} {self.display_name!r}>"
@@ -0,0 +1,62 @@
+# star_competency_app/database/replicas.py
+import itertools
+import logging
+import threading
+import time
+
+from star_competency_app.database.engine import get_engine
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaRouter:
+    """
+    Round-robin selection over read-replica engines with simple health checks.
+
+    A replica that fails to hand out a connection is marked down and skipped
+    for retry_interval seconds; after that it is tried again. When every
+    replica is down, choose() returns None and callers use the primary.
+    """
+
+    def __init__(self, urls, retry_interval=10):
+        self.engines = [get_engine(url) for url in urls]
+        self.retry_interval = retry_interval
+        self._cycle = itertools.cycle(range(len(self.engines)))
+        self._down_until = {}
+        self._failures = {}
+        self._lock = threading.Lock()
+
+    def choose(self, exclude=()):
+        """Return the next healthy replica engine, or None if there is none."""
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.engines)):
+                engine = self.engines[next(self._cycle)]
+                if engine in exclude:
+                    continue
+                if self._down_until.get(engine, 0) <= now:
+                    return engine
+        return None
+
+    def mark_down(self, engine, error=None):
+        """Take a replica out of rotation for retry_interval seconds."""
+        with self._lock:
+            self._down_until[engine] = time.monotonic() + self.retry_interval
+            self._failures[engine] = self._failures.get(engine, 0) + 1
+        logger.warning(
+            f"Read replica {engine.url.render_as_string(hide_password=True)} "
+            f"marked down for {self.retry_interval}s: {error}"
+        )
+
+    def status(self):
+        """Return health information for each replica."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "url": engine.url.render_as_string(hide_password=True),
+                    "healthy": self._down_until.get(engine, 0) <= now,
+                    "failures": self._failures.get(engine, 0),
+                }
+                for engine in self.engines
+            ]
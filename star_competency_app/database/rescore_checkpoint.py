@@ -0,0 +1,86 @@
+# star_competency_app/database/rescore_checkpoint.py
+"""
+Checkpoint of bulk re-scoring runs, in the rescore_batches table.
+
+A run walks the story corpus in ID order and submits it chunk by chunk to
+a provider's batch API (ai/batch_rescore.py). Each chunk is recorded here
+before it is submitted and updated as it moves on, so a run that dies at
+any point resumes where it stopped instead of paying for stories twice:
+
+    pending -> submitted -> applied
+                         -> failed
+"""
+import logging
+from datetime import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from star_competency_app.database.models import RescoreBatch
+
+logger = logging.getLogger(__name__)
+
+_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def load_batches(conn, run):
+    """Return a run's batches in story order."""
+    table = RescoreBatch.__table__
+    return conn.execute(
+        select(table).where(table.c.run == run).order_by(table.c.first_story_id)
+    ).all()
+
+
+def record_batch(conn, run, provider, first_story_id, last_story_id, request_count):
+    """
+    Record a chunk of stories before it is submitted.
+
+    Returns:
+        The new batch's ID, or None if another runner recorded the same
+        range first
+    """
+    table = RescoreBatch.__table__
+    stmt = (
+        _INSERTS[conn.dialect.name](table)
+        .values(
+            run=run,
+            provider=provider,
+            first_story_id=first_story_id,
+            last_story_id=last_story_id,
+            request_count=request_count,
+            status="pending",
+            succeeded=0,
+            failed=0,
+            skipped=0,
+            created_at=datetime.utcnow(),
+        )
+        .on_conflict_do_nothing(index_elements=[table.c.run, table.c.first_story_id])
+        .returning(table.c.id)
+    )
+    return conn.execute(stmt).scalar()
+
+
+def mark_submitted(conn, rescore_batch_id, batch_id):
+    """Store the provider's batch ID; False if the batch was not pending."""
+    table = RescoreBatch.__table__
+    return bool(
+        conn.execute(
+            update(table)
+            .where(table.c.id == rescore_batch_id, table.c.status == "pending")
+            .values(
+                status="submitted", batch_id=batch_id, submitted_at=datetime.utcnow()
+            )
+        ).rowcount
+    )
+
+
+def mark_failed(conn, rescore_batch_id, error):
+    """Give up on a batch the provider rejected, expired or cancelled."""
+    table = RescoreBatch.__table__
+    conn.execute(
+        update(table)
+        .where(table.c.id == rescore_batch_id, table.c.status != "applied")
+        .values(status="failed", error=error, finished_at=datetime.utcnow())
+    )
+    logger.warning(f"Re-scoring batch {rescore_batch_id} failed: {error}")
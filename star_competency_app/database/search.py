@@ -0,0 +1,304 @@
+# star_competency_app/database/search.py
+"""
+Full-text search over a user's STAR stories and case studies.
+
+On PostgreSQL, migration 0003 adds a generated ``search_vector`` tsvector
+column with a GIN index to both tables, plus pg_trgm indexes on the titles
+for typeahead. On SQLite (local development) the same queries run against
+FTS5 external-content tables kept in sync by triggers; ensure_sqlite_fts()
+creates them.
+
+Highlighted text is returned as Markup with user content HTML-escaped and
+only the matched terms wrapped in <mark>.
+"""
+import re
+
+from markupsafe import Markup, escape
+from sqlalchemy import DateTime, text
+
+# Highlight delimiters that survive the database round trip and are
+# swapped for <mark> tags after the text is HTML-escaped
+HIGHLIGHT_START = "⟦"
+HIGHLIGHT_STOP = "⟧"
+
+SEARCH_TARGETS = {
+    "star_story": {
+        "table": "star_stories",
+        "title": "title",
+        "body": ["situation", "task", "action", "result"],
+    },
+    "case_study": {
+        "table": "case_studies",
+        "title": "title",
+        "body": ["description"],
+    },
+}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+TS_HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+    'MaxFragments=2, MaxWords=20, MinWords=8, FragmentDelimiter=" … "'
+)
+
+
+def highlight_markup(value):
+    """Escape text from the database and turn highlight delimiters into <mark>."""
+    if not value:
+        return Markup("")
+    escaped = str(escape(value))
+    return Markup(
+        escaped.replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+    )
+
+
+class SearchHit:
+    """One ranked search result."""
+
+    __slots__ = (
+        "kind",
+        "id",
+        "title",
+        "title_html",
+        "snippet_html",
+        "rank",
+        "updated_at",
+    )
+
+    def __init__(self, kind, id, title, title_html, snippet_html, rank, updated_at):
+        self.kind = kind
+        self.id = id
+        self.title = title
+        self.title_html = title_html
+        self.snippet_html = snippet_html
+        self.rank = rank
+        self.updated_at = updated_at
+
+    def __repr__(self):
+        return f"<SearchHit {self.kind} {self.id} rank={self.rank:.3f}>"
+
+
+def _fts_table(target):
+    return f"{target['table']}_fts"
+
+
+def _fts5_match(query, prefix_last=False, column=None):
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Every token is quoted, so FTS5 operators typed by the user are treated
+    as plain words; tokens are ANDed together.
+    """
+    tokens = _TOKEN_RE.findall(query)
+    if not tokens:
+        return None
+    phrases = [f'"{token}"' for token in tokens]
+    if prefix_last:
+        phrases[-1] += "*"
+    expression = " AND ".join(phrases)
+    return f"{column} : ({expression})" if column else expression
+
+
+def _like_pattern(query):
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+# --- SQLite FTS5 -------------------------------------------------------------
+
+
+def ensure_sqlite_fts(conn):
+    """
+    Create the FTS5 tables and sync triggers on SQLite (idempotent).
+
+    Existing rows are indexed when a table is first created. Does nothing
+    on other databases.
+    """
+    if conn.dialect.name != "sqlite":
+        return
+
+    for target in SEARCH_TARGETS.values():
+        table, fts = target["table"], _fts_table(target)
+        columns = [target["title"], *target["body"]]
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{c}" for c in columns)
+        old_values = ", ".join(f"old.{c}" for c in columns)
+
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": fts},
+        ).scalar()
+        if exists:
+            continue
+
+        conn.execute(
+            text(
+                f"CREATE VIRTUAL TABLE {fts} USING fts5({column_list}, "
+                f"content='{table}', content_rowid='id', tokenize='porter unicode61')"
+            )
+        )
+        conn.execute(
+            text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values}); "
+                "END"
+            )
+        )
+        conn.execute(
+            text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {column_list}) "
+                f"VALUES ('delete', old.id, {old_values}); "
+                "END"
+            )
+        )
+        conn.execute(
+            text(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {column_list}) "
+                f"VALUES ('delete', old.id, {old_values}); "
+                f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.id, {new_values}); "
+                "END"
+            )
+        )
+        conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def _search_sqlite(session, target, user_id, query, limit):
+    match = _fts5_match(query)
+    if match is None:
+        return []
+    table, fts = target["table"], _fts_table(target)
+    return session.execute(
+        text(
+            f"SELECT t.id, t.title, t.updated_at, -bm25({fts}) AS rank, "
+            f"highlight({fts}, 0, '{HIGHLIGHT_START}', '{HIGHLIGHT_STOP}') AS title_hl, "
+            f"snippet({fts}, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_STOP}', ' … ', 24) "
+            "AS snippet "
+            f"FROM {fts} JOIN {table} t ON t.id = {fts}.rowid "
+            f"WHERE {fts} MATCH :match AND t.user_id = :user_id "
+            f"ORDER BY bm25({fts}) LIMIT :limit"
+        ).columns(updated_at=DateTime),
+        {"match": match, "user_id": user_id, "limit": limit},
+    ).fetchall()
+
+
+def _suggest_sqlite(session, target, user_id, query, limit):
+    match = _fts5_match(query, prefix_last=True, column=target["title"])
+    if match is None:
+        return []
+    table, fts = target["table"], _fts_table(target)
+    return session.execute(
+        text(
+            f"SELECT t.id, t.title FROM {fts} JOIN {table} t ON t.id = {fts}.rowid "
+            f"WHERE {fts} MATCH :match AND t.user_id = :user_id "
+            f"ORDER BY bm25({fts}), t.updated_at DESC LIMIT :limit"
+        ),
+        {"match": match, "user_id": user_id, "limit": limit},
+    ).fetchall()
+
+
+# --- PostgreSQL tsvector / pg_trgm ------------------------------------------
+
+
+def _search_postgresql(session, target, user_id, query, limit):
+    table = target["table"]
+    body = ", ".join(target["body"])
+    # Headlines are expensive, so only compute them for the top-ranked rows
+    return session.execute(
+        text(
+            "WITH q AS (SELECT websearch_to_tsquery('english', :query) AS query), "
+            "ranked AS ("
+            f"  SELECT t.id, t.title, t.updated_at, concat_ws(' ', {body}) AS body, "
+            "         ts_rank_cd(t.search_vector, q.query) AS rank "
+            f"  FROM {table} t, q "
+            "  WHERE t.user_id = :user_id AND t.search_vector @@ q.query "
+            "  ORDER BY rank DESC, t.updated_at DESC LIMIT :limit"
+            ") "
+            "SELECT r.id, r.title, r.updated_at, r.rank, "
+            "       ts_headline('english', r.title, q.query, :title_options) AS title_hl, "
+            "       ts_headline('english', r.body, q.query, :options) AS snippet "
+            "FROM ranked r, q ORDER BY r.rank DESC, r.updated_at DESC"
+        ).columns(updated_at=DateTime),
+        {
+            "query": query,
+            "user_id": user_id,
+            "limit": limit,
+            "options": TS_HEADLINE_OPTIONS,
+            "title_options": (
+                f"HighlightAll=true, StartSel={HIGHLIGHT_START}, "
+                f"StopSel={HIGHLIGHT_STOP}"
+            ),
+        },
+    ).fetchall()
+
+
+def _suggest_postgresql(session, target, user_id, query, limit):
+    table, title = target["table"], target["title"]
+    # ILIKE and the % similarity operator both use the title's trigram index
+    return session.execute(
+        text(
+            f"SELECT id, {title} FROM {table} "
+            f"WHERE user_id = :user_id AND ({title} ILIKE :pattern OR {title} % :query) "
+            f"ORDER BY ({title} ILIKE :pattern) DESC, similarity({title}, :query) DESC, "
+            "updated_at DESC LIMIT :limit"
+        ),
+        {
+            "user_id": user_id,
+            "query": query,
+            "pattern": _like_pattern(query),
+            "limit": limit,
+        },
+    ).fetchall()
+
+
+# --- Public API ------------------------------------------------------------
+
+
+def search_entities(session, kind, user_id, query, limit=20):
+    """
+    Search one entity type for a user, best matches first.
+
+    Args:
+        session: SQLAlchemy session
+        kind: "star_story" or "case_study"
+        user_id: Owner whose entities are searched
+        query: Free-text query (web-search syntax on PostgreSQL)
+        limit: Maximum number of hits
+
+    Returns:
+        List of SearchHit
+    """
+    target = SEARCH_TARGETS[kind]
+    if session.get_bind().dialect.name == "postgresql":
+        rows = _search_postgresql(session, target, user_id, query, limit)
+    else:
+        rows = _search_sqlite(session, target, user_id, query, limit)
+
+    return [
+        SearchHit(
+            kind=kind,
+            id=row.id,
+            title=row.title,
+            title_html=highlight_markup(row.title_hl),
+            snippet_html=highlight_markup(row.snippet),
+            rank=float(row.rank or 0),
+            updated_at=row.updated_at,
+        )
+        for row in rows
+    ]
+
+
+def suggest_entity_titles(session, kind, user_id, query, limit=8):
+    """
+    Typeahead title suggestions for a user.
+
+    Returns:
+        List of (id, title) tuples
+    """
+    target = SEARCH_TARGETS[kind]
+    if session.get_bind().dialect.name == "postgresql":
+        rows = _suggest_postgresql(session, target, user_id, query, limit)
+    else:
+        rows = _suggest_sqlite(session, target, user_id, query, limit)
+    return [(row[0], row[1]) for row in rows]
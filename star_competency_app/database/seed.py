@@ -3,7 +3,7 @@ import json
 import logging
 
 from star_competency_app.config.competencies import COMPETENCIES
-from star_competency_app.database.db_manager import DatabaseManager
+from star_competency_app.database.db_manager import get_db_manager
 from star_competency_app.database.models import Competency
 
 logger = logging.getLogger(__name__)
@@ -15,7 +15,7 @@ def seed_competencies(db_manager=None):
     Only adds competencies that don't already exist (based on name).
     """
     if db_manager is None:
-        db_manager = DatabaseManager()
+        db_manager = get_db_manager()
 
     try:
         with db_manager.session_scope() as session:
@@ -44,6 +44,7 @@ def seed_competencies(db_manager=None):
             session.commit()
 
             if added_count > 0:
+                db_manager.competency_cache.invalidate()
                 logger.info(f"Added {added_count} new competencies to the database")
             else:
                 logger.info("No new competencies added (all already exist)")
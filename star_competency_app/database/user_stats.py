@@ -0,0 +1,235 @@
+# star_competency_app/database/user_stats.py
+"""
+Denormalised per-user counters (the user_stats table).
+
+Create and delete paths in DatabaseManager add their deltas with an atomic
+upsert inside the same transaction as the write itself, and the audit log
+writer adds AI usage and last-activity time for each batch it flushes.
+recompute_user_stats() rebuilds the counters from the source tables in bulk
+and is what `db_maintenance.py repair-user-stats` runs.
+"""
+import logging
+from datetime import datetime
+
+from sqlalchemy import case, delete, func, insert, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from star_competency_app.database.models import (
+    AuditLog,
+    CaseStudy,
+    STARStory,
+    User,
+    UserStats,
+)
+
+logger = logging.getLogger(__name__)
+
+# Audit actions logged once per AI model call
+AI_AUDIT_ACTIONS = frozenset(
+    {
+        "evaluate_story",
+        "generate_story",
+        "improve_story",
+        "gap_analysis",
+        "image_analysis",
+        "text_analysis",
+        "general_query",
+    }
+)
+
+COUNTERS = ("star_stories_count", "case_studies_count", "ai_requests_count")
+
+_UPSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
+
+def _dialect_name(conn):
+    bind = conn.get_bind() if isinstance(conn, Session) else conn
+    return bind.dialect.name
+
+
+def empty_user_stats(user_id):
+    """Counters for a user with no user_stats row yet."""
+    return UserStats(
+        user_id=user_id,
+        star_stories_count=0,
+        case_studies_count=0,
+        ai_requests_count=0,
+        last_activity_at=None,
+    )
+
+
+def apply_user_stats_deltas(conn, deltas, content_changed=True):
+    """
+    Add counter deltas for several users in one upsert.
+
+    Args:
+        conn: Session or Connection; the upsert joins its transaction
+        deltas: Dict of user_id -> dict with any of the COUNTERS and an
+            optional "last_activity_at"
+        content_changed: Bump updated_at, which marks the users whose
+            stories the next coverage refresh recomputes; False for deltas
+            that only record activity (AI usage, logins)
+    """
+    if not deltas:
+        return
+
+    table = UserStats.__table__
+    now = datetime.utcnow()
+    # Rows are locked in VALUES order; sorting by user_id gives concurrent
+    # multi-user upserts one lock order, so they can't deadlock
+    rows = [
+        {
+            "user_id": user_id,
+            **{counter: delta.get(counter, 0) for counter in COUNTERS},
+            "last_activity_at": delta.get("last_activity_at") or now,
+            "updated_at": now,
+        }
+        for user_id, delta in sorted(deltas.items())
+    ]
+
+    stmt = _UPSERTS[_dialect_name(conn)](table).values(rows)
+    excluded = stmt.excluded
+    current_activity = table.c.last_activity_at
+    updates = {
+        **{counter: table.c[counter] + excluded[counter] for counter in COUNTERS},
+        "last_activity_at": case(
+            (current_activity.is_(None), excluded.last_activity_at),
+            (
+                current_activity < excluded.last_activity_at,
+                excluded.last_activity_at,
+            ),
+            else_=current_activity,
+        ),
+    }
+    # ON CONFLICT updates don't apply the column's onupdate default
+    if content_changed:
+        updates["updated_at"] = excluded.updated_at
+    stmt = stmt.on_conflict_do_update(index_elements=[table.c.user_id], set_=updates)
+    conn.execute(stmt)
+
+
+def bump_user_stats(
+    conn, user_id, star_stories=0, case_studies=0, ai_requests=0, activity_at=None
+):
+    """Add to one user's counters and mark them active now (or at activity_at)."""
+    apply_user_stats_deltas(
+        conn,
+        {
+            user_id: {
+                "star_stories_count": star_stories,
+                "case_studies_count": case_studies,
+                "ai_requests_count": ai_requests,
+                "last_activity_at": activity_at,
+            }
+        },
+    )
+
+
+def audit_stats_deltas(entries):
+    """
+    Aggregate audit log entries into per-user AI usage and activity deltas.
+
+    Args:
+        entries: Dicts with user_id, action and created_at
+
+    Returns:
+        Deltas for apply_user_stats_deltas()
+    """
+    deltas = {}
+    for entry in entries:
+        delta = deltas.setdefault(
+            entry["user_id"], {"ai_requests_count": 0, "last_activity_at": None}
+        )
+        if entry["action"] in AI_AUDIT_ACTIONS:
+            delta["ai_requests_count"] += 1
+        created_at = entry.get("created_at")
+        if created_at and (
+            delta["last_activity_at"] is None or created_at > delta["last_activity_at"]
+        ):
+            delta["last_activity_at"] = created_at
+    return deltas
+
+
+def recompute_user_stats(conn, user_ids=None):
+    """
+    Rebuild user_stats from the source tables.
+
+    Args:
+        conn: Connection with an open transaction
+        user_ids: Only repair these users (default: everyone)
+
+    Returns:
+        Number of user_stats rows written
+    """
+    story_counts = (
+        select(STARStory.user_id, func.count().label("n"))
+        .group_by(STARStory.user_id)
+        .subquery()
+    )
+    case_study_counts = (
+        select(CaseStudy.user_id, func.count().label("n"))
+        .group_by(CaseStudy.user_id)
+        .subquery()
+    )
+    ai_counts = (
+        select(AuditLog.user_id, func.count().label("n"))
+        .where(AuditLog.action.in_(sorted(AI_AUDIT_ACTIONS)))
+        .group_by(AuditLog.user_id)
+        .subquery()
+    )
+    activity_sources = union_all(
+        select(AuditLog.user_id, func.max(AuditLog.created_at).label("at")).group_by(
+            AuditLog.user_id
+        ),
+        select(STARStory.user_id, func.max(STARStory.updated_at)).group_by(
+            STARStory.user_id
+        ),
+        select(CaseStudy.user_id, func.max(CaseStudy.updated_at)).group_by(
+            CaseStudy.user_id
+        ),
+    ).subquery()
+    activity = (
+        select(activity_sources.c.user_id, func.max(activity_sources.c.at).label("at"))
+        .group_by(activity_sources.c.user_id)
+        .subquery()
+    )
+
+    source = (
+        select(
+            User.id,
+            func.coalesce(story_counts.c.n, 0),
+            func.coalesce(case_study_counts.c.n, 0),
+            func.coalesce(ai_counts.c.n, 0),
+            activity.c.at,
+            literal(datetime.utcnow()),
+        )
+        .outerjoin(story_counts, story_counts.c.user_id == User.id)
+        .outerjoin(case_study_counts, case_study_counts.c.user_id == User.id)
+        .outerjoin(ai_counts, ai_counts.c.user_id == User.id)
+        .outerjoin(activity, activity.c.user_id == User.id)
+    )
+
+    clear = delete(UserStats)
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        source = source.where(User.id.in_(user_ids))
+        clear = clear.where(UserStats.user_id.in_(user_ids))
+
+    conn.execute(clear)
+    result = conn.execute(
+        insert(UserStats).from_select(
+            [
+                "user_id",
+                *COUNTERS,
+                "last_activity_at",
+                "updated_at",
+            ],
+            source,
+        )
+    )
+    # Alembic's offline (--sql) mode only renders the statements
+    written = result.rowcount if result is not None else 0
+    logger.info(f"Recomputed user_stats for {written} users")
+    return written
@@ -27,18 +27,24 @@ from flask_login import LoginManager, current_user, login_required
 from star_competency_app.ai.prompt_agent import PromptAgent
 from star_competency_app.auth.azure_sso import AzureSSO
 from star_competency_app.config.settings import get_settings
-from star_competency_app.database.db_manager import DatabaseManager
+from star_competency_app.database.db_manager import get_db_manager
 from star_competency_app.database.seed import seed_competencies
 from star_competency_app.interfaces.web.routes.admin_routes import admin_bp
 
 # Import routes
 from star_competency_app.interfaces.web.routes.auth_routes import auth_bp
+from star_competency_app.interfaces.web.routes.bulk_routes import bulk_bp
 from star_competency_app.interfaces.web.routes.case_study_routes import case_study_bp
 from star_competency_app.interfaces.web.routes.gap_analysis_routes import (
     gap_analysis_bp,
 )
+from star_competency_app.interfaces.web.routes.job_routes import job_bp
+from star_competency_app.interfaces.web.routes.search_routes import search_bp
 from star_competency_app.interfaces.web.routes.star_routes import star_bp
-from star_competency_app.utils.security_logging import setup_security_logging
+from star_competency_app.utils.security_logging import (
+    setup_security_logging,
+    setup_slow_query_logging,
+)
 from star_competency_app.utils.security_middleware import init_security
 from star_competency_app.utils.security_utils import is_safe_url
 
@@ -52,6 +58,7 @@ csrf = CSRFProtect(app)
 # Initialize security features
 init_security(app)
 setup_security_logging(app)
+setup_slow_query_logging(app)
 
 # Load application settings
 settings = get_settings()
@@ -67,8 +74,10 @@ app.config.update(
 )
 
 # Initialize database
-db_manager = DatabaseManager()
+db_manager = get_db_manager()
+db_manager.init_app(app)
 db_manager.create_tables()
+db_manager.ensure_audit_partitions()
 seed_competencies(db_manager)
 logger.info("Seeding competencies")
 
@@ -111,31 +120,20 @@ app.register_blueprint(case_study_bp, url_prefix="/case-study")
 app.register_blueprint(star_bp, url_prefix="/star")
 app.register_blueprint(admin_bp, url_prefix="/admin")
 app.register_blueprint(gap_analysis_bp, url_prefix="/gap-analysis")
+app.register_blueprint(search_bp, url_prefix="/search")
+app.register_blueprint(bulk_bp, url_prefix="/bulk")
+app.register_blueprint(job_bp, url_prefix="/jobs")
 
 
 @login_manager.user_loader
 def load_user(user_id):
     """
-    Load user from database for Flask-Login.
+    Load user from the identity cache for Flask-Login.
 
-    This method ensures that even if the user is detached from the session,
-    we can still retrieve and use the user object.
+    Returns a compact, session-independent UserIdentity, so most requests
+    make no identity query at all.
     """
-    user = db_manager.get_user_by_id(int(user_id))
-
-    # If user is None, return None
-    if not user:
-        return None
-
-    # Ensure user is in a state that can be used
-    try:
-        # This will trigger any lazy loading
-        _ = user.is_admin
-    except Exception:
-        # If there's an issue, we'll just continue
-        pass
-
-    return user
+    return db_manager.get_user_identity(int(user_id))
 
 
 # Define favicon route BEFORE the index route
@@ -161,19 +159,18 @@ def index():
 @login_required
 def dashboard():
     """Dashboard page route."""
-    # Get user's STAR stories
-    star_stories = db_manager.get_star_stories_by_user(current_user.id)
-
-    # Get user's case studies
-    case_studies = db_manager.get_case_studies_by_user(current_user.id)
+    # Get recent stories, case studies and counts in one read model
+    dashboard_data = db_manager.get_dashboard_data(current_user.id, limit=5)
 
     # Get competencies
     competencies = db_manager.get_competencies()
 
     return render_template(
         "dashboard.html",
-        star_stories=star_stories,
-        case_studies=case_studies,
+        star_stories=dashboard_data["recent_star_stories"],
+        case_studies=dashboard_data["recent_case_studies"],
+        star_stories_count=dashboard_data["star_stories_count"],
+        case_studies_count=dashboard_data["case_studies_count"],
         competencies=competencies,
     )
 
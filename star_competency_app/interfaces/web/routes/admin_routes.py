@@ -1,19 +1,38 @@
 # Create a new file: star_competency_app/interfaces/web/routes/admin_routes.py
 import logging
-
-from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
+import os
+
+from flask import (
+    Blueprint,
+    abort,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
 from flask_login import current_user, login_required
 
-from star_competency_app.database.db_manager import DatabaseManager
+from star_competency_app.ai.response_cache import get_response_cache
+from star_competency_app.database.db_manager import get_db_manager
+from star_competency_app.database.engine import get_all_pool_stats
 from star_competency_app.utils.security_utils import require_admin
 
 logger = logging.getLogger(__name__)
 
+# Number of audit log entries shown per activity page
+ACTIVITY_PAGE_SIZE = 50
+# Number of users shown per directory page
+USER_PAGE_SIZE = 50
+# User directory searches are trimmed to this many characters
+MAX_USER_SEARCH_LENGTH = 100
+
 # Create blueprint
 admin_bp = Blueprint("admin", __name__)
 
 # Initialize services
-db_manager = DatabaseManager()
+db_manager = get_db_manager()
 
 
 @admin_bp.route("/competencies")
@@ -119,9 +138,25 @@ def competency_details(competency_id):
 @login_required
 @require_admin
 def manage_users():
-    """Manage users."""
-    users = db_manager.get_all_users()
-    return render_template("admin/users.html", users=users)
+    """Manage users: a searchable directory, one page at a time."""
+    search = request.args.get("q", "").strip()[:MAX_USER_SEARCH_LENGTH]
+    role = request.args.get("role")
+    if role not in ("admin", "user"):
+        role = None
+    cursor = request.args.get("cursor")
+
+    try:
+        users = db_manager.get_users_page(
+            search=search or None,
+            role=role,
+            cursor=cursor,
+            limit=USER_PAGE_SIZE,
+            with_total=not cursor,
+        )
+    except ValueError:
+        abort(400)
+
+    return render_template("admin/users.html", users=users, search=search, role=role)
 
 
 @admin_bp.route("/users/<int:user_id>/toggle-admin", methods=["POST"])
@@ -155,17 +190,87 @@ def view_user_activity(user_id):
         flash("User not found.", "error")
         return redirect(url_for("admin.manage_users"))
 
-    # Get user's activity logs
-    activity_logs = db_manager.get_audit_logs_by_user(user_id)
+    # Get one page of the user's activity logs
+    cursor = request.args.get("cursor")
+    try:
+        activity_logs = db_manager.get_audit_logs_page(
+            user_id, cursor=cursor, limit=ACTIVITY_PAGE_SIZE, with_total=not cursor
+        )
+    except ValueError:
+        abort(400)
 
-    # Get user's STAR stories and case studies count
-    star_stories_count = db_manager.count_star_stories_by_user(user_id)
-    case_studies_count = db_manager.count_case_studies_by_user(user_id)
+    # Story, case study and AI usage counters from user_stats
+    user_stats = db_manager.get_user_stats(user_id)
 
     return render_template(
         "admin/user_activity.html",
         user=user,
         activity_logs=activity_logs,
-        star_stories_count=star_stories_count,
-        case_studies_count=case_studies_count,
+        user_stats=user_stats,
+        star_stories_count=user_stats.star_stories_count,
+        case_studies_count=user_stats.case_studies_count,
     )
+
+
+@admin_bp.route("/analytics/coverage")
+@login_required
+@require_admin
+def coverage_analytics():
+    """Organisation-wide competency coverage, served from the summary tables."""
+    coverage = db_manager.get_org_coverage()
+    return render_template("admin/coverage.html", coverage=coverage)
+
+
+@admin_bp.route("/analytics/coverage/refresh", methods=["POST"])
+@login_required
+@require_admin
+def refresh_coverage_analytics():
+    """Bring the coverage summary up to date now rather than on schedule."""
+    try:
+        result = db_manager.refresh_coverage_summary()
+    except Exception as e:
+        logger.error(f"Coverage summary refresh failed: {e}")
+        flash("Failed to refresh coverage analytics", "error")
+        return redirect(url_for("admin.coverage_analytics"))
+
+    flash(f"Coverage analytics refreshed in {result['duration_ms']} ms", "success")
+    return redirect(url_for("admin.coverage_analytics"))
+
+
+@admin_bp.route("/db/pool-stats")
+@login_required
+@require_admin
+def db_pool_stats():
+    """Get live connection pool statistics for this worker as JSON."""
+    return jsonify(
+        {
+            "pid": os.getpid(),
+            "pools": get_all_pool_stats(),
+            "replicas": db_manager.get_replica_status(),
+        }
+    )
+
+
+@admin_bp.route("/db/cache-stats")
+@login_required
+@require_admin
+def db_cache_stats():
+    """Get identity, competency and AI response cache statistics as JSON."""
+    caches = db_manager.get_cache_stats()
+    response_cache = get_response_cache()
+    caches["ai_responses"] = {
+        "enabled": response_cache is not None,
+        # Hits, misses and tokens saved by this worker process
+        "process": response_cache.stats() if response_cache else None,
+        # Entries and savings across all processes
+        "shared": db_manager.get_ai_response_store_stats(),
+    }
+    return jsonify({"pid": os.getpid(), "caches": caches})
+
+
+@admin_bp.route("/db/audit-stats")
+@login_required
+@require_admin
+def db_audit_stats():
+    """Get audit log buffer queue depth and flush counters for this worker as JSON."""
+    return jsonify({"pid": os.getpid(), "audit": db_manager.get_audit_buffer_stats()})
@@ -15,7 +15,7 @@ from flask_login import current_user, login_required, login_user, logout_user
 from sqlalchemy.orm.session import object_session
 
 from star_competency_app.auth.azure_sso import AzureSSO
-from star_competency_app.database.db_manager import DatabaseManager
+from star_competency_app.database.db_manager import get_db_manager
 from star_competency_app.utils.security_utils import is_safe_url
 
 logger = logging.getLogger(__name__)
@@ -24,7 +24,7 @@ logger = logging.getLogger(__name__)
 auth_bp = Blueprint("auth", __name__)
 
 # Initialize services
-db_manager = DatabaseManager()
+db_manager = get_db_manager()
 azure_sso = AzureSSO(db_manager=db_manager)
 
 
@@ -55,14 +55,14 @@ def callback():
     # Get user ID from session data populated by process_login
     user_id = session["user"]["id"]
 
-    # Get a fresh user object with proper detaching
-    user = db_manager.get_user_by_id(user_id)
+    # Get the (freshly invalidated) identity record for the session user
+    user = db_manager.get_user_identity(user_id)
 
     if not user:
         flash("User account not found", "error")
         return redirect(url_for("auth.login"))
 
-    # Login user with the detached but initialized user object
+    # Login user with the session-independent identity record
     login_user(user)
 
     # Redirect user
@@ -80,53 +80,18 @@ def profile():
     # Get user ID safely without triggering a database access
     user_id = int(current_user.get_id())
 
-    # Get user's activity stats
-    star_stories_count = db_manager.count_star_stories_by_user(user_id)
-    case_studies_count = db_manager.count_case_studies_by_user(user_id)
-
-    # Get user's recent activity
-    recent_activity = db_manager.get_recent_audit_logs(user_id, limit=10)
-
-    # Get user's competency coverage
-    competencies = db_manager.get_competencies()
-    coverage_stats = compute_competency_coverage(user_id, competencies)
+    # Get counts, coverage and recent activity in one read model
+    profile_data = db_manager.get_profile_data(user_id, activity_limit=10)
 
     return render_template(
         "auth/profile.html",
         user=current_user,
-        star_stories_count=star_stories_count,
-        case_studies_count=case_studies_count,
-        recent_activity=recent_activity,
-        coverage_stats=coverage_stats,
-    )
-
-
-def compute_competency_coverage(user_id, all_competencies):
-    """Compute competency coverage statistics for a user."""
-    # Get user's STAR stories
-    user_stories = db_manager.get_star_stories_by_user(user_id)
-
-    # Count stories by competency
-    covered_competencies = set()
-    for story in user_stories:
-        if story.competency_id:
-            covered_competencies.add(story.competency_id)
-
-    # Calculate coverage percentage
-    total_competencies = len(all_competencies)
-    covered_count = len(covered_competencies)
-    coverage_percentage = (
-        round((covered_count / total_competencies) * 100)
-        if total_competencies > 0
-        else 0
+        star_stories_count=profile_data["star_stories_count"],
+        case_studies_count=profile_data["case_studies_count"],
+        recent_activity=profile_data["recent_activity"],
+        coverage_stats=profile_data["coverage_stats"],
     )
 
-    return {
-        "total": total_competencies,
-        "covered": covered_count,
-        "percentage": coverage_percentage,
-    }
-
 
 @auth_bp.route("/logout")
 @login_required
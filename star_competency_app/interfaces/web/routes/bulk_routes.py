@@ -0,0 +1,113 @@
+# star_competency_app/interfaces/web/routes/bulk_routes.py
+import io
+import logging
+from datetime import datetime
+
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    flash,
+    redirect,
+    render_template,
+    request,
+    stream_with_context,
+    url_for,
+)
+from flask_login import current_user, login_required
+
+from star_competency_app.database.bulk_io import (
+    BULK_ENTITIES,
+    CONTENT_TYPES,
+    FORMATS,
+    detect_format,
+)
+from star_competency_app.database.db_manager import get_db_manager
+
+logger = logging.getLogger(__name__)
+
+# Create blueprint
+bulk_bp = Blueprint("bulk", __name__)
+
+# Initialize services
+db_manager = get_db_manager()
+
+# URL segment -> (entity kind, label, list endpoint)
+BULK_KINDS = {
+    "star": ("star_story", "STAR Stories", "star.list_star_stories"),
+    "case-study": ("case_study", "Case Studies", "case_study.list_case_studies"),
+}
+
+
+def _resolve_kind(kind_slug):
+    if kind_slug not in BULK_KINDS:
+        abort(404)
+    return BULK_KINDS[kind_slug]
+
+
+@bulk_bp.route("/<kind_slug>/export")
+@login_required
+def export_entities(kind_slug):
+    """Download all of the current user's stories or case studies."""
+    kind, _, _ = _resolve_kind(kind_slug)
+    fmt = request.args.get("format", "csv")
+    if fmt not in FORMATS:
+        abort(400)
+
+    filename = f"{kind_slug}-export-{datetime.utcnow():%Y%m%d}.{fmt}"
+    chunks = db_manager.export_entities(current_user.id, kind, fmt)
+    return Response(
+        stream_with_context(chunks),
+        content_type=CONTENT_TYPES[fmt],
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+@bulk_bp.route("/<kind_slug>/import", methods=["GET", "POST"])
+@login_required
+def import_entities(kind_slug):
+    """Import stories or case studies from an uploaded CSV or JSONL file."""
+    kind, label, list_endpoint = _resolve_kind(kind_slug)
+    context = {
+        "kind_slug": kind_slug,
+        "label": label,
+        "list_endpoint": list_endpoint,
+        "fields": BULK_ENTITIES[kind]["fields"],
+        "result": None,
+    }
+
+    if request.method == "POST":
+        upload = request.files.get("file")
+        if not upload or not upload.filename:
+            flash("Please choose a CSV or JSONL file to import", "error")
+            return render_template("bulk/import.html", **context)
+
+        fmt = request.form.get("format") or detect_format(upload.filename)
+        if fmt not in FORMATS:
+            abort(400)
+
+        stream = io.TextIOWrapper(upload.stream, encoding="utf-8-sig", newline="")
+        try:
+            result = db_manager.import_entities(current_user.id, kind, stream, fmt)
+        except UnicodeDecodeError:
+            flash("The file is not valid UTF-8 text; nothing was imported", "error")
+            return render_template("bulk/import.html", **context)
+        except Exception as e:
+            logger.error(f"Bulk import of {kind} failed: {e}")
+            flash("Import failed; nothing was imported", "error")
+            return render_template("bulk/import.html", **context)
+
+        if not result.failed:
+            if not result.inserted:
+                flash("The file contained no rows to import", "warning")
+                return render_template("bulk/import.html", **context)
+            flash(f"Imported {result.inserted} {label.lower()}", "success")
+            return redirect(url_for(list_endpoint))
+
+        context["result"] = result
+        flash(
+            f"Imported {result.inserted}, skipped {result.failed} invalid rows",
+            "warning",
+        )
+
+    return render_template("bulk/import.html", **context)
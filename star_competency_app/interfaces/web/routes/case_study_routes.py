@@ -2,11 +2,20 @@
 import logging
 import os
 
-from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
+from flask import (
+    Blueprint,
+    abort,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
 from flask_login import current_user, login_required
 
 from star_competency_app.ai.prompt_agent import PromptAgent
-from star_competency_app.database.db_manager import DatabaseManager
+from star_competency_app.database.db_manager import get_db_manager
 from star_competency_app.utils.image_utils import (
     extract_text_from_image,
     save_uploaded_image,
@@ -14,19 +23,28 @@ from star_competency_app.utils.image_utils import (
 
 logger = logging.getLogger(__name__)
 
+# Number of case studies shown per list page
+PAGE_SIZE = 18
+
 # Create blueprint
 case_study_bp = Blueprint("case_study", __name__)
 
 # Initialize services
-db_manager = DatabaseManager()
+db_manager = get_db_manager()
 prompt_agent = PromptAgent(db_manager=db_manager)
 
 
 @case_study_bp.route("/")
 @login_required
 def list_case_studies():
-    """List all case studies for the current user."""
-    case_studies = db_manager.get_case_studies_by_user(current_user.id)
+    """List the current user's case studies, one page at a time."""
+    cursor = request.args.get("cursor")
+    try:
+        case_studies = db_manager.get_case_studies_page(
+            current_user.id, cursor=cursor, limit=PAGE_SIZE, with_total=not cursor
+        )
+    except ValueError:
+        abort(400)
     return render_template("case_study/list.html", case_studies=case_studies)
 
 
@@ -72,7 +90,7 @@ def new_case_study():
 @login_required
 def view_case_study(case_id):
     """View a specific case study."""
-    case_study = db_manager.get_case_study_by_id(case_id)
+    case_study = db_manager.get_case_study_by_id(case_id, with_ai_output=True)
 
     # Check if case study exists and belongs to current user
     if not case_study or case_study.user_id != current_user.id:
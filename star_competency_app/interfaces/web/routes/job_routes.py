@@ -0,0 +1,60 @@
+# star_competency_app/interfaces/web/routes/job_routes.py
+import logging
+
+from flask import Blueprint, jsonify, url_for
+from flask_login import current_user, login_required
+
+from star_competency_app.database.db_manager import get_db_manager
+from star_competency_app.database.job_queue import (
+    FINISHED_STATUSES,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_SUCCEEDED,
+)
+
+logger = logging.getLogger(__name__)
+
+# Create blueprint
+job_bp = Blueprint("jobs", __name__)
+
+# Initialize services
+db_manager = get_db_manager()
+
+
+def queue_job(kind, payload):
+    """Queue an AI job for the current user; returns the 202 response to send."""
+    job_id = db_manager.enqueue_job(current_user.id, kind, payload)
+    logger.info(f"Queued job {job_id} ({kind}) for user {current_user.id}")
+    return (
+        jsonify(
+            {
+                "job_id": job_id,
+                "status": JOB_QUEUED,
+                "status_url": url_for("jobs.job_status", job_id=job_id),
+            }
+        ),
+        202,
+    )
+
+
+@job_bp.route("/<int:job_id>")
+@login_required
+def job_status(job_id):
+    """Status of a background job, with its result once it has finished."""
+    job = db_manager.get_job(job_id)
+    if not job or job.user_id != current_user.id:
+        return jsonify({"error": "Job not found"}), 404
+
+    data = {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+        "finished": job.status in FINISHED_STATUSES,
+        "progress": job.progress,
+    }
+    if job.status == JOB_SUCCEEDED:
+        data["result"] = job.result
+    elif job.status == JOB_FAILED:
+        data["error"] = job.error
+    return jsonify(data)
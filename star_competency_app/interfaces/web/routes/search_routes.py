@@ -0,0 +1,80 @@
+# star_competency_app/interfaces/web/routes/search_routes.py
+import logging
+
+from flask import Blueprint, jsonify, render_template, request, url_for
+from flask_login import current_user, login_required
+
+from star_competency_app.database.db_manager import get_db_manager
+
+logger = logging.getLogger(__name__)
+
+# Hits shown per entity type on the results page
+RESULTS_PER_TYPE = 25
+# Typeahead suggestions returned per keystroke
+SUGGESTION_LIMIT = 8
+# Queries are trimmed to this many characters
+MAX_QUERY_LENGTH = 200
+
+# Create blueprint
+search_bp = Blueprint("search", __name__)
+
+# Initialize services
+db_manager = get_db_manager()
+
+ENTITY_ENDPOINTS = {
+    "star_story": ("star.view_star_story", "story_id"),
+    "case_study": ("case_study.view_case_study", "case_id"),
+}
+
+
+def _query_arg():
+    return request.args.get("q", "").strip()[:MAX_QUERY_LENGTH]
+
+
+@search_bp.route("/")
+@login_required
+def search():
+    """Search the current user's STAR stories and case studies."""
+    query = _query_arg()
+    results = {"star_stories": [], "case_studies": []}
+
+    if query:
+        try:
+            results = db_manager.search(current_user.id, query, limit=RESULTS_PER_TYPE)
+        except Exception as e:
+            logger.error(f"Search failed for query {query!r}: {e}")
+
+    return render_template(
+        "search/results.html",
+        query=query,
+        star_stories=results["star_stories"],
+        case_studies=results["case_studies"],
+    )
+
+
+@search_bp.route("/suggest")
+@login_required
+def suggest():
+    """Return typeahead title suggestions as JSON."""
+    query = _query_arg()
+    if len(query) < 2:
+        return jsonify({"suggestions": []})
+
+    try:
+        rows = db_manager.suggest_titles(current_user.id, query, limit=SUGGESTION_LIMIT)
+    except Exception as e:
+        logger.error(f"Suggest failed for query {query!r}: {e}")
+        return jsonify({"error": "Suggestions are unavailable"}), 500
+
+    suggestions = []
+    for kind, entity_id, title in rows:
+        endpoint, arg = ENTITY_ENDPOINTS[kind]
+        suggestions.append(
+            {
+                "kind": kind,
+                "id": entity_id,
+                "title": title,
+                "url": url_for(endpoint, **{arg: entity_id}),
+            }
+        )
+    return jsonify({"suggestions": suggestions})
@@ -1,27 +1,95 @@
 # star_competency_app/interfaces/web/routes/star_routes.py
+import json
 import logging
 
-from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    stream_with_context,
+    url_for,
+)
 from flask_login import current_user, login_required
 
 from star_competency_app.ai.prompt_agent import PromptAgent
-from star_competency_app.database.db_manager import DatabaseManager
+from star_competency_app.ai.tasks import store_evaluation
+from star_competency_app.config.settings import get_settings
+from star_competency_app.database.db_manager import get_db_manager
+from star_competency_app.interfaces.web.routes.job_routes import queue_job
 
 logger = logging.getLogger(__name__)
 
+# Number of stories shown per list page
+PAGE_SIZE = 20
+
+# Longest a streamed evaluation is expected to run, in seconds
+EVALUATION_STREAM_SECONDS = 60
+
 # Create blueprint
 star_bp = Blueprint("star", __name__)
 
 # Initialize services
-db_manager = DatabaseManager()
+db_manager = get_db_manager()
 prompt_agent = PromptAgent(db_manager=db_manager)
 
 
+def _sse(event, data):
+    """Format one Server-Sent Event; data goes out as JSON so newlines survive."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _event_stream(chunks, finish):
+    """
+    Stream model output to the browser as Server-Sent Events.
+
+    Sends a "token" event per chunk of text, then a "done" event carrying
+    finish(full_text), or an "error" event if the model call fails.
+
+    The generator keeps the request context (stream_with_context), but the
+    response headers, session cookie included, and the request's unit of
+    work have gone out first: finish() writes through session_scope()'s own
+    committing session, and routes pin reads to the primary up front.
+    """
+
+    def generate():
+        # Sent straight away so the browser and any proxy start reading
+        yield ": stream open\n\n"
+        parts = []
+        try:
+            for text in chunks:
+                parts.append(text)
+                yield _sse("token", {"text": text})
+            yield _sse("done", finish("".join(parts)))
+        except Exception as e:
+            logger.exception("AI stream failed")
+            yield _sse("error", {"error": str(e)})
+        finally:
+            # Client disconnects close this generator; stop the model call too
+            chunks.close()
+
+    response = Response(stream_with_context(generate()), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    # Ask reverse proxies (nginx) not to buffer the stream
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
 @star_bp.route("/")
 @login_required
 def list_star_stories():
-    """List all STAR stories for the current user."""
-    star_stories = db_manager.get_star_stories_by_user(current_user.id)
+    """List the current user's STAR stories, one page at a time."""
+    cursor = request.args.get("cursor")
+    try:
+        star_stories = db_manager.get_star_stories_page(
+            current_user.id, cursor=cursor, limit=PAGE_SIZE, with_total=not cursor
+        )
+    except ValueError:
+        abort(400)
     return render_template("star/list.html", star_stories=star_stories)
 
 
@@ -74,7 +142,7 @@ def new_star_story():
 @login_required
 def view_star_story(story_id):
     """View a specific STAR story."""
-    story = db_manager.get_star_story_by_id(story_id)
+    story = db_manager.get_star_story_by_id(story_id, with_ai_output=True)
 
     # Check if story exists and belongs to current user
     if not story or story.user_id != current_user.id:
@@ -140,74 +208,68 @@ def edit_star_story(story_id):
 @star_bp.route("/<int:story_id>/evaluate", methods=["POST"])
 @login_required
 def evaluate_star_story(story_id):
-    """Evaluate a STAR story using AI."""
-    try:
-        story = db_manager.get_star_story_by_id(story_id)
-        if not story or story.user_id != current_user.id:
-            logger.warning(
-                f"Evaluate: story {story_id} not found or unauthorized user {current_user.id}"
-            )
-            return jsonify({"error": "STAR story not found"}), 404
+    """Queue an AI evaluation of a STAR story; poll the returned status URL."""
+    story = db_manager.get_star_story_by_id(story_id)
+    if not story or story.user_id != current_user.id:
+        logger.warning(
+            f"Evaluate: story {story_id} not found or unauthorized user {current_user.id}"
+        )
+        return jsonify({"error": "STAR story not found"}), 404
 
-        logger.info(f"Evaluating story {story_id} for user {current_user.id}")
+    return queue_job("evaluate_story", {"story_id": story_id})
 
-        story_data = {
+
+@star_bp.route("/<int:story_id>/evaluate/stream", methods=["POST"])
+@login_required
+def stream_evaluate_star_story(story_id):
+    """Evaluate a STAR story, streaming the feedback as Server-Sent Events."""
+    story = db_manager.get_star_story_by_id(story_id)
+    if not story or story.user_id != current_user.id:
+        return jsonify({"error": "STAR story not found"}), 404
+
+    chunks = prompt_agent.stream_evaluate_star_story(
+        story_data={
             "title": story.title,
             "situation": story.situation,
             "task": story.task,
             "action": story.action,
             "result": story.result,
-        }
-
-        result = prompt_agent.evaluate_star_story(
-            story_data=story_data,
-            competency_id=story.competency_id,
-            user_id=current_user.id,
-        )
-
-        if "error" in result:
-            logger.error(f"AI evaluation error for story {story_id}: {result['error']}")
-            return jsonify({"error": result["error"]}), 500
-
-        db_manager.update_star_story(
-            story_id=story_id, ai_feedback=result.get("evaluation", "")
-        )
+        },
+        competency_id=story.competency_id,
+        user_id=current_user.id,
+    )
 
-        return jsonify(
-            {
-                "evaluation": result.get("evaluation", ""),
-                "scores": result.get("scores", {}),
-            }
+    def finish(text):
+        return store_evaluation(
+            db_manager, story_id, prompt_agent.parse_evaluation(text)
         )
 
-    except Exception as e:
-        logger.exception(f"Unhandled exception during evaluation of story {story_id}")
-        return jsonify({"error": f"Failed to evaluate STAR story: {str(e)}"}), 500
+    # The feedback is stored when the stream ends, after the session cookie
+    # has been sent, so the pages read next must go to the primary from now
+    db_manager.pin_reads_to_primary(
+        seconds=EVALUATION_STREAM_SECONDS + get_settings().DB_READ_YOUR_WRITES_SECONDS
+    )
+    return _event_stream(chunks, finish)
 
 
 @star_bp.route("/<int:story_id>/improve", methods=["POST"])
 @login_required
 def improve_star_story(story_id):
-    """Get improvement suggestions for a STAR story using AI."""
+    """Queue AI improvement suggestions for a STAR story."""
     story = db_manager.get_star_story_by_id(story_id)
 
     # Check if story exists and belongs to current user
     if not story or story.user_id != current_user.id:
         return jsonify({"error": "STAR story not found"}), 404
 
-    # Call the proper method in prompt_agent
-    result = prompt_agent.improve_star_story(story_id=story_id, user_id=current_user.id)
+    return queue_job("improve_story", {"story_id": story_id})
 
-    if "error" in result:
-        return jsonify({"error": result["error"]}), 500
 
-    # Return the suggestions with proper response structure
-    return jsonify(
-        {
-            "suggestions": result.get("evaluation", ""),
-            "improved_components": result.get("improvement_suggestions", {}),
-        }
-    )
+@star_bp.route("/evaluate-all", methods=["POST"])
+@login_required
+def evaluate_all_star_stories():
+    """Queue AI evaluation of every story that is unevaluated or edited since."""
+    return queue_job("evaluate_all", {})
 
 
 @star_bp.route("/<int:story_id>/delete", methods=["POST"])
@@ -283,51 +345,58 @@ def delete_star_story(story_id):
 #         return jsonify({"error": f"Failed to generate STAR structure: {str(e)}"}), 500
 
 
-@star_bp.route("/generate", methods=["POST"])
-@login_required
-def generate_star_structure():
-    """Generate STAR structure from a user's story using AI."""
+def _generate_args():
+    """Validate a generate request; returns (args, None) or (None, error response)."""
     data = request.json
     if not data:
-        return jsonify({"error": "No data provided"}), 400
+        return None, (jsonify({"error": "No data provided"}), 400)
 
     story_content = data.get("story_content", "")
     competency_id = data.get("competency_id")
 
     if not story_content.strip():
-        return jsonify({"error": "Story content is required"}), 400
+        return None, (jsonify({"error": "Story content is required"}), 400)
 
-    try:
-        if competency_id:
-            try:
-                competency_id = int(competency_id)
-            except ValueError:
-                return jsonify({"error": "Invalid competency ID"}), 400
-        else:
-            # Fallback competency ID (consider logging this too)
-            competency_id = 1
+    if competency_id:
+        try:
+            competency_id = int(competency_id)
+        except ValueError:
+            return None, (jsonify({"error": "Invalid competency ID"}), 400)
+    else:
+        # Fallback competency ID (consider logging this too)
+        competency_id = 1
 
-        logger.info(
-            f"Generating STAR structure for user_id={current_user.id}, competency_id={competency_id}"
-        )
+    return {"competency_id": competency_id, "story_content": story_content}, None
 
-        result = prompt_agent.generate_star_story(
-            competency_id=competency_id, context=story_content, user_id=current_user.id
-        )
 
-        if "error" in result:
-            logger.error(f"STAR generation error: {result['error']}")
-            return jsonify({"error": result["error"]}), 500
-
-        return jsonify(
-            {
-                "situation": result.get("situation", ""),
-                "task": result.get("task", ""),
-                "action": result.get("action", ""),
-                "result": result.get("result", ""),
-            }
-        )
+@star_bp.route("/generate", methods=["POST"])
+@login_required
+def generate_star_structure():
+    """Queue generation of a STAR structure from a user's story."""
+    args, error = _generate_args()
+    if error:
+        return error
+    return queue_job("generate_story", args)
+
+
+@star_bp.route("/generate/stream", methods=["POST"])
+@login_required
+def stream_generate_star_structure():
+    """Generate a STAR structure from a user's story, streamed as Server-Sent Events."""
+    args, error = _generate_args()
+    if error:
+        return error
+
+    chunks = prompt_agent.stream_generate_star_story(
+        competency_id=args["competency_id"],
+        context=args["story_content"],
+        user_id=current_user.id,
+    )
+
+    def finish(text):
+        story = prompt_agent.parse_star_story(text)
+        return {
+            key: story.get(key, "") for key in ("situation", "task", "action", "result")
+        }
 
-    except Exception as e:
-        logger.exception("Unhandled error during STAR generation")
-        return jsonify({"error": f"Failed to generate STAR structure: {str(e)}"}), 500
+    return _event_stream(chunks, finish)
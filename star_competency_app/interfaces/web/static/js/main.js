@@ -32,6 +32,119 @@ document.addEventListener('DOMContentLoaded', function() {
     });
 });
 
+// Poll a background job's status URL until it finishes; resolves with its
+// result. onProgress receives the progress long-running jobs report.
+function pollJob(statusUrl, interval = 1500, onProgress = null) {
+    return new Promise((resolve, reject) => {
+        function check() {
+            fetch(statusUrl, { credentials: 'same-origin' })
+                .then(response => {
+                    if (!response.ok) {
+                        throw new Error(`Server responded with ${response.status}`);
+                    }
+                    return response.json();
+                })
+                .then(job => {
+                    if (onProgress && job.progress) {
+                        onProgress(job.progress);
+                    }
+                    if (job.status === 'succeeded') {
+                        resolve(job.result);
+                    } else if (job.status === 'failed') {
+                        reject(new Error(job.error || 'The request failed'));
+                    } else {
+                        setTimeout(check, interval);
+                    }
+                })
+                .catch(reject);
+        }
+        check();
+    });
+}
+
+// POST to an endpoint that queues a background job, then wait for its result
+function runJob(url, options, onProgress = null) {
+    return fetch(url, Object.assign({ method: 'POST', credentials: 'same-origin' }, options))
+        .then(response => response.json().then(data => {
+            if (!response.ok || data.error) {
+                throw new Error(data.error || `Server responded with ${response.status}`);
+            }
+            return pollJob(data.status_url, 1500, onProgress);
+        }));
+}
+
+// POST to a Server-Sent Events endpoint, calling onToken with each chunk of
+// text as it arrives; resolves with the data of the final "done" event
+function streamEvents(url, options, onToken) {
+    return fetch(url, Object.assign({ method: 'POST', credentials: 'same-origin' }, options))
+        .then(response => {
+            const type = response.headers.get('Content-Type') || '';
+            if (!response.ok || !type.startsWith('text/event-stream')) {
+                return response.json().then(data => {
+                    throw new Error(data.error || `Server responded with ${response.status}`);
+                });
+            }
+
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+
+            function handle(frame) {
+                let event = 'message';
+                let data = '';
+                frame.split('\n').forEach(line => {
+                    if (line.startsWith('event:')) {
+                        event = line.slice(6).trim();
+                    } else if (line.startsWith('data:')) {
+                        data += line.slice(5).trim();
+                    }
+                });
+                if (!data) {
+                    return null;  // comment / keep-alive
+                }
+                const payload = JSON.parse(data);
+                if (event === 'token') {
+                    onToken(payload.text);
+                } else if (event === 'error') {
+                    throw new Error(payload.error || 'The request failed');
+                } else if (event === 'done') {
+                    return { result: payload };
+                }
+                return null;
+            }
+
+            function read() {
+                return reader.read().then(({ done, value }) => {
+                    buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+                    let end;
+                    while ((end = buffer.indexOf('\n\n')) !== -1) {
+                        const frame = buffer.slice(0, end);
+                        buffer = buffer.slice(end + 2);
+                        const finished = handle(frame);
+                        if (finished) {
+                            reader.cancel();
+                            return finished.result;
+                        }
+                    }
+                    if (done) {
+                        throw new Error('The stream ended before the response was complete');
+                    }
+                    return read();
+                });
+            }
+            return read();
+        });
+}
+
+// Stream from streamUrl where the browser supports it, otherwise run the
+// request as a background job at jobUrl and wait for the whole result
+function streamOrRunJob(streamUrl, jobUrl, options, onToken) {
+    if (window.ReadableStream && window.TextDecoder) {
+        return streamEvents(streamUrl, options, onToken);
+    }
+    return runJob(jobUrl, options);
+}
+
 // Function to evaluate a STAR story
 function evaluateStarStory(storyId) {
     if (!confirm('Would you like to evaluate this STAR story using AI?')) {
@@ -45,14 +158,22 @@ function evaluateStarStory(storyId) {
         evaluationContainer.classList.add('d-none');
         loadingIndicator.classList.remove('d-none');
         
-        fetch(`/star/${storyId}/evaluate`, {
-            method: 'POST',
+        let streamed = null;
+        streamOrRunJob(`/star/${storyId}/evaluate/stream`, `/star/${storyId}/evaluate`, {
             headers: {
                 'Content-Type': 'application/json',
                 'X-CSRFToken': document.querySelector('meta[name="csrf-token"]').getAttribute('content')
             }
+        }, text => {
+            // Show the feedback as it is written
+            if (!streamed) {
+                loadingIndicator.classList.add('d-none');
+                evaluationContainer.classList.remove('d-none');
+                evaluationContainer.innerHTML = '<div class="ai-feedback ai-feedback-streaming"></div>';
+                streamed = evaluationContainer.firstChild;
+            }
+            streamed.textContent += text;
         })
-        .then(response => response.json())
         .then(data => {
             loadingIndicator.classList.add('d-none');
             evaluationContainer.classList.remove('d-none');
@@ -146,4 +267,79 @@ function analyzeCaseStudy(caseId) {
             console.error('Error:', error);
         });
     }
-}
\ No newline at end of file
+}
+
+// Navbar search typeahead
+document.addEventListener('DOMContentLoaded', function() {
+    const input = document.getElementById('nav-search-input');
+    const menu = document.getElementById('nav-search-suggestions');
+    if (!input || !menu) {
+        return;
+    }
+
+    let debounceTimer = null;
+    let lastQuery = '';
+
+    function hideSuggestions() {
+        menu.classList.remove('show');
+        menu.innerHTML = '';
+    }
+
+    function showSuggestions(suggestions) {
+        menu.innerHTML = '';
+        if (!suggestions.length) {
+            hideSuggestions();
+            return;
+        }
+        suggestions.forEach(function(item) {
+            const li = document.createElement('li');
+            const link = document.createElement('a');
+            link.className = 'dropdown-item';
+            link.href = item.url;
+
+            const icon = document.createElement('i');
+            icon.className = item.kind === 'star_story' ? 'bi bi-star' : 'bi bi-journal-text';
+            link.appendChild(icon);
+            // textContent keeps user-entered titles from being parsed as HTML
+            link.appendChild(document.createTextNode(' ' + item.title));
+
+            li.appendChild(link);
+            menu.appendChild(li);
+        });
+        menu.classList.add('show');
+    }
+
+    input.addEventListener('input', function() {
+        const query = input.value.trim();
+        clearTimeout(debounceTimer);
+        if (query.length < 2) {
+            lastQuery = '';
+            hideSuggestions();
+            return;
+        }
+        debounceTimer = setTimeout(function() {
+            lastQuery = query;
+            fetch(`${input.dataset.suggestUrl}?q=${encodeURIComponent(query)}`)
+                .then(response => response.json())
+                .then(data => {
+                    // Ignore responses for queries the user has typed past
+                    if (query === lastQuery) {
+                        showSuggestions(data.suggestions || []);
+                    }
+                })
+                .catch(() => hideSuggestions());
+        }, 200);
+    });
+
+    input.addEventListener('keydown', function(event) {
+        if (event.key === 'Escape') {
+            hideSuggestions();
+        }
+    });
+
+    document.addEventListener('click', function(event) {
+        if (!menu.contains(event.target) && event.target !== input) {
+            hideSuggestions();
+        }
+    });
+});
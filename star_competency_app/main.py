@@ -2,7 +2,7 @@
 import logging
 import os
 
-from star_competency_app.database.db_manager import DatabaseManager
+from star_competency_app.database.db_manager import get_db_manager
 from star_competency_app.database.seed import seed_competencies
 from star_competency_app.interfaces.web.app import app
 
@@ -19,7 +19,7 @@ def main():
         logger.info("Initializing STAR Competency App")
 
         # Initialize database
-        db_manager = DatabaseManager()
+        db_manager = get_db_manager()
         logger.info("Ensuring database tables exist")
         db_manager.create_tables()
 
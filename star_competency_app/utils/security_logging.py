@@ -92,6 +92,32 @@ def setup_security_logging(app):
     return security_logger
 
 
+def setup_slow_query_logging(app):
+    """Write the "slow_query" logger to logs/slow_query.log with request context."""
+    logs_dir = os.path.join(app.root_path, "..", "logs")
+    os.makedirs(logs_dir, exist_ok=True)
+
+    handler = logging.FileHandler(os.path.join(logs_dir, "slow_query.log"))
+    handler.setFormatter(
+        logging.Formatter(
+            "%(asctime)s [%(request_id)s] [User:%(user_id)s] [IP:%(ip_address)s] "
+            "%(levelname)s: %(message)s"
+        )
+    )
+
+    slow_query_logger = logging.getLogger("slow_query")
+    slow_query_logger.setLevel(logging.INFO)
+    slow_query_logger.addFilter(SecurityLogFilter())
+
+    for hdlr in slow_query_logger.handlers[:]:
+        slow_query_logger.removeHandler(hdlr)
+
+    slow_query_logger.addHandler(handler)
+    slow_query_logger.propagate = False
+
+    return slow_query_logger
+
+
 def log_security_event(event_type, details, level=logging.INFO):
     """Log a security event."""
     security_logger = logging.getLogger("security")
@@ -2,6 +2,7 @@
 import imghdr
 import os
 import re
+import threading
 from typing import Any, Dict, List, Optional, Tuple
 
 import bleach
@@ -13,6 +14,43 @@ MAX_FILE_SIZE = 16 * 1024 * 1024
 # Allowed image file types
 ALLOWED_IMAGE_TYPES = {"jpeg", "jpg", "png", "gif"}
 
+# Markup allowed through sanitize_html()
+ALLOWED_TAGS = [
+    "p",
+    "br",
+    "strong",
+    "em",
+    "u",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "ul",
+    "ol",
+    "li",
+    "span",
+    "div",
+    "b",
+    "i",
+]
+ALLOWED_ATTRIBUTES = {"*": ["class", "style"]}
+
+# Text without these characters cannot contain markup and needs no cleaning
+_MARKUP_CHARS = re.compile(r"[<>&]")
+
+# bleach Cleaners are costly to build and not thread-safe, so keep one per thread
+_cleaners = threading.local()
+
+
+def _get_cleaner():
+    cleaner = getattr(_cleaners, "cleaner", None)
+    if cleaner is None:
+        cleaner = bleach.Cleaner(tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES)
+        _cleaners.cleaner = cleaner
+    return cleaner
+
 
 def sanitize_html(html_content: str) -> str:
     """
@@ -27,28 +65,9 @@ def sanitize_html(html_content: str) -> str:
     if not html_content:
         return ""
 
-    allowed_tags = [
-        "p",
-        "br",
-        "strong",
-        "em",
-        "u",
-        "h1",
-        "h2",
-        "h3",
-        "h4",
-        "h5",
-        "h6",
-        "ul",
-        "ol",
-        "li",
-        "span",
-        "div",
-        "b",
-        "i",
-    ]
-    allowed_attributes = {"*": ["class", "style"]}
-    return bleach.clean(html_content, tags=allowed_tags, attributes=allowed_attributes)
+    if not _MARKUP_CHARS.search(html_content):
+        return html_content
+    return _get_cleaner().clean(html_content)
 
 
 def sanitize_input(
@@ -166,6 +185,12 @@ class CaseStudySchema(Schema):
             raise ValidationError("Title cannot be empty or whitespace.")
 
 
+# Schemas hold no per-call state, so one instance of each is shared
+_competency_schema = CompetencySchema()
+_star_story_schema = STARStorySchema()
+_case_study_schema = CaseStudySchema()
+
+
 # Validation Functions
 def validate_star_story(data: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
     """
@@ -178,8 +203,7 @@ def validate_star_story(data: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
         Tuple of (is_valid, validated_data_or_errors)
     """
     try:
-        schema = STARStorySchema()
-        validated_data = schema.load(data)
+        validated_data = _star_story_schema.load(data)
 
         # Sanitize HTML content
         sanitized_data = sanitize_input(
@@ -202,8 +226,7 @@ def validate_case_study(data: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
         Tuple of (is_valid, validated_data_or_errors)
     """
     try:
-        schema = CaseStudySchema()
-        validated_data = schema.load(data)
+        validated_data = _case_study_schema.load(data)
 
         # Sanitize HTML content
         sanitized_data = sanitize_input(validated_data, ["description"])
@@ -224,8 +247,7 @@ def validate_competency(data: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
         Tuple of (is_valid, validated_data_or_errors)
     """
     try:
-        schema = CompetencySchema()
-        validated_data = schema.load(data)
+        validated_data = _competency_schema.load(data)
 
         # Sanitize HTML content
         sanitized_data = sanitize_input(validated_data, ["description"])
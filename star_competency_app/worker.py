@@ -0,0 +1,151 @@
+# star_competency_app/worker.py
+"""
+Background worker that runs queued AI jobs.
+
+    python -m star_competency_app.worker [--concurrency 4]
+
+Run as many worker processes (or containers) as needed; they coordinate
+through the jobs table only (see database/job_queue.py).
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import threading
+
+from star_competency_app.ai.prompt_agent import PromptAgent
+from star_competency_app.ai.tasks import TASKS, TaskError
+from star_competency_app.config.settings import get_settings
+from star_competency_app.database.db_manager import get_db_manager
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Longest sleep between polls while the database keeps failing
+MAX_ERROR_DELAY = 30.0
+
+
+class Worker:
+    """Polls the job queue from a few threads and runs each job's task."""
+
+    def __init__(self, db_manager, prompt_agent, concurrency=4, poll_interval=1.0):
+        self.db_manager = db_manager
+        self.prompt_agent = prompt_agent
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+
+    def stop(self, *_):
+        """Finish the jobs in progress, then exit."""
+        if not self._stop.is_set():
+            logger.info("Stopping worker after current jobs")
+        self._stop.set()
+
+    def run(self):
+        threads = [
+            threading.Thread(
+                target=self._poll,
+                args=(f"{self.name}:{index}",),
+                name=f"job-worker-{index}",
+            )
+            for index in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        logger.info(f"Worker {self.name} running {self.concurrency} threads")
+        for thread in threads:
+            thread.join()
+
+    def _poll(self, worker_id):
+        delay = self.poll_interval
+        while not self._stop.is_set():
+            try:
+                jobs = self.db_manager.claim_jobs(worker_id)
+            except Exception as e:
+                # e.g. the database is restarting or not migrated yet
+                logger.error(f"Failed to claim jobs: {e}")
+                self._stop.wait(delay)
+                delay = min(delay * 2, MAX_ERROR_DELAY)
+                continue
+
+            delay = self.poll_interval
+            if not jobs:
+                self._stop.wait(self.poll_interval)
+                continue
+
+            for job in jobs:
+                try:
+                    self._execute(worker_id, job)
+                except Exception:
+                    # The lease expires and another attempt picks the job up
+                    logger.exception(f"Could not record the outcome of job {job.id}")
+
+    def _execute(self, worker_id, job):
+        task = TASKS.get(job.kind)
+        if task is None:
+            self.db_manager.fail_job(
+                job, worker_id, f"Unknown job kind: {job.kind}", retryable=False
+            )
+            return
+
+        logger.info(
+            f"Running job {job.id} ({job.kind}) attempt "
+            f"{job.attempts}/{job.max_attempts}"
+        )
+        try:
+            result = task(
+                self.prompt_agent,
+                self.db_manager,
+                job.user_id,
+                job.payload,
+                lambda progress: self.db_manager.report_job_progress(
+                    job.id, worker_id, progress
+                ),
+            )
+        except TaskError as e:
+            status = self.db_manager.fail_job(
+                job, worker_id, str(e), retryable=e.retryable
+            )
+            logger.warning(f"Job {job.id} ({job.kind}) failed, now {status}: {e}")
+            return
+        except Exception as e:
+            logger.exception(f"Job {job.id} ({job.kind}) raised")
+            status = self.db_manager.fail_job(job, worker_id, str(e))
+            logger.warning(f"Job {job.id} ({job.kind}) is now {status}")
+            return
+
+        self.db_manager.complete_job(job.id, worker_id, result)
+        logger.info(f"Job {job.id} ({job.kind}) succeeded")
+
+
+def main():
+    """Entry point for the worker process."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.JOB_WORKER_CONCURRENCY,
+        help="Jobs run in parallel by this process",
+    )
+    args = parser.parse_args()
+
+    db_manager = get_db_manager()
+    worker = Worker(
+        db_manager,
+        PromptAgent(db_manager=db_manager),
+        concurrency=args.concurrency,
+        poll_interval=settings.JOB_POLL_INTERVAL,
+    )
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
+
+
+if __name__ == "__main__":
+    main()
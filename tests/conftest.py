@@ -0,0 +1,18 @@
+import os
+
+import pytest
+
+# Settings read the environment when first imported
+os.environ.setdefault("CLAUDE_API_KEY", "test-key")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+
+@pytest.fixture
+def db(tmp_path):
+    """DatabaseManager on a fresh SQLite database."""
+    from star_competency_app.database.db_manager import DatabaseManager
+
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    db.create_tables()
+    yield db
+    db.engine.dispose()
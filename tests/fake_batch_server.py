@@ -0,0 +1,217 @@
+"""
+A local stand-in for the OpenAI Batch API and Anthropic Message Batches.
+
+Serves just the endpoints ai/batch_rescore.py uses: file upload and
+download, batch creation and retrieval, and message batch results. Point
+the SDKs at it with OPENAI_BASE_URL / ANTHROPIC_BASE_URL set to url + "/v1"
+and url respectively.
+
+A batch finishes after polls_needed status checks. Requests whose body
+contains "FAIL" come back as errors, and submissions after the first
+fail_submit_after are rejected.
+"""
+import itertools
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EVALUATION = "Solid story.\nScore overall: 4"
+
+
+class FakeBatchServer(ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.files = {}
+        self.batches = {}
+        self.message_batches = {}
+        self.polls_needed = 1
+        self.submits = 0
+        self.fail_submit_after = None
+        self._ids = itertools.count(1)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def next_id(self, prefix):
+        return f"{prefix}{next(self._ids)}"
+
+    def reject_submit(self):
+        self.submits += 1
+        return (
+            self.fail_submit_after is not None and self.submits > self.fail_submit_after
+        )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, data, content_type, code=200):
+        self.send_response(code)
+        self.send_header("content-type", content_type)
+        self.send_header("content-length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _json(self, obj, code=200):
+        self._send(json.dumps(obj).encode(), "application/json", code)
+
+    def _jsonl(self, lines):
+        data = "\n".join(json.dumps(line) for line in lines).encode()
+        self._send(data, "application/octet-stream")
+
+    def _reject(self):
+        self._json({"error": {"message": "rejected", "type": "server_error"}}, 400)
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("content-length", 0)))
+        if self.path == "/v1/files":
+            # The JSONL lines of the multipart upload
+            lines = [
+                json.loads(line)
+                for part in body.split(b"\r\n")
+                if part.startswith(b'{"custom_id"')
+                for line in part.splitlines()
+            ]
+            file_id = server.next_id("file-")
+            server.files[file_id] = lines
+            return self._json(
+                {
+                    "id": file_id,
+                    "object": "file",
+                    "bytes": len(body),
+                    "created_at": 0,
+                    "filename": "evaluations.jsonl",
+                    "purpose": "batch",
+                    "status": "processed",
+                }
+            )
+        if self.path == "/v1/batches":
+            if server.reject_submit():
+                return self._reject()
+            batch_id = server.next_id("batch_")
+            server.batches[batch_id] = {
+                "input": json.loads(body)["input_file_id"],
+                "polls": 0,
+            }
+            return self._json(self._openai_batch(batch_id))
+        if self.path == "/v1/messages/batches":
+            if server.reject_submit():
+                return self._reject()
+            batch_id = server.next_id("msgbatch_")
+            server.message_batches[batch_id] = {
+                "requests": json.loads(body)["requests"],
+                "polls": 0,
+            }
+            return self._json(self._message_batch(batch_id))
+        self._json({"error": "not found"}, 404)
+
+    def do_GET(self):
+        server = self.server
+        match = re.fullmatch(r"/v1/batches/([\w-]+)", self.path)
+        if match:
+            server.batches[match[1]]["polls"] += 1
+            return self._json(self._openai_batch(match[1]))
+        match = re.fullmatch(r"/v1/files/([\w-]+)/content", self.path)
+        if match:
+            return self._jsonl(server.files[match[1]])
+        match = re.fullmatch(r"/v1/messages/batches/([\w-]+)/results", self.path)
+        if match:
+            return self._jsonl(
+                _message_result(request)
+                for request in server.message_batches[match[1]]["requests"]
+            )
+        match = re.fullmatch(r"/v1/messages/batches/([\w-]+)", self.path)
+        if match:
+            server.message_batches[match[1]]["polls"] += 1
+            return self._json(self._message_batch(match[1]))
+        self._json({"error": "not found"}, 404)
+
+    def _openai_batch(self, batch_id):
+        server = self.server
+        batch = server.batches[batch_id]
+        done = batch["polls"] >= server.polls_needed
+        if done and "output" not in batch:
+            ok, errors = [], []
+            for line in server.files[batch["input"]]:
+                (errors if _fails(line["body"]) else ok).append(_openai_result(line))
+            batch["output"] = server.next_id("file-")
+            server.files[batch["output"]] = ok
+            if errors:
+                batch["error"] = server.next_id("file-")
+                server.files[batch["error"]] = errors
+        return {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": "/v1/chat/completions",
+            "input_file_id": batch["input"],
+            "completion_window": "24h",
+            "status": "completed" if done else "in_progress",
+            "created_at": 0,
+            "output_file_id": batch.get("output"),
+            "error_file_id": batch.get("error"),
+        }
+
+    def _message_batch(self, batch_id):
+        batch = self.server.message_batches[batch_id]
+        done = batch["polls"] >= self.server.polls_needed
+        counts = dict.fromkeys(
+            ("processing", "succeeded", "errored", "canceled", "expired"), 0
+        )
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if done else "in_progress",
+            "request_counts": counts,
+            "created_at": "2026-01-01T00:00:00Z",
+            "expires_at": "2026-01-02T00:00:00Z",
+            "ended_at": None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": (
+                f"{self.server.url}/v1/messages/batches/{batch_id}/results"
+                if done
+                else None
+            ),
+        }
+
+
+def _fails(request_body):
+    return "FAIL" in json.dumps(request_body)
+
+
+def _openai_result(line):
+    if _fails(line["body"]):
+        response = {"status_code": 400, "body": {"error": {"message": "bad"}}}
+    else:
+        message = {"role": "assistant", "content": EVALUATION}
+        response = {"status_code": 200, "body": {"choices": [{"message": message}]}}
+    return {"id": "x", "custom_id": line["custom_id"], "response": response}
+
+
+def _message_result(request):
+    if _fails(request["params"]):
+        error = {"type": "invalid_request_error", "message": "bad"}
+        result = {"type": "errored", "error": {"type": "error", "error": error}}
+    else:
+        result = {
+            "type": "succeeded",
+            "message": {
+                "id": "msg",
+                "type": "message",
+                "role": "assistant",
+                "model": request["params"]["model"],
+                "content": [{"type": "text", "text": EVALUATION}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": 1, "output_tokens": 1},
+            },
+        }
+    return {"custom_id": request["custom_id"], "result": result}
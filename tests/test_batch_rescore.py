@@ -0,0 +1,128 @@
+"""Bulk re-scoring (ai/batch_rescore.py) against a local fake batch server."""
+import pytest
+from sqlalchemy import func, select
+
+from star_competency_app.ai.batch_rescore import BatchRescorer
+from star_competency_app.ai.claude_client import ClaudeClient
+from star_competency_app.ai.openai_client import OpenAIClient
+from star_competency_app.ai.response_cache import ResponseCache
+from star_competency_app.database.models import STARStory, STARStoryFeedback
+from tests.fake_batch_server import FakeBatchServer
+
+
+@pytest.fixture
+def server():
+    server = FakeBatchServer().start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def story_ids(db):
+    user = db.create_user("azure-1", "user@example.com", "User")
+    competency = db.create_competency("Ownership", "Takes responsibility")
+    texts = ["Led a migration", "FAIL on purpose", "Fixed an outage", "Hired a team"]
+    return [
+        db.create_star_story(
+            user.id,
+            f"Story {i}",
+            competency_id=competency.id,
+            situation=text,
+            task="Task",
+            action="Action",
+            result="Result",
+        ).id
+        for i, text in enumerate(texts)
+    ]
+
+
+@pytest.fixture(params=["openai", "anthropic"])
+def provider(request, server, monkeypatch):
+    monkeypatch.setenv("OPENAI_BASE_URL", f"{server.url}/v1")
+    monkeypatch.setenv("ANTHROPIC_BASE_URL", server.url)
+    return request.param
+
+
+def make_rescorer(db, provider, run="test-run"):
+    if provider == "anthropic":
+        # Memory-only, so the default cache doesn't connect to DATABASE_URL
+        client = ClaudeClient(cache=ResponseCache())
+    else:
+        client = OpenAIClient("test-key")
+    return BatchRescorer(
+        db,
+        run,
+        provider=provider,
+        client=client,
+        chunk_size=2,
+        max_open_batches=1,
+        poll_interval=0,
+    )
+
+
+def feedback_versions(db):
+    """Story ID -> number of feedback versions stored."""
+    with db.read_session_scope() as session:
+        return dict(
+            session.execute(
+                select(STARStoryFeedback.story_id, func.count()).group_by(
+                    STARStoryFeedback.story_id
+                )
+            ).all()
+        )
+
+
+def test_run_scores_every_story(db, story_ids, provider):
+    with db.read_session_scope() as session:
+        updated_before = session.scalar(
+            select(STARStory.updated_at).where(STARStory.id == story_ids[0])
+        )
+
+    summary = make_rescorer(db, provider).run()
+
+    assert summary["complete"]
+    assert summary["batches"] == summary["applied"] == 2
+    assert (summary["succeeded"], summary["failed"], summary["skipped"]) == (3, 1, 0)
+    assert feedback_versions(db) == {
+        story_id: 1 for story_id in story_ids if story_id != story_ids[1]
+    }
+    with db.read_session_scope() as session:
+        story = session.get(STARStory, story_ids[0])
+        assert story.ai_feedback_version == 1
+        assert story.ai_score is not None
+        assert story.feedback_at is not None
+        # Storing AI output is not an edit
+        assert story.updated_at == updated_before
+
+
+def test_story_edited_after_submission_is_skipped(db, story_ids, provider, server):
+    server.polls_needed = 2
+    rescorer = make_rescorer(db, provider)
+    summary = rescorer.run(wait=False)
+    assert (summary["batches"], summary["open"]) == (1, 1)
+
+    db.update_star_story(story_ids[0], situation="Rewritten after submission")
+    summary = rescorer.run()
+
+    assert summary["complete"]
+    assert (summary["succeeded"], summary["failed"], summary["skipped"]) == (2, 1, 1)
+    assert story_ids[0] not in feedback_versions(db)
+
+
+def test_resume_after_failed_submission(db, story_ids, provider, server):
+    server.fail_submit_after = 1
+    with pytest.raises(Exception):
+        make_rescorer(db, provider).run()
+    # With one batch open at a time, the first was applied before the next
+    batches = db.get_rescore_batches("test-run")
+    assert [batch.status for batch in batches] == ["applied", "pending"]
+
+    server.fail_submit_after = None
+    summary = make_rescorer(db, provider).run()
+
+    assert summary["complete"]
+    assert summary["applied"] == 2
+    # Each chunk was submitted once, and each story scored once
+    assert server.submits == 3
+    assert set(feedback_versions(db).values()) == {1}
@@ -0,0 +1,14 @@
+"""Read replica routing (DatabaseManager.read_session_scope)."""
+from star_competency_app.database.replicas import ReplicaRouter
+
+
+def test_objects_read_from_a_replica_stay_loaded(db):
+    user_id = db.create_user("azure-1", "user@example.com", "User").id
+    story_id = db.create_star_story(user_id, "Migration").id
+    # A "replica" of the same file
+    db.replica_router = ReplicaRouter([db.engine.url])
+
+    story = db.get_star_story_by_id(story_id)
+
+    assert story.title == "Migration"
+    assert story.ai_feedback_version is None
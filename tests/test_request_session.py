@@ -0,0 +1,57 @@
+"""The request-scoped unit of work (DatabaseManager.init_app) and streamed responses."""
+import pytest
+from flask import Flask, Response, jsonify, stream_with_context
+
+from star_competency_app.database.db_manager import PRIMARY_PIN_KEY
+from star_competency_app.database.replicas import ReplicaRouter
+
+
+@pytest.fixture
+def story_id(db):
+    user_id = db.create_user("azure-1", "user@example.com", "User").id
+    return db.create_star_story(user_id, "Migration").id
+
+
+@pytest.fixture
+def app(db, story_id):
+    db.request_sessions = True
+    # A "replica" of the same file turns on read-your-writes pinning
+    db.replica_router = ReplicaRouter([db.engine.url])
+    app = Flask(__name__)
+    app.secret_key = "test"
+    db.init_app(app)
+
+    @app.post("/stream")
+    def stream():
+        db.get_star_story_by_id(story_id)  # opens the request session
+
+        def generate():
+            yield "started\n"
+            db.update_star_story(story_id, ai_feedback="Streamed", ai_score=4)
+            yield "stored\n"
+
+        db.pin_reads_to_primary(seconds=60)
+        return Response(stream_with_context(generate()))
+
+    @app.get("/pinned")
+    def pinned():
+        return jsonify(pinned=db._pinned_to_primary())
+
+    return app
+
+
+def test_write_during_stream_is_committed(app, db, story_id):
+    with app.test_client() as client:
+        assert client.post("/stream").get_data(as_text=True) == "started\nstored\n"
+
+    story = db.get_star_story_by_id(story_id)
+    assert story.ai_feedback_version == 1
+    assert story.ai_score == 4
+
+
+def test_pin_set_before_stream_reaches_next_request(app):
+    with app.test_client() as client:
+        client.post("/stream").get_data()
+        with client.session_transaction() as session:
+            assert PRIMARY_PIN_KEY in session
+        assert client.get("/pinned").get_json() == {"pinned": True}
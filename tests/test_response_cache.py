@@ -0,0 +1,63 @@
+"""Caching of OpenAIClient completions (ai/response_cache.py)."""
+from types import SimpleNamespace
+
+import pytest
+
+from star_competency_app.ai.openai_client import OpenAIClient
+from star_competency_app.ai.response_cache import ResponseCache
+from star_competency_app.config.settings import get_settings
+
+STORY = {
+    "title": "Migration",
+    "situation": "Legacy system",
+    "task": "Move it",
+    "action": "Planned the cutover",
+    "result": "No downtime",
+}
+OWNERSHIP = SimpleNamespace(name="Ownership", description="Takes responsibility")
+
+
+class StubCompletions:
+    """Stands in for the SDK's chat.completions; counts the calls made."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **request):
+        self.calls += 1
+        message = SimpleNamespace(content=f"Answer {self.calls}\nScore overall: 4")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message)],
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5),
+        )
+
+
+@pytest.fixture
+def completions():
+    return StubCompletions()
+
+
+@pytest.fixture
+def client(completions):
+    # The default bypass list, as get_response_cache() builds it
+    bypass = [task.strip() for task in get_settings().AI_CACHE_BYPASS.split(",")]
+    client = OpenAIClient("test-key", cache=ResponseCache(bypass=bypass))
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return client
+
+
+def test_evaluation_is_served_from_cache(client, completions):
+    first = client.evaluate_star_story(STORY, OWNERSHIP)
+    second = client.evaluate_star_story(STORY, OWNERSHIP)
+
+    assert completions.calls == 1
+    assert second == first
+
+
+def test_improve_bypasses_cache_by_default(client, completions):
+    client.evaluate_star_story(STORY, OWNERSHIP)
+    first = client.improve_star_story(STORY, OWNERSHIP)
+    second = client.improve_star_story(STORY, OWNERSHIP)
+
+    assert completions.calls == 3
+    assert first["evaluation"] != second["evaluation"]
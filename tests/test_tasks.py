@@ -0,0 +1,109 @@
+"""Background AI jobs (ai/tasks.py) run by the worker against a stub client."""
+import time
+
+import openai
+import pytest
+
+from star_competency_app.ai.errors import error_result
+from star_competency_app.ai.prompt_agent import PromptAgent
+from star_competency_app.config.settings import get_settings
+from star_competency_app.worker import Worker
+
+EVALUATION = {"evaluation": "Clear and specific.", "scores": {"overall": 4}}
+
+
+class StubClient:
+    """Stands in for OpenAIClient; returns `result` from every evaluation."""
+
+    def __init__(self, result=EVALUATION):
+        self.result = result
+        self.calls = []
+
+    def evaluate_star_story(self, story_data, competency):
+        self.calls.append(story_data)
+        return self.result
+
+    improve_star_story = evaluate_star_story
+
+
+@pytest.fixture
+def client():
+    return StubClient()
+
+
+@pytest.fixture
+def user_id(db):
+    return db.create_user("azure-1", "user@example.com", "User").id
+
+
+@pytest.fixture
+def story_id(db, user_id):
+    competency = db.create_competency("Ownership", "Takes responsibility")
+    return db.create_star_story(
+        user_id,
+        "Migration",
+        competency_id=competency.id,
+        situation="Legacy system",
+        task="Move it",
+        action="Planned the cutover",
+        result="No downtime",
+    ).id
+
+
+def run_job(db, client, user_id, kind, payload):
+    """Queue a job, run one attempt of it on a worker, and return the job."""
+    worker = Worker(db, PromptAgent(openai_client=client, db_manager=db))
+    job_id = db.enqueue_job(user_id, kind, payload)
+    (job,) = db.claim_jobs("test-worker")
+    worker._execute("test-worker", job)
+    return db.get_job(job_id)
+
+
+def test_evaluate_story_stores_feedback(db, client, user_id, story_id):
+    job = run_job(db, client, user_id, "evaluate_story", {"story_id": story_id})
+
+    assert job.status == "succeeded"
+    assert job.result["evaluation"] == EVALUATION["evaluation"]
+    assert db.get_star_story_by_id(story_id).ai_score == 4
+
+
+def test_improve_story_returns_suggestions(db, client, user_id, story_id):
+    job = run_job(db, client, user_id, "improve_story", {"story_id": story_id})
+
+    assert job.status == "succeeded"
+    assert job.result["suggestions"] == EVALUATION["evaluation"]
+    assert client.calls[0]["action"] == "Planned the cutover"
+
+
+def test_error_that_would_repeat_fails_at_once(db, client, user_id):
+    # The user has no stories to analyse
+    job = run_job(db, client, user_id, "gap_analysis", {})
+
+    assert job.status == "failed"
+    assert job.attempts == 1
+    assert job.error == "No STAR stories found for this user"
+
+
+def test_transient_error_is_retried(db, user_id, story_id):
+    client = StubClient(error_result(openai.APITimeoutError(request=None)))
+
+    job = run_job(db, client, user_id, "evaluate_story", {"story_id": story_id})
+
+    assert job.status == "queued"
+    assert job.attempts == 1
+
+
+def test_slow_model_call_keeps_the_lease(db, user_id, story_id, monkeypatch):
+    monkeypatch.setattr(get_settings(), "JOB_VISIBILITY_TIMEOUT", 0.3)
+    claimed_meanwhile = []
+
+    class SlowClient(StubClient):
+        def evaluate_star_story(self, story_data, competency):
+            time.sleep(0.6)  # twice the lease
+            claimed_meanwhile.extend(db.claim_jobs("other-worker"))
+            return super().evaluate_star_story(story_data, competency)
+
+    job = run_job(db, SlowClient(), user_id, "evaluate_story", {"story_id": story_id})
+
+    assert claimed_meanwhile == []
+    assert job.status == "succeeded"
@@ -0,0 +1,38 @@
+"""user_stats counters (database/user_stats.py) and the coverage watermark."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from star_competency_app.database.models import UserStats
+from star_competency_app.database.user_stats import (
+    apply_user_stats_deltas,
+    audit_stats_deltas,
+)
+
+
+def test_activity_does_not_trigger_coverage_recompute(db):
+    user_id = db.create_user("azure-1", "user@example.com", "User").id
+    story_id = db.create_star_story(user_id, "Migration").id
+    db.refresh_coverage_summary(full=True)
+    an_hour_ago = datetime.utcnow() - timedelta(hours=1)
+    with db.engine.begin() as conn:
+        conn.execute(update(UserStats).values(updated_at=an_hour_ago))
+
+    now = datetime.utcnow()
+    entries = [
+        {"user_id": user_id, "action": "login", "created_at": now},
+        {"user_id": user_id, "action": "evaluate_story", "created_at": now},
+    ]
+    with db.engine.begin() as conn:
+        apply_user_stats_deltas(
+            conn, audit_stats_deltas(entries), content_changed=False
+        )
+
+    stats = db.get_user_stats(user_id)
+    assert stats.ai_requests_count == 1
+    assert stats.last_activity_at == now
+    assert stats.updated_at == an_hour_ago
+    assert db.refresh_coverage_summary()["users"] == 0
+
+    db.update_star_story(story_id, situation="Edited")
+    assert db.refresh_coverage_summary()["users"] == 1